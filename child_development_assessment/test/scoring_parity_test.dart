@@ -0,0 +1,56 @@
+// 评分一致性测试：与 scripts/scoring 共用 scripts/scoring/fixtures/scoring_parity.json，
+// 确保 Python 批量评分引擎与 AssessmentService 的结果一致。
+
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+
+import 'package:child_development_assessment/models/assessment_data.dart';
+import 'package:child_development_assessment/services/assessment_service.dart';
+
+void main() {
+  // flutter test 的工作目录为 child_development_assessment/，用例中的路径相对仓库根目录
+  const repoRoot = '..';
+  final fixtures = jsonDecode(
+    File('$repoRoot/scripts/scoring/fixtures/scoring_parity.json').readAsStringSync(),
+  ) as Map<String, dynamic>;
+  final List<dynamic> jsonList = jsonDecode(
+    File('$repoRoot/${fixtures['dataFile']}').readAsStringSync(),
+  );
+  final allData = jsonList.map((json) => AssessmentData.fromJson(json)).toList();
+  final service = AssessmentService();
+
+  for (final session in fixtures['sessions'] as List<dynamic>) {
+    test(session['name'], () {
+      final testResults = (session['testResults'] as Map<String, dynamic>)
+          .map((key, value) => MapEntry(int.parse(key), value as bool));
+      final double actualAge = (session['actualAge'] as num).toDouble();
+      final expected = session['expected'] as Map<String, dynamic>;
+
+      final mainAge = service.determineMainTestAge(actualAge);
+      expect(mainAge, expected['mainAge']);
+
+      // 与 AssessmentProvider._generateFinalResult 相同：按 TestArea 顺序累加各能区智龄
+      double totalScore = 0.0;
+      for (final area in service.getAllAreas()) {
+        final expectedArea = expected['areas'][area] as Map<String, dynamic>;
+        final areaResult = service.testArea(allData, mainAge, area, testResults);
+        expect(areaResult.forwardAges, expectedArea['forwardAges']);
+        expect(areaResult.backwardAges, expectedArea['backwardAges']);
+
+        final mentalAge = service.calculateAreaMentalAge(area, testResults, allData);
+        expect(mentalAge, closeTo((expectedArea['mentalAge'] as num).toDouble(), 1e-9));
+        totalScore += mentalAge;
+      }
+
+      final averageScore = totalScore / 5.0;
+      expect(totalScore, closeTo((expected['totalScore'] as num).toDouble(), 1e-9));
+      expect(averageScore, closeTo((expected['averageScore'] as num).toDouble(), 1e-9));
+      expect(
+        service.calculateDevelopmentQuotient(averageScore, actualAge),
+        closeTo((expected['dq'] as num).toDouble(), 1e-9),
+      );
+    });
+  }
+}
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估数据分组构建器
+按 (月龄, 能区) 汇总测试项目，输出符合 assessment_data.json 结构的数据。
+不依赖 pandas，供生成、校验、导出等脚本共同使用。
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 量表月龄列表（与 Flutter AssessmentService._ageGroups 一致）
+AGE_MONTHS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 15, 18, 21, 24, 27, 30, 33, 36, 42, 48, 54, 60, 66, 72, 78, 84]
+
+# 能区输出顺序（与表A.1 中的行顺序一致）
+AREA_ORDER = ['motor', 'fineMotor', 'adaptive', 'language', 'social']
+
+def get_score(age_month: int) -> float:
+    """根据月龄获取分数"""
+    if 1 <= age_month <= 12:
+        return 1.0
+    elif 15 <= age_month <= 36:
+        return 3.0
+    elif 42 <= age_month <= 84:
+        return 6.0
+    else:
+        return 0.0
+
+def get_item_score(age_month: int, item_count: int) -> float:
+    """根据月龄和项目数量计算单个项目的分值"""
+    total_score = get_score(age_month)
+    if item_count == 0:
+        return 0.0
+    return total_score / item_count
+
+def get_area_display_name(area: str) -> str:
+    """获取能区的中文显示名称"""
+    area_mapping = {
+        'motor': '大运动',
+        'fineMotor': '精细动作',
+        'language': '语言',
+        'adaptive': '适应能力',
+        'social': '社会行为'
+    }
+    return area_mapping.get(area, area)
+
+class AssessmentDataBuilder:
+    """按 (月龄, 能区) 分组累积测试项目
+
+    分组以字典为键，每个项目的归组为常数时间；输出顺序固定为
+    先按能区顺序、再按月龄列表排列，保证多次运行结果逐字节一致。
+    未在月龄列表或能区顺序中的分组按首次出现顺序排在最后。
+    """
+
+    def __init__(self, age_months: Optional[List[int]] = None, areas: Optional[List[str]] = None):
+        self.age_months = list(age_months) if age_months is not None else list(AGE_MONTHS)
+        self.areas = list(areas) if areas is not None else list(AREA_ORDER)
+        self._groups: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_data(cls, assessment_data: Iterable[Dict[str, Any]], **kwargs) -> 'AssessmentDataBuilder':
+        """从已有的 assessment_data 结构重新分组（用于校验、导出等脚本）"""
+        builder = cls(**kwargs)
+        for group in assessment_data:
+            for test_item in group['testItems']:
+                builder.add_item(group['ageMonth'], group['area'], test_item)
+        return builder
+
+    def add_item(self, age_month: int, area: str, test_item: Dict[str, Any]) -> None:
+        """将测试项目加入对应的 (月龄, 能区) 分组"""
+        key = (age_month, area)
+        items = self._groups.get(key)
+        if items is None:
+            self._groups[key] = [test_item]
+        else:
+            items.append(test_item)
+
+    def get_items(self, age_month: int, area: str) -> List[Dict[str, Any]]:
+        """获取指定月龄与能区的测试项目（不存在时返回空列表）"""
+        return self._groups.get((age_month, area), [])
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __contains__(self, key: Tuple[int, str]) -> bool:
+        return key in self._groups
+
+    def ordered_keys(self) -> List[Tuple[int, str]]:
+        """按能区顺序与月龄列表排列的分组键"""
+        ordered = [(age, area) for area in self.areas for age in self.age_months if (age, area) in self._groups]
+        known = set(ordered)
+        ordered.extend(key for key in self._groups if key not in known)
+        return ordered
+
+    def iter_groups(self) -> Iterator[Tuple[int, str, List[Dict[str, Any]]]]:
+        """按固定顺序遍历 (月龄, 能区, 测试项目)"""
+        for age_month, area in self.ordered_keys():
+            yield age_month, area, self._groups[(age_month, area)]
+
+    def build(self) -> List[Dict[str, Any]]:
+        """生成 assessment_data 结构，并按分组内项目数量计算单个项目分值"""
+        assessment_data = []
+        for age_month, area, test_items in self.iter_groups():
+            item_score = get_item_score(age_month, len(test_items))
+            for test_item in test_items:
+                test_item['score'] = item_score
+            assessment_data.append({
+                'ageMonth': age_month,
+                'area': area,
+                'score': get_score(age_month),
+                'testItems': test_items
+            })
+        return assessment_data
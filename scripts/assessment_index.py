@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估数据的预计算索引（assessment_index.json）
+由 generate_assessment_data.py 与 assessment_data.json 同时生成（写在 build/data/：App 读取之前不打包进 assets/），供 App 直接加载，
+替代 AssessmentService 中 getItemAge、getItemScoreById、getAllAreaItemIds、getAreaItems
+等对整个数据列表的反复扫描。
+
+索引内容：
+  items       项目编号 -> {ageMonth, area, score, group}（group 为分组在 assessment_data 中的下标）
+  areaItems   能区 -> 按编号升序的项目编号与累计分值（calculateAreaMentalAge 的遍历顺序）
+  ageLinks    能区 -> 月龄 -> {previous, next}：该能区有数据的相邻月龄
+  groups      能区 -> 月龄 -> 分组下标
+
+用法示例：
+  python scripts/assessment_index.py check assessment_data.json assessment_index.json
+"""
+
+import argparse
+import json
+import math
+import sys
+from typing import Any, Dict, List, Optional
+
+from assessment_builder import AGE_MONTHS, AREA_ORDER
+from build_cache import write_atomic
+import tracing
+
+INDEX_VERSION = 1
+
+# 累计分值比较容差
+SCORE_TOLERANCE = 1e-9
+
+def build_assessment_index(assessment_data: List[Dict[str, Any]],
+                           age_months: Optional[List[int]] = None,
+                           areas: Optional[List[str]] = None) -> Dict[str, Any]:
+    """由分组后的评估数据计算索引"""
+    age_months = list(age_months) if age_months is not None else list(AGE_MONTHS)
+    areas = list(areas) if areas is not None else list(AREA_ORDER)
+    age_order = {age: idx for idx, age in enumerate(age_months)}
+
+    items: Dict[str, Dict[str, Any]] = {}
+    groups: Dict[str, Dict[str, int]] = {area: {} for area in areas}
+    area_item_ids: Dict[str, List[int]] = {area: [] for area in areas}
+    item_scores: Dict[int, float] = {}
+
+    for group_idx, group in enumerate(assessment_data):
+        area = group['area']
+        groups.setdefault(area, {})[str(group['ageMonth'])] = group_idx
+        for test_item in group['testItems']:
+            item_id = test_item['id']
+            # 与 Dart 端按编号查找时一致：同一编号以第一次出现为准
+            if str(item_id) not in items:
+                items[str(item_id)] = {
+                    'ageMonth': group['ageMonth'],
+                    'area': area,
+                    'score': test_item['score'],
+                    'group': group_idx,
+                }
+                item_scores[item_id] = test_item['score']
+            area_item_ids.setdefault(area, []).append(item_id)
+
+    area_items: Dict[str, Dict[str, List]] = {}
+    for area, ids in area_item_ids.items():
+        ids = sorted(ids)
+        cumulative = []
+        total = 0.0
+        for item_id in ids:
+            total += item_scores[item_id]
+            cumulative.append(total)
+        area_items[area] = {'ids': ids, 'cumulativeScores': cumulative}
+
+    age_links: Dict[str, Dict[str, Dict[str, Optional[int]]]] = {}
+    for area, area_groups in groups.items():
+        ages = sorted((int(age) for age in area_groups), key=lambda age: (age_order.get(age, len(age_order)), age))
+        age_links[area] = {
+            str(age): {
+                'previous': ages[idx - 1] if idx > 0 else None,
+                'next': ages[idx + 1] if idx + 1 < len(ages) else None,
+            }
+            for idx, age in enumerate(ages)
+        }
+
+    return {
+        'version': INDEX_VERSION,
+        'ageMonths': age_months,
+        'areas': areas,
+        'items': items,
+        'areaItems': area_items,
+        'ageLinks': age_links,
+        'groups': groups,
+    }
+
+def check_assessment_index(assessment_data: List[Dict[str, Any]], index: Dict[str, Any]) -> List[str]:
+    """检查索引与分组数据是否一致，返回问题描述列表"""
+    problems: List[str] = []
+    if index.get('version') != INDEX_VERSION:
+        problems.append(f"索引版本为 {index.get('version')}，应为 {INDEX_VERSION}")
+
+    seen_ids = set()
+    for group_idx, group in enumerate(assessment_data):
+        area = group['area']
+        age = str(group['ageMonth'])
+        if index['groups'].get(area, {}).get(age) != group_idx:
+            problems.append(f"groups[{area}][{age}] 应为 {group_idx}")
+        if age not in index['ageLinks'].get(area, {}):
+            problems.append(f"ageLinks[{area}] 缺少月龄 {age}")
+        for test_item in group['testItems']:
+            item_id = test_item['id']
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+            entry = index['items'].get(str(item_id))
+            expected = {'ageMonth': group['ageMonth'], 'area': area, 'score': test_item['score'], 'group': group_idx}
+            if entry != expected:
+                problems.append(f"items[{item_id}] 为 {entry}，应为 {expected}")
+
+    if len(index['items']) != len(seen_ids):
+        problems.append(f"items 中有 {len(index['items']) - len(seen_ids)} 个多余的项目编号")
+
+    for area, area_entry in index['areaItems'].items():
+        ids = area_entry['ids']
+        expected_ids = sorted(
+            test_item['id'] for group in assessment_data if group['area'] == area for test_item in group['testItems']
+        )
+        if ids != expected_ids:
+            problems.append(f"areaItems[{area}].ids 与分组数据不一致")
+            continue
+        total = 0.0
+        for item_id, cumulative in zip(ids, area_entry['cumulativeScores']):
+            total += index['items'][str(item_id)]['score']
+            if not math.isclose(cumulative, total, abs_tol=SCORE_TOLERANCE):
+                problems.append(f"areaItems[{area}] 在项目 {item_id} 处累计分值为 {cumulative}，应为 {total}")
+                break
+        if len(area_entry['cumulativeScores']) != len(ids):
+            problems.append(f"areaItems[{area}].cumulativeScores 长度与 ids 不一致")
+
+    for area, links in index['ageLinks'].items():
+        for age, link in links.items():
+            for direction, back in (('next', 'previous'), ('previous', 'next')):
+                neighbour = link[direction]
+                if neighbour is not None and links.get(str(neighbour), {}).get(back) != int(age):
+                    problems.append(f"ageLinks[{area}] 中 {age} 的 {direction} 为 {neighbour}，但反向链接不一致")
+
+    return problems
+
+def write_assessment_index(index: Dict[str, Any], path: str) -> None:
+    payload = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    write_atomic(path, payload.encode('utf-8'))
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="生成或检查 assessment_index.json")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="由 assessment_data.json 生成索引")
+    build.add_argument("json_file")
+    build.add_argument("index_file")
+    check = subparsers.add_parser("check", help="检查索引与 assessment_data.json 是否一致")
+    check.add_argument("json_file")
+    check.add_argument("index_file")
+    for subparser in (build, check):
+        tracing.add_arguments(subparser)
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'assessment_index')
+    with tracing.span('load_data', path=args.json_file):
+        with open(args.json_file, 'r', encoding='utf-8') as f:
+            assessment_data = json.load(f)
+    if args.command == "build":
+        with tracing.span('build_index'):
+            index = build_assessment_index(assessment_data)
+        write_assessment_index(index, args.index_file)
+        print(f"已生成: {args.index_file}")
+        return
+    with open(args.index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    with tracing.span('check_index'):
+        problems = check_assessment_index(assessment_data, index)
+    for problem in problems:
+        print(f"错误：{problem}")
+    if problems:
+        sys.exit(1)
+    print("索引与评估数据一致")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/ 下各流水线的基准测试（入口为 scripts/run_benchmarks.py）
+- synthetic：按倍数生成合成的工作簿、assessment_data.json 与截图配置
+- suites：excel / validate / diff / match / screenshots 五组用例，分阶段计时
+- harness：在独立进程中运行用例，记录耗时与峰值内存，并与基线比较
+"""
+
+from .harness import Case, Regression, Thresholds, compare_results, load_results, run_case, write_results
+
+__all__ = [
+    'Case',
+    'Regression',
+    'Thresholds',
+    'compare_results',
+    'load_results',
+    'run_case',
+    'write_results',
+]
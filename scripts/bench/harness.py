@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试的运行、记录与基线比较
+
+每个用例的每次重复都在新启动（spawn）的子进程中运行，峰值内存取子进程的最大常驻内存，
+不受前一个用例遗留的缓存与内存碎片影响。Linux 上读取 /proc/self/status 的 VmHWM
+（ru_maxrss 在 exec 时会继承父进程 fork 时的常驻内存），其他系统使用 ru_maxrss。
+
+用例内部用 StageTimer 分阶段计时，并记录每个阶段结束时的峰值内存（单调不减，可看出峰值出现在哪个阶段）。
+
+多次重复时耗时取最小值（最不受干扰的一次），峰值内存取最大值。
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，不记录峰值内存
+    resource = None
+
+RESULTS_VERSION = 1
+
+_PROC_STATUS = '/proc/self/status'
+
+def peak_rss_mb() -> Optional[float]:
+    """当前进程的峰值常驻内存（MB）；ru_maxrss 在 Linux 上的单位为 KB，macOS 为字节"""
+    if os.path.exists(_PROC_STATUS):
+        with open(_PROC_STATUS, 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class StageTimer:
+    """分阶段计时；同名阶段多次进入时累加耗时"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Optional[float]]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'seconds': 0.0, 'peak_rss_mb': None})
+            entry['seconds'] += time.perf_counter() - start
+            entry['peak_rss_mb'] = peak_rss_mb()
+
+@dataclass(frozen=True)
+class Case:
+    """一个基准用例：suite 为 suites.SUITES 中的名称，params 为传给用例函数的关键字参数"""
+    name: str
+    suite: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+@dataclass(frozen=True)
+class Thresholds:
+    """回归判定：相对变化超过比例、且绝对变化超过下限时视为回归（下限用于过滤短用例的计时抖动）"""
+    time_ratio: float = 0.25
+    memory_ratio: float = 0.20
+    min_seconds: float = 0.05
+    min_memory_mb: float = 8.0
+
+@dataclass
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float('inf')
+
+def run_case_in_process(case: Case, work_dir: str, font: Optional[str]) -> Dict[str, Any]:
+    """在子进程中运行一次用例；缺少运行条件（如字体）时返回 skipped"""
+    from bench.suites import SUITES, SkipCase
+
+    timer = StageTimer()
+    start_rss = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        size = SUITES[case.suite](timer, Path(work_dir), font=font, **dict(case.params))
+    except SkipCase as exc:
+        return {'skipped': str(exc)}
+    return {
+        'wall_seconds': time.perf_counter() - start,
+        'start_rss_mb': start_rss,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': timer.stages,
+        'size': size,
+    }
+
+def run_case(case: Case, work_dir: Path, font: Optional[str], repeat: int) -> Dict[str, Any]:
+    """重复运行用例（每次一个新进程），汇总为一条结果"""
+    runs: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            run = pool.submit(run_case_in_process, case, str(work_dir), font).result()
+        if 'skipped' in run:
+            return run
+        runs.append(run)
+
+    stages: Dict[str, Dict[str, Optional[float]]] = {}
+    for name in runs[0]['stages']:
+        stages[name] = {
+            'seconds': min(run['stages'][name]['seconds'] for run in runs),
+            'peak_rss_mb': _max_or_none(run['stages'][name]['peak_rss_mb'] for run in runs),
+        }
+    return {
+        'wall_seconds': min(run['wall_seconds'] for run in runs),
+        'runs': [run['wall_seconds'] for run in runs],
+        'start_rss_mb': _max_or_none(run['start_rss_mb'] for run in runs),
+        'peak_rss_mb': _max_or_none(run['peak_rss_mb'] for run in runs),
+        'stages': stages,
+        'size': runs[0]['size'],
+    }
+
+def _max_or_none(values) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+def environment(font: Optional[str]) -> Dict[str, Any]:
+    """运行环境：与基线不同时比较结果仅供参考"""
+    import numpy
+    import pandas
+    import PIL
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpuCount': os.cpu_count(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'pillow': PIL.__version__,
+        # 只记录文件名：同一字体在不同机器上的路径不同
+        'font': Path(font).name if font else None,
+    }
+
+def make_results(cases: Dict[str, Dict[str, Any]], settings: Dict[str, Any], font: Optional[str]) -> Dict[str, Any]:
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(font),
+        'settings': settings,
+        'cases': cases,
+    }
+
+def load_results(path: str) -> Optional[Dict[str, Any]]:
+    """读取结果或基线文件；不存在或版本不符时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get('version') != RESULTS_VERSION:
+        return None
+    return data
+
+def write_results(path: str, results: Dict[str, Any]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+def environment_differences(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    keys = ('python', 'machine', 'cpuCount', 'pandas', 'numpy', 'pillow', 'font')
+    return [
+        f"{key}: {baseline['environment'].get(key)} -> {current['environment'].get(key)}"
+        for key in keys if current['environment'].get(key) != baseline['environment'].get(key)
+    ]
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    thresholds: Thresholds = Thresholds()) -> List[Regression]:
+    """比较两份结果中都有的用例，返回耗时与峰值内存的回归"""
+    regressions: List[Regression] = []
+    for name, result in current['cases'].items():
+        base = baseline['cases'].get(name)
+        if not base or 'skipped' in result or 'skipped' in base:
+            continue
+        checks = (
+            ('wall_seconds', thresholds.time_ratio, thresholds.min_seconds),
+            ('peak_rss_mb', thresholds.memory_ratio, thresholds.min_memory_mb),
+        )
+        for metric, ratio, minimum in checks:
+            before, after = base.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + ratio) and after - before > minimum:
+                regressions.append(Regression(case=name, metric=metric, baseline=before, current=after))
+    return regressions
+
+def format_comparison(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """逐用例列出与基线相比的耗时、峰值内存与各阶段耗时变化"""
+    lines = []
+    for name, result in current['cases'].items():
+        base = baseline['cases'].get(name)
+        if 'skipped' in result:
+            lines.append(f"  {name}: 已跳过（{result['skipped']}）")
+            continue
+        if not base or 'skipped' in base:
+            lines.append(f"  {name}: 基线中没有该用例")
+            continue
+        parts = [_format_change('耗时', base['wall_seconds'], result['wall_seconds'], 's')]
+        if base.get('peak_rss_mb') is not None and result.get('peak_rss_mb') is not None:
+            parts.append(_format_change('峰值内存', base['peak_rss_mb'], result['peak_rss_mb'], ' MB'))
+        lines.append(f"  {name}: " + "，".join(parts))
+        for stage, entry in result['stages'].items():
+            base_stage = base['stages'].get(stage)
+            if base_stage:
+                lines.append(f"      {stage}: " + _format_change('', base_stage['seconds'], entry['seconds'], 's').strip())
+    return lines
+
+def _format_change(label: str, before: float, after: float, unit: str) -> str:
+    change = (after / before - 1) * 100 if before else 0.0
+    return f"{label} {before:.3f}{unit} -> {after:.3f}{unit}（{change:+.1f}%）"
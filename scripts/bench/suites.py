@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+基准用例
+
+- excel：generate_assessment_data.py 读取表A.1/B.1、建立操作方法索引、解析、分组、预计算索引与序列化；
+  records 模式为 --reader openpyxl 的路径（xlsx_reader 逐行读取 + 逐行解析，不导入 pandas）
+- validate：validate_data.py 对 assessment_data.json 的流式读取与完整校验
+- diff：diff_data.py 对 assessment_data.json 与其修改版的索引、比较与报告生成
+- match：表A.1 与重新编号的表B.1 的匹配，编号未匹配的项目按名称模糊匹配（name_index.py）
+- screenshots：generate_appstore_screenshots.py 对 N 个条目 × M 个输出尺寸的解码、排版与渲染
+
+用例函数的签名为 (timer, work_dir, font=None, **params)，返回描述输入规模的字典；
+合成输入由 synthetic.py 生成并按参数缓存在 work_dir 中，生成耗时不计入结果。
+"""
+
+import io
+import json
+import os
+import shutil
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from bench.harness import Case, StageTimer
+from bench.synthetic import (
+    write_bundle,
+    write_modified_bundle,
+    write_renumbered_workbook,
+    write_screenshot_inputs,
+    write_workbooks,
+)
+
+# 逐单元格的 reference 解析随行数线性变慢，只在较小的倍数下运行
+REFERENCE_MAX_SCALE = 10
+
+class SkipCase(Exception):
+    """缺少运行条件（如字体），用例记为跳过"""
+
+def bench_excel(timer: StageTimer, work_dir: Path, scale: int, mode: str, font: Optional[str] = None) -> Dict[str, Any]:
+    from assessment_builder import AGE_MONTHS, AssessmentDataBuilder
+    from assessment_index import build_assessment_index
+    from generate_assessment_data import (
+        build_operation_index,
+        parse_excel_data,
+        parse_items_records,
+        parse_items_reference,
+        parse_items_vectorized,
+    )
+
+    scale_path, operation_path = write_workbooks(work_dir, scale)
+    reader = 'openpyxl' if mode == 'records' else 'pandas'
+    with timer.stage('read'):
+        scale_df, operation_df = parse_excel_data(str(scale_path), str(operation_path), reader)
+    with timer.stage('operation_index'):
+        operation_index = build_operation_index(operation_df)
+    builder = AssessmentDataBuilder(AGE_MONTHS)
+    parse = {
+        'vectorized': parse_items_vectorized,
+        'reference': parse_items_reference,
+        'records': parse_items_records,
+    }[mode]
+    with timer.stage('parse'):
+        parse(scale_df, operation_index, builder, set())
+    with timer.stage('group'):
+        assessment_data = builder.build()
+    with timer.stage('index'):
+        build_assessment_index(assessment_data, AGE_MONTHS)
+    with timer.stage('serialize'):
+        payload = json.dumps(assessment_data, ensure_ascii=False, indent=2)
+    return {
+        'rows': len(scale_df),
+        'operationRows': len(operation_df),
+        'groups': len(assessment_data),
+        'items': sum(len(group['testItems']) for group in assessment_data),
+        'jsonBytes': len(payload.encode('utf-8')),
+    }
+
+def bench_validate(timer: StageTimer, work_dir: Path, scale: int, font: Optional[str] = None) -> Dict[str, Any]:
+    from validate_data import iter_json_array, validate_assessment_data
+
+    path = write_bundle(work_dir, scale)
+    with timer.stage('stream'):
+        with open(path, 'r', encoding='utf-8') as f:
+            groups = sum(1 for _ in iter_json_array(f))
+    # 校验报告写入内存缓冲，不计入终端输出的耗时
+    report = io.StringIO()
+    with timer.stage('validate'):
+        with redirect_stdout(report):
+            ok = validate_assessment_data(str(path))
+    if not ok:
+        raise RuntimeError(f"合成数据未通过校验: {path}\n{report.getvalue()}")
+    return {'groups': groups, 'bytes': os.path.getsize(path)}
+
+def bench_diff(timer: StageTimer, work_dir: Path, scale: int, font: Optional[str] = None) -> Dict[str, Any]:
+    from diff_data import diff_indexes, diff_to_json, format_text_report, index_data
+
+    old_path, new_path = write_bundle(work_dir, scale), write_modified_bundle(work_dir, scale)
+    with timer.stage('index'):
+        old, new = index_data(str(old_path)), index_data(str(new_path))
+    with timer.stage('compare'):
+        diff = diff_indexes(old, new)
+    with timer.stage('report'):
+        format_text_report(diff)
+        json.dumps(diff_to_json(diff), ensure_ascii=False)
+    return {
+        'items': len(old.items),
+        'added': len(diff.added),
+        'removed': len(diff.removed),
+        'moved': len(diff.moved),
+        'changed': len(diff.changed),
+    }
+
+def bench_match(timer: StageTimer, work_dir: Path, scale: int, font: Optional[str] = None) -> Dict[str, Any]:
+    from assessment_builder import AGE_MONTHS, AssessmentDataBuilder
+    from generate_assessment_data import (
+        build_operation_index,
+        fuzzy_match_applied,
+        parse_excel_data,
+        parse_items_vectorized,
+    )
+
+    scale_path, _ = write_workbooks(work_dir, scale)
+    operation_path = write_renumbered_workbook(work_dir, scale)
+    with timer.stage('read'):
+        scale_df, operation_df = parse_excel_data(str(scale_path), str(operation_path))
+    with timer.stage('operation_index'):
+        operation_index = build_operation_index(operation_df)
+    with timer.stage('parse'):
+        parse_items_vectorized(scale_df, operation_index, AssessmentDataBuilder(AGE_MONTHS), set())
+    fuzzy = operation_index.fuzzy.values()
+    return {
+        'operationRows': len(operation_df),
+        'fuzzy': sum(1 for match in fuzzy if fuzzy_match_applied(match)),
+        'ties': sum(1 for match in fuzzy if match['tie']),
+        'conflicts': sum(1 for match in fuzzy if match['conflict'] and not match['tie']),
+        'unmatched': len(operation_index.unmatched),
+    }
+
+def bench_screenshots(timer: StageTimer, work_dir: Path, configs: int, sizes: int,
+                      font: Optional[str] = None) -> Dict[str, Any]:
+    """与 render_single_image 相同的步骤，分为 decode / layout / render（含编码写出）三个阶段计时"""
+    import generate_appstore_screenshots as screenshots
+    from font_registry import default_registry
+
+    if font:
+        # 替代 Noto Sans CJK JP Medium，用于未安装该字体的机器；结果中记录所用字体
+        screenshots._load_noto_cjk_jp_medium = lambda size: default_registry.get(font, size)
+    else:
+        try:
+            screenshots._resolve_noto_cjk_ttc_path()
+        except FileNotFoundError as exc:
+            raise SkipCase(f"{exc}可用 --font 指定替代字体")
+
+    input_dir = write_screenshot_inputs(work_dir, configs, sizes)
+    output_dir = work_dir / f"output-{input_dir.name}"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    data = screenshots.load_json(input_dir / "config.json")
+    style = screenshots.build_style(data["styleConfig"])
+    devices = screenshots.parse_devices(data["devices"])
+    bound = screenshots.screenshot_bound(style, devices)
+
+    outputs = 0
+    for item in data["configs"]:
+        with timer.stage('decode'):
+            prepared = screenshots.prepare_item(input_dir, item, bound)
+        with timer.stage('layout'):
+            blocks = screenshots.layout_text(style, prepared)
+        for device in devices:
+            device_style = screenshots.scale_style(style, device)
+            with timer.stage('render'):
+                screenshots.render_prepared(
+                    device_style, prepared, blocks, output_dir / device.name / prepared.out_name,
+                    device_style.layout_scale / style.layout_scale,
+                )
+            outputs += 1
+    return {'configs': configs, 'sizes': sizes, 'outputs': outputs}
+
+SUITES: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'excel': bench_excel,
+    'validate': bench_validate,
+    'diff': bench_diff,
+    'match': bench_match,
+    'screenshots': bench_screenshots,
+}
+
+def build_cases(suites: Sequence[str], scales: Sequence[int],
+                screenshot_configs: Sequence[int], screenshot_sizes: Sequence[int]) -> List[Case]:
+    """按命令行参数展开用例列表，用例名即结果文件中的键"""
+    cases: List[Case] = []
+    if 'excel' in suites:
+        for mode in ('vectorized', 'reference', 'records'):
+            for scale in scales:
+                if mode == 'reference' and scale > REFERENCE_MAX_SCALE:
+                    continue
+                cases.append(Case(f"excel/{mode}/x{scale}", 'excel', (('scale', scale), ('mode', mode))))
+    if 'validate' in suites:
+        for scale in scales:
+            cases.append(Case(f"validate/x{scale}", 'validate', (('scale', scale),)))
+    if 'diff' in suites:
+        for scale in scales:
+            cases.append(Case(f"diff/x{scale}", 'diff', (('scale', scale),)))
+    if 'match' in suites:
+        for scale in scales:
+            cases.append(Case(f"match/x{scale}", 'match', (('scale', scale),)))
+    if 'screenshots' in suites:
+        for configs in screenshot_configs:
+            for sizes in screenshot_sizes:
+                cases.append(Case(f"screenshots/n{configs}-m{sizes}", 'screenshots', (('configs', configs), ('sizes', sizes))))
+    return cases
+
+def prepare_inputs(cases: Sequence[Case], work_dir: Path) -> None:
+    """在运行前生成全部合成输入，使生成耗时不计入任何用例"""
+    for case in cases:
+        params = dict(case.params)
+        if case.suite == 'excel':
+            write_workbooks(work_dir, params['scale'])
+        elif case.suite == 'validate':
+            write_bundle(work_dir, params['scale'])
+        elif case.suite == 'diff':
+            write_bundle(work_dir, params['scale'])
+            write_modified_bundle(work_dir, params['scale'])
+        elif case.suite == 'match':
+            write_workbooks(work_dir, params['scale'])
+            write_renumbered_workbook(work_dir, params['scale'])
+        elif case.suite == 'screenshots':
+            write_screenshot_inputs(work_dir, params['configs'], params['sizes'])
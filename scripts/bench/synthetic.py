@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试用的合成输入（固定随机种子，多次生成的内容逐字节一致）
+
+- 表A.1 / 表B.1 工作簿：1× 为真实量表的 28 个月龄列 × 10 行，N× 为 10N 行，每个单元格一个项目；
+  超出 10 行的部分在生成脚本中归入 unknown 能区，只影响分组结果，不影响解析开销
+- assessment_data.json：5 个能区 × 28 个月龄，每个分组 2N 个项目，编号与分值满足 validate_data.py 的语义检查；
+  另有一份修改版（改动部分项目的文字与分值，并移动、删除、新增少量项目），用于 diff_data.py
+- 重新编号的表B.1：约 5% 的行编号改变、1% 的行缺少编号且名称改动一个字，用于编号未匹配时的按名称匹配
+- 截图配置：N 张截图（RGB，由圆角色块与文字行组成，接近真实 App 截图的内容）与 M 个输出尺寸
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from assessment_builder import AGE_MONTHS, AREA_ORDER, AssessmentDataBuilder
+
+# 生成逻辑变化时递增，使 --work-dir 中保留的旧输入失效
+SYNTHETIC_VERSION = 1
+
+SEED = 20240601
+
+# 真实量表的行数（每个能区两行）
+BASE_ROWS = 10
+
+# 用于拼接项目名称与操作说明的常见字
+_NAME_CHARS = "俯卧抬头坐起翻身爬行站立扶走拇指捏取积木搭高模仿发音叫名回应指认图片表达需要握笔画线"
+_SENTENCE_CHARS = "婴儿仰卧检查者将花铃棒放在其手中观察能否握住并保持片刻若能抬起头部即可通过测查要求"
+
+# 截图基准可选的输出尺寸（App Store 常用尺寸）
+DEVICE_SIZES = [
+    ("iphone-6.9", 1320, 2868),
+    ("ipad-13", 2064, 2752),
+    ("iphone-6.5", 1284, 2778),
+    ("iphone-5.5", 1242, 2208),
+    ("ipad-12.9", 2048, 2732),
+]
+
+# 合成截图的尺寸（iPhone 6.7 寸屏幕截图）
+SCREENSHOT_SIZE = (1290, 2796)
+
+def _text(rng: random.Random, chars: str, low: int, high: int) -> str:
+    return "".join(rng.choice(chars) for _ in range(rng.randint(low, high)))
+
+def scale_frames(scale: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """按倍数构造 (表A.1, 表B.1) 的 DataFrame，列名与真实工作簿一致"""
+    rng = random.Random(SEED + scale)
+    rows = BASE_ROWS * scale
+    grid: Dict[str, List[str]] = {'项目': [f"能区{row // 2}" for row in range(rows)]}
+    operations: List[Tuple[str, str, str]] = []
+    for col_idx, age in enumerate(AGE_MONTHS):
+        column = []
+        for row in range(rows):
+            item_id = col_idx * rows + row + 1
+            name = _text(rng, _NAME_CHARS, 4, 10)
+            column.append(f"□{item_id} {name}")
+            operations.append((
+                f"{item_id}．{name}",
+                _text(rng, _SENTENCE_CHARS, 30, 90),
+                _text(rng, _SENTENCE_CHARS, 8, 30),
+            ))
+        grid[f'{age} 月龄'] = column
+    operations.sort(key=lambda entry: int(entry[0].split('．')[0]))
+    scale_df = pd.DataFrame(grid)
+    operation_df = pd.DataFrame(operations, columns=['测查项目', '操作方法', '测查通过要求'])
+    return scale_df, operation_df
+
+def write_workbooks(work_dir: Path, scale: int) -> Tuple[Path, Path]:
+    """写出 N× 的表A.1 与表B.1 工作簿，已存在时直接复用"""
+    scale_path = work_dir / f"scale-v{SYNTHETIC_VERSION}-x{scale}.xlsx"
+    operation_path = work_dir / f"operation-v{SYNTHETIC_VERSION}-x{scale}.xlsx"
+    if not scale_path.exists() or not operation_path.exists():
+        scale_df, operation_df = scale_frames(scale)
+        scale_df.to_excel(scale_path, index=False)
+        operation_df.to_excel(operation_path, index=False)
+    return scale_path, operation_path
+
+def renumbered_operation_frame(scale: int) -> pd.DataFrame:
+    """在 scale_frames 的表B.1 基础上做确定性的修改：约 5% 的行编号加上偏移（A.1 中不再有该编号），
+    约 1% 的行去掉编号并替换名称中的一个字"""
+    rng = random.Random(SEED + 13 * scale)
+    _, operation_df = scale_frames(scale)
+    offset = 10 ** len(str(len(operation_df)))
+    projects = []
+    for text in operation_df['测查项目']:
+        item_id, name = text.split('．', 1)
+        roll = rng.random()
+        if roll < 0.05:
+            text = f"{int(item_id) + offset}．{name}"
+        elif roll < 0.06:
+            pos = rng.randrange(len(name))
+            text = "．" + name[:pos] + rng.choice(_NAME_CHARS) + name[pos + 1:]
+        projects.append(text)
+    return operation_df.assign(测查项目=projects)
+
+def write_renumbered_workbook(work_dir: Path, scale: int) -> Path:
+    """写出 N× 的重新编号的表B.1 工作簿，已存在时直接复用"""
+    path = work_dir / f"operation-renumbered-v{SYNTHETIC_VERSION}-x{scale}.xlsx"
+    if not path.exists():
+        renumbered_operation_frame(scale).to_excel(path, index=False)
+    return path
+
+def assessment_bundle(scale: int) -> List[Dict[str, Any]]:
+    """构造 N× 的 assessment_data 结构：编号在分组内、以及同一能区跨月龄时递增"""
+    rng = random.Random(SEED - scale)
+    per_group = 2 * scale
+    builder = AssessmentDataBuilder()
+    item_id = 0
+    for age in AGE_MONTHS:
+        for area in AREA_ORDER:
+            for _ in range(per_group):
+                item_id += 1
+                name = _text(rng, _NAME_CHARS, 4, 10)
+                builder.add_item(age, area, {
+                    'id': item_id,
+                    'name': name,
+                    'desc': name,
+                    'operation': _text(rng, _SENTENCE_CHARS, 30, 90),
+                    'passCondition': _text(rng, _SENTENCE_CHARS, 8, 30),
+                    'score': 0.0,
+                    'area': area,
+                })
+    return builder.build()
+
+def write_bundle(work_dir: Path, scale: int) -> Path:
+    """写出 N× 的 assessment_data.json（与生成脚本相同的缩进格式），已存在时直接复用"""
+    path = work_dir / f"assessment-v{SYNTHETIC_VERSION}-x{scale}.json"
+    if not path.exists():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(assessment_bundle(scale), f, ensure_ascii=False, indent=2)
+    return path
+
+def modified_bundle(scale: int) -> List[Dict[str, Any]]:
+    """在 assessment_bundle 的基础上做确定性的修改：约 2% 的项目改动文字、1% 改动分值，
+    每个能区的前几个月龄各移动一个项目到下一个月龄、删除一个项目，每个分组新增一个项目"""
+    rng = random.Random(SEED + 7 * scale)
+    groups = assessment_bundle(scale)
+    next_id = max(item['id'] for group in groups for item in group['testItems']) + 1
+    for group_idx, group in enumerate(groups):
+        items = group['testItems']
+        for item in items:
+            roll = rng.random()
+            if roll < 0.02:
+                item['operation'] = item['operation'][:10] + _text(rng, _SENTENCE_CHARS, 2, 6) + item['operation'][10:]
+            elif roll < 0.03:
+                item['score'] = round(item['score'] * 0.9, 6)
+        if group_idx % 7 == 0 and len(items) > 2:
+            items.pop(1)
+        if group_idx % 11 == 0 and group_idx + len(AREA_ORDER) < len(groups) and len(items) > 2:
+            # 移到同一能区的下一个月龄
+            groups[group_idx + len(AREA_ORDER)]['testItems'].append(items.pop())
+        items.append({
+            'id': next_id, 'name': _text(rng, _NAME_CHARS, 4, 10), 'desc': '',
+            'operation': _text(rng, _SENTENCE_CHARS, 30, 90), 'passCondition': _text(rng, _SENTENCE_CHARS, 8, 30),
+            'score': 0.0, 'area': group['area'],
+        })
+        next_id += 1
+    return groups
+
+def write_modified_bundle(work_dir: Path, scale: int) -> Path:
+    """写出 N× 的修改版 assessment_data.json，已存在时直接复用"""
+    path = work_dir / f"assessment-modified-v{SYNTHETIC_VERSION}-x{scale}.json"
+    if not path.exists():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(modified_bundle(scale), f, ensure_ascii=False, indent=2)
+    return path
+
+def _screenshot(rng: np.random.Generator, size: Tuple[int, int]) -> Image.Image:
+    """圆角色块 + 文字行，接近真实 App 截图的内容与压缩率"""
+    width, height = size
+    image = Image.new("RGB", size, tuple(int(c) for c in rng.integers(200, 256, 3)))
+    draw = ImageDraw.Draw(image)
+    y = 0
+    while y < height:
+        block = int(rng.integers(80, 400))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        draw.rounded_rectangle((40, y + 20, width - 40, y + block), radius=24, fill=color)
+        for line_y in range(y + 40, y + block - 20, 36):
+            draw.rectangle((80, line_y, 80 + int(rng.integers(200, width - 160)), line_y + 14), fill=(40, 40, 40))
+        y += block + 20
+    return image
+
+def write_screenshot_inputs(work_dir: Path, configs: int, sizes: int) -> Path:
+    """写出 N 个条目、M 个输出尺寸的截图输入目录（config.json + 截图），已存在时直接复用"""
+    if sizes > len(DEVICE_SIZES):
+        raise ValueError(f"输出尺寸数不能超过 {len(DEVICE_SIZES)}")
+    input_dir = work_dir / f"screenshots-v{SYNTHETIC_VERSION}-n{configs}-m{sizes}"
+    config_path = input_dir / "config.json"
+    if config_path.exists():
+        return input_dir
+
+    input_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(SEED)
+    text_rng = random.Random(SEED)
+    items = []
+    for idx in range(configs):
+        name = f"shot{idx + 1:02d}.png"
+        _screenshot(rng, SCREENSHOT_SIZE).save(input_dir / name, compress_level=1)
+        items.append({
+            "title": _text(text_rng, _NAME_CHARS, 6, 14),
+            "subtitle": _text(text_rng, _SENTENCE_CHARS, 16, 40),
+            "screenshot": name,
+            "outputName": f"{idx + 1:02d}.png",
+        })
+    config = {
+        "styleConfig": {
+            "width": 1242,
+            "height": 2688,
+            "useBackgroundGradient": True,
+            "backgroundTopColor": "#FFFFFF",
+            "backgroundBottomColor": "#DDE6FF",
+        },
+        "devices": [{"name": name, "width": width, "height": height} for name, width, height in DEVICE_SIZES[:sizes]],
+        "configs": items,
+    }
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    return input_dir
+
+def parse_counts(value: str) -> List[int]:
+    """解析逗号分隔的正整数列表，如 "1,10,100" """
+    counts = [int(part) for part in value.split(',') if part.strip()]
+    if not counts or any(count <= 0 for count in counts):
+        raise ValueError(f"需要逗号分隔的正整数: {value!r}")
+    return counts
+
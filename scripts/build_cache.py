@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据生成的增量构建缓存
+按输入文件内容哈希缓存解析后的中间数据，并记录输出文件对应的构建键；
+输入、解析参数与数据结构版本均未变化时可跳过重新生成。
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# 构建结果状态
+BUILD_HIT = 'hit'          # 输入均未变化，跳过生成与写入
+BUILD_PARTIAL = 'partial'  # 部分中间数据来自缓存，重新生成输出
+BUILD_FULL = 'full'        # 全部重新解析
+
+BUILD_STATUS_LABELS = {
+    BUILD_HIT: '缓存命中（跳过生成）',
+    BUILD_PARTIAL: '部分重建',
+    BUILD_FULL: '完整重建',
+}
+
+def file_digest(path: str) -> str:
+    """计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def params_digest(params: Dict[str, Any]) -> str:
+    """计算参数字典的稳定哈希"""
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def write_atomic(path: str, data: bytes) -> None:
+    """先写临时文件再替换，避免中断时留下半截文件"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class BuildCache:
+    """基于内容哈希的构建缓存
+
+    - frames/<输入哈希>-<参数哈希>.pkl：解析后的中间数据
+    - manifest.json：输出文件 -> 构建键与输出内容哈希
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.frames_dir = self.cache_dir / 'frames'
+        self.manifest_path = self.cache_dir / 'manifest.json'
+        self._digests: Dict[str, str] = {}
+
+    def digest(self, path: str) -> str:
+        """输入文件哈希（同一次运行内只计算一次）"""
+        if path not in self._digests:
+            self._digests[path] = file_digest(path)
+        return self._digests[path]
+
+    def build_key(self, inputs: Iterable[str], params: Dict[str, Any]) -> str:
+        """由输入文件哈希与解析参数组合出构建键
+
+        输入按在列表中的位置记录（而不是文件名）：不同目录下的同名工作簿（如各地区版本）互不覆盖，
+        工作簿移动位置但内容不变时仍命中缓存。
+        """
+        return params_digest({
+            'inputs': [self.digest(path) for path in inputs],
+            'params': params,
+        })
+
+    def load_or_parse(self, path: str, parser: Callable[[str], Any], params: Dict[str, Any]) -> Tuple[Any, bool]:
+        """读取缓存的中间数据，未命中时调用 parser 解析并写入缓存
+
+        返回 (数据, 是否命中缓存)
+        """
+        frame_path = self.frames_dir / f'{self.digest(path)}-{params_digest(params)[:16]}.pkl'
+        if frame_path.exists():
+            try:
+                with frame_path.open('rb') as f:
+                    return pickle.load(f), True
+            except Exception:
+                # 缓存损坏或版本不兼容时重新解析
+                pass
+
+        data = parser(path)
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(str(frame_path), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        return data, False
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with self.manifest_path.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def output_is_current(self, output_file: str, build_key: str) -> bool:
+        """输出文件存在、未被修改，且构建键与上次一致"""
+        entry = self._load_manifest().get(os.path.abspath(output_file))
+        if not entry or entry.get('buildKey') != build_key:
+            return False
+        if not os.path.exists(output_file):
+            return False
+        return file_digest(output_file) == entry.get('outputDigest')
+
+    def record_output(self, output_file: str, build_key: str, status: Optional[str] = None) -> None:
+        """记录输出文件的构建键与内容哈希"""
+        manifest = self._load_manifest()
+        manifest[os.path.abspath(output_file)] = {
+            'buildKey': build_key,
+            'outputDigest': file_digest(output_file),
+            'status': status,
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+        write_atomic(str(self.manifest_path), payload.encode('utf-8'))
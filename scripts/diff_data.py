@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比较两个版本的 assessment_data.json
+按 (月龄, 能区, 项目编号) 建立索引后逐项比较，取代人工审阅整份 JSON 的 git diff：
+
+- 新增 / 删除的项目
+- 移动的项目：同一编号从一个 (月龄, 能区) 分组移到另一个分组
+- 内容变化：name、desc、operation、passCondition、score 等字段逐字段比较，并按字段汇总变化数量
+- 分组变化：分组新增、删除与能区分数变化
+
+两个文件都以流式方式读取顶层数组，只在内存中保留索引；建索引与比较都是线性时间
+（每个项目一次字典插入与一次查找），多语言数据包中成千上万个项目也能很快完成。
+
+用法示例（在仓库根目录执行）：
+  python scripts/diff_data.py old.json new.json                 # 文本报告
+  python scripts/diff_data.py old.json new.json --format json   # JSON 报告，便于其他工具处理
+  git show HEAD~1:child_development_assessment/assets/data/assessment_data.json > /tmp/old.json
+  python scripts/diff_data.py /tmp/old.json child_development_assessment/assets/data/assessment_data.json
+
+退出状态与 diff 相同：0 表示没有差异，1 表示存在差异，2 表示文件无法读取或结构不正确。
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from validate_data import SCORE_TOLERANCE, JSONStreamError, iter_json_array, validate_assessment_group
+import tracing
+
+# 项目在文件中的位置：(月龄, 能区)
+GroupKey = Tuple[int, str]
+ItemKey = Tuple[int, str, int]
+
+# 逐字段比较时的字段顺序（其余字段按名称排在后面）
+FIELD_ORDER = ('name', 'desc', 'operation', 'passCondition', 'score', 'area')
+
+# 文本报告中每段文字变化显示的最大长度
+DEFAULT_TEXT_WIDTH = 60
+
+class DiffInputError(ValueError):
+    """输入文件无法读取或不符合 assessment_data 结构"""
+
+@dataclass
+class IndexedItem:
+    group: GroupKey
+    item: Dict[str, Any]
+    # JSON Pointer 路径，如 /3/testItems/5
+    path: str
+
+@dataclass
+class DataIndex:
+    """一个 assessment_data.json 的索引"""
+    file: str
+    items: Dict[ItemKey, IndexedItem] = field(default_factory=dict)
+    # 分组 -> 能区分数
+    groups: Dict[GroupKey, float] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+
+def index_data(path: str) -> DataIndex:
+    """流式读取并按 (月龄, 能区, 编号) 建立索引；结构不正确时抛出 DiffInputError"""
+    index = DataIndex(file=path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for group_idx, group in enumerate(iter_json_array(f)):
+                group_path = f"/{group_idx}"
+                errors = []
+                validate_assessment_group(group, group_path, errors)
+                if errors:
+                    raise DiffInputError(f"{path}: {errors[0]}（请先运行 validate_data.py 检查）")
+                group_key = (group['ageMonth'], group['area'])
+                if group_key in index.groups:
+                    index.warnings.append(f"{path}: {group_path} 月龄 {group_key[0]} 能区 {group_key[1]} 的分组重复出现，已合并")
+                index.groups[group_key] = group['score']
+                for item_idx, item in enumerate(group['testItems']):
+                    key = (group_key[0], group_key[1], item['id'])
+                    item_path = f"{group_path}/testItems/{item_idx}"
+                    if key in index.items:
+                        index.warnings.append(f"{path}: {item_path} 项目编号 {item['id']} 在同一分组中重复，只比较第一次出现的项目")
+                        continue
+                    index.items[key] = IndexedItem(group=group_key, item=item, path=item_path)
+    except OSError as exc:
+        raise DiffInputError(f"无法读取 {path}: {exc}") from exc
+    except JSONStreamError as exc:
+        raise DiffInputError(f"{path}: {exc.path or '/'}: {exc}") from exc
+    return index
+
+@dataclass
+class ItemDiff:
+    """一个项目的变化：old / new 为 None 分别表示新增 / 删除"""
+    item_id: int
+    old: Optional[IndexedItem]
+    new: Optional[IndexedItem]
+    # 字段名 -> (旧值, 新值)，字段缺失记为 None
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return (self.new or self.old).item.get('name', '')
+
+@dataclass
+class GroupDiff:
+    group: GroupKey
+    status: str  # added / removed / changed
+    old_score: Optional[float] = None
+    new_score: Optional[float] = None
+
+@dataclass
+class DataDiff:
+    old: DataIndex
+    new: DataIndex
+    added: List[ItemDiff] = field(default_factory=list)
+    removed: List[ItemDiff] = field(default_factory=list)
+    moved: List[ItemDiff] = field(default_factory=list)
+    changed: List[ItemDiff] = field(default_factory=list)
+    groups: List[GroupDiff] = field(default_factory=list)
+
+    @property
+    def has_differences(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.changed or self.groups)
+
+    def field_counts(self) -> Dict[str, int]:
+        """各字段发生变化的项目数（含移动后内容也变化的项目）"""
+        counts: Dict[str, int] = {}
+        for diff in self.moved + self.changed:
+            for name in diff.fields:
+                counts[name] = counts.get(name, 0) + 1
+        return {name: counts[name] for name in _ordered_fields(counts)}
+
+def _ordered_fields(names) -> List[str]:
+    return [name for name in FIELD_ORDER if name in names] + sorted(set(names) - set(FIELD_ORDER))
+
+def _values_equal(name: str, old: Any, new: Any) -> bool:
+    if name == 'score' and isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return math.isclose(old, new, abs_tol=SCORE_TOLERANCE)
+    return old == new
+
+def compare_items(old: IndexedItem, new: IndexedItem) -> Dict[str, Tuple[Any, Any]]:
+    """逐字段比较两个项目；移动到其他能区时，与分组能区一致的 area 字段不算作变化"""
+    changes = {}
+    for name in _ordered_fields(old.item.keys() | new.item.keys()):
+        old_value, new_value = old.item.get(name), new.item.get(name)
+        if name == 'area' and old_value in (None, old.group[1]) and new_value in (None, new.group[1]):
+            continue
+        if not _values_equal(name, old_value, new_value):
+            changes[name] = (old_value, new_value)
+    return changes
+
+def diff_indexes(old: DataIndex, new: DataIndex) -> DataDiff:
+    """比较两个索引：先按 (月龄, 能区, 编号) 精确匹配，其余按编号配对为移动"""
+    result = DataDiff(old=old, new=new)
+    # 新文件中没有的旧项目（按文件顺序），以及按编号的查找表
+    unmatched: List[ItemKey] = []
+    unmatched_by_id: Dict[int, Deque[ItemKey]] = {}
+    for key, old_item in old.items.items():
+        new_item = new.items.get(key)
+        if new_item is None:
+            unmatched.append(key)
+            unmatched_by_id.setdefault(key[2], deque()).append(key)
+            continue
+        changes = compare_items(old_item, new_item)
+        if changes:
+            result.changed.append(ItemDiff(key[2], old_item, new_item, changes))
+
+    paired: Set[ItemKey] = set()
+    for key, new_item in new.items.items():
+        if key in old.items:
+            continue
+        candidates = unmatched_by_id.get(key[2])
+        if candidates:
+            # 同一编号在旧文件中出现在其他分组：按出现顺序配对为移动（队首取出为常数时间）
+            old_key = candidates.popleft()
+            paired.add(old_key)
+            old_item = old.items[old_key]
+            result.moved.append(ItemDiff(key[2], old_item, new_item, compare_items(old_item, new_item)))
+        else:
+            result.added.append(ItemDiff(key[2], None, new_item))
+    result.removed = [ItemDiff(key[2], old.items[key], None) for key in unmatched if key not in paired]
+
+    for group_key, old_score in old.groups.items():
+        if group_key not in new.groups:
+            result.groups.append(GroupDiff(group_key, 'removed', old_score=old_score))
+        elif not _values_equal('score', old_score, new.groups[group_key]):
+            result.groups.append(GroupDiff(group_key, 'changed', old_score, new.groups[group_key]))
+    for group_key, new_score in new.groups.items():
+        if group_key not in old.groups:
+            result.groups.append(GroupDiff(group_key, 'added', new_score=new_score))
+    return result
+
+def diff_files(old_path: str, new_path: str) -> DataDiff:
+    with tracing.span('index', path=old_path):
+        old = index_data(old_path)
+    with tracing.span('index', path=new_path):
+        new = index_data(new_path)
+    with tracing.span('compare'):
+        return diff_indexes(old, new)
+
+def _group_label(group: GroupKey) -> str:
+    return f"{group[0]} 月龄 {group[1]}"
+
+def _item_label(diff: ItemDiff) -> str:
+    return f"#{diff.item_id} {diff.name}"
+
+def _clip(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + '…'
+
+def format_value_change(old: Any, new: Any, width: int = DEFAULT_TEXT_WIDTH) -> str:
+    """字段变化的简短描述：较长的文字只显示去掉公共前后缀后的不同部分"""
+    if not isinstance(old, str) or not isinstance(new, str):
+        return f"{json.dumps(old, ensure_ascii=False)} -> {json.dumps(new, ensure_ascii=False)}"
+    if len(old) <= width and len(new) <= width:
+        return f"{old!r} -> {new!r}"
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    # 保留少量上下文
+    start = max(0, prefix - 8)
+    old_part = ('…' if start else '') + old[start:len(old) - suffix] + ('…' if suffix else '')
+    new_part = ('…' if start else '') + new[start:len(new) - suffix] + ('…' if suffix else '')
+    return f"{_clip(old_part, width)!r} -> {_clip(new_part, width)!r}（第 {prefix + 1} 个字符起）"
+
+def format_text_report(diff: DataDiff, limit: int = 50, width: int = DEFAULT_TEXT_WIDTH) -> List[str]:
+    """人工审阅用的文本报告；每一类最多列出 limit 项"""
+    lines = [
+        f"旧: {diff.old.file}（{len(diff.old.groups)} 个分组，{len(diff.old.items)} 个项目）",
+        f"新: {diff.new.file}（{len(diff.new.groups)} 个分组，{len(diff.new.items)} 个项目）",
+    ]
+    for warning in diff.old.warnings + diff.new.warnings:
+        lines.append(f"警告：{warning}")
+    if not diff.has_differences:
+        lines.append("\n两个文件的内容一致")
+        return lines
+
+    lines.append(f"\n新增 {len(diff.added)} 项，删除 {len(diff.removed)} 项，移动 {len(diff.moved)} 项，"
+                 f"内容变化 {len(diff.changed)} 项，分组变化 {len(diff.groups)} 处")
+    counts = diff.field_counts()
+    if counts:
+        lines.append("各字段变化的项目数: " + "，".join(f"{name} {count}" for name, count in counts.items()))
+
+    def section(title: str, entries: List[Any], render) -> None:
+        if not entries:
+            return
+        lines.append(f"\n{title}（{len(entries)}）:")
+        for entry in entries[:limit]:
+            lines.extend(render(entry))
+        if len(entries) > limit:
+            lines.append(f"  ... 其余 {len(entries) - limit} 项未显示")
+
+    def field_lines(item_diff: ItemDiff) -> List[str]:
+        return [f"      {name}: {format_value_change(old, new, width)}" for name, (old, new) in item_diff.fields.items()]
+
+    section("分组变化", diff.groups, lambda group: [
+        f"  {'+' if group.status == 'added' else '-' if group.status == 'removed' else '*'} {_group_label(group.group)}"
+        + (f" 分数 {group.old_score} -> {group.new_score}" if group.status == 'changed' else "")
+    ])
+    section("新增", diff.added, lambda item: [f"  + {_group_label(item.new.group)} {_item_label(item)}"])
+    section("删除", diff.removed, lambda item: [f"  - {_group_label(item.old.group)} {_item_label(item)}"])
+    section("移动", diff.moved, lambda item: [
+        f"  ~ {_item_label(item)}: {_group_label(item.old.group)} -> {_group_label(item.new.group)}"
+    ] + field_lines(item))
+    section("内容变化", diff.changed, lambda item: [f"  * {_group_label(item.new.group)} {_item_label(item)}"] + field_lines(item))
+    return lines
+
+def _location(entry: IndexedItem) -> Dict[str, Any]:
+    return {'ageMonth': entry.group[0], 'area': entry.group[1], 'path': entry.path}
+
+def diff_to_json(diff: DataDiff) -> Dict[str, Any]:
+    """机器可读的报告：字段变化包含完整的旧值与新值"""
+    def item_entry(item_diff: ItemDiff) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {'id': item_diff.item_id, 'name': item_diff.name}
+        if item_diff.old is not None:
+            entry['old'] = _location(item_diff.old)
+        if item_diff.new is not None:
+            entry['new'] = _location(item_diff.new)
+        if item_diff.fields:
+            entry['fields'] = {name: {'old': old, 'new': new} for name, (old, new) in item_diff.fields.items()}
+        return entry
+
+    return {
+        'old': {'file': diff.old.file, 'groups': len(diff.old.groups), 'items': len(diff.old.items)},
+        'new': {'file': diff.new.file, 'groups': len(diff.new.groups), 'items': len(diff.new.items)},
+        'summary': {
+            'added': len(diff.added),
+            'removed': len(diff.removed),
+            'moved': len(diff.moved),
+            'changed': len(diff.changed),
+            'groups': len(diff.groups),
+            'fields': diff.field_counts(),
+        },
+        'groups': [
+            {'ageMonth': group.group[0], 'area': group.group[1], 'status': group.status,
+             'oldScore': group.old_score, 'newScore': group.new_score}
+            for group in diff.groups
+        ],
+        'added': [item_entry(item) for item in diff.added],
+        'removed': [item_entry(item) for item in diff.removed],
+        'moved': [item_entry(item) for item in diff.moved],
+        'changed': [item_entry(item) for item in diff.changed],
+        'warnings': diff.old.warnings + diff.new.warnings,
+    }
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="按 (月龄, 能区, 项目编号) 比较两个版本的 assessment_data.json")
+    parser.add_argument("old_file", help="旧版本的数据文件")
+    parser.add_argument("new_file", help="新版本的数据文件")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="报告格式，默认 text")
+    parser.add_argument("--output", help="报告写入的文件，默认输出到终端")
+    parser.add_argument("--limit", type=int, default=50, help="文本报告中每一类最多列出的项目数，默认 50")
+    parser.add_argument("--width", type=int, default=DEFAULT_TEXT_WIDTH,
+                        help=f"文本报告中文字变化显示的最大长度，默认 {DEFAULT_TEXT_WIDTH}")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'diff_data')
+    try:
+        diff = diff_files(args.old_file, args.new_file)
+    except DiffInputError as exc:
+        print(f"错误：{exc}", file=sys.stderr)
+        sys.exit(2)
+
+    with tracing.span('report', format=args.format):
+        if args.format == 'json':
+            report = json.dumps(diff_to_json(diff), ensure_ascii=False, indent=2)
+        else:
+            report = "\n".join(format_text_report(diff, args.limit, args.width))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+        print(f"报告已保存到: {args.output}")
+    else:
+        print(report)
+    sys.exit(1 if diff.has_differences else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+截图成品的导出配置（格式、色彩模式与压缩参数）
+
+- standard：PNG RGBA，optimize=True（原有行为）
+- draft：PNG RGB，zlib 级别 1，不做 optimize，用于反复调整布局
+- release：渲染时先按 draft 快速写出，再由独立的后处理阶段（可多进程）以最高压缩重新编码；
+  系统中有 oxipng 时改用 oxipng
+- jpeg / webp：RGB 有损格式，文件扩展名随之改变
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+@dataclass(frozen=True)
+class ExportProfile:
+    name: str
+    format: str
+    extension: str
+    mode: str
+    # Image.save 的参数，按 (键, 值) 元组存放以便作为缓存键
+    options: Tuple[Tuple[str, Any], ...]
+    # 是否需要后处理阶段重新压缩
+    post_process: bool = False
+
+PROFILES: Dict[str, ExportProfile] = {
+    "standard": ExportProfile("standard", "PNG", ".png", "RGBA", (("optimize", True),)),
+    "draft": ExportProfile("draft", "PNG", ".png", "RGB", (("compress_level", 1),)),
+    "release": ExportProfile("release", "PNG", ".png", "RGB", (("compress_level", 1),), post_process=True),
+    "jpeg": ExportProfile("jpeg", "JPEG", ".jpg", "RGB", (("quality", 92), ("optimize", True), ("subsampling", 0))),
+    "webp": ExportProfile("webp", "WEBP", ".webp", "RGB", (("quality", 90), ("method", 4))),
+}
+
+DEFAULT_PROFILE = "standard"
+
+# 后处理：oxipng 的优化级别
+OXIPNG_LEVEL = "4"
+
+# 后处理结果：(路径, 原大小, 新大小, 耗时, 错误信息)；失败时错误信息非空，文件保持渲染阶段写出的内容
+PostProcessStat = Tuple[str, int, int, float, Optional[str]]
+
+def output_path(path: Path, profile: ExportProfile) -> Path:
+    """按导出格式调整扩展名（PNG 保持配置中的文件名不变）"""
+    if profile.format == "PNG":
+        return path
+    return path.with_suffix(profile.extension)
+
+def save_image(canvas: Image.Image, path: Path, profile: ExportProfile) -> int:
+    """按导出配置保存，返回文件字节数"""
+    image = canvas if canvas.mode == profile.mode else canvas.convert(profile.mode)
+    image.save(path, format=profile.format, **dict(profile.options))
+    return path.stat().st_size
+
+def optimize_png(path: str) -> Tuple[str, int, int, float]:
+    """以最高压缩重新编码 PNG，返回 (路径, 原大小, 新大小, 耗时)；结果更大时保留原文件"""
+    start = time.perf_counter()
+    before = os.path.getsize(path)
+    oxipng = shutil.which("oxipng")
+    if oxipng:
+        subprocess.run([oxipng, "-o", OXIPNG_LEVEL, "--strip", "safe", "-q", path], check=True)
+    else:
+        tmp_path = f"{path}.tmp"
+        try:
+            with Image.open(path) as image:
+                image.save(tmp_path, format="PNG", optimize=True, compress_level=9)
+            if os.path.getsize(tmp_path) < before:
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return path, before, os.path.getsize(path), time.perf_counter() - start
+
+def optimize_or_keep(path: str) -> PostProcessStat:
+    """optimize_png 的容错版本：失败时保留原文件，把异常记为错误信息返回，不影响其他文件"""
+    start = time.perf_counter()
+    try:
+        return optimize_png(path) + (None,)
+    except Exception as exc:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return path, size, size, time.perf_counter() - start, f"{type(exc).__name__}: {exc}"
+
+def post_process(paths: Sequence[Path], jobs: int) -> List[PostProcessStat]:
+    """release 配置的后处理阶段：多进程重新压缩 PNG，结果按输入顺序返回；单个文件失败不会中断其他文件"""
+    names = [str(path) for path in paths]
+    if jobs <= 1 or len(names) <= 1:
+        return [optimize_or_keep(name) for name in names]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(names))) as pool:
+        return list(pool.map(optimize_or_keep, names))
+
+def log_post_process(stats: Sequence[PostProcessStat], elapsed: float) -> None:
+    for path, _, _, _, error in stats:
+        if error is not None:
+            logging.error("  后处理失败，保留未重新压缩的文件 %s: %s", path, error)
+    before = sum(item[1] for item in stats)
+    after = sum(item[2] for item in stats)
+    failed = sum(1 for item in stats if item[4] is not None)
+    tool = "oxipng" if shutil.which("oxipng") else "Pillow optimize"
+    logging.info(
+        "后处理（%s）: %d 张，失败 %d 张，%.1f KB -> %.1f KB（%.1f%%），耗时 %.2fs（各张合计 %.2fs）",
+        tool, len(stats), failed, before / 1024, after / 1024, (after / before * 100) if before else 100.0,
+        elapsed, sum(item[3] for item in stats),
+    )
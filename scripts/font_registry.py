@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内字体注册表
+字体集合（.ttc）只扫描一次，记住每个 (字体族, 字重) 对应的字面下标；
+FreeTypeFont 按 (路径, 字号, 字面下标) 缓存，超过上限时按最近最少使用淘汰。
+
+generate_appstore_screenshots.py 在同一次运行的所有 configs 间共用一个注册表，
+多进程渲染时每个工作进程各有一份。
+"""
+
+import logging
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from PIL import Image, ImageDraw, ImageFont
+
+import tracing
+
+# 默认缓存的 FreeTypeFont 数量上限
+DEFAULT_MAX_FONTS = 64
+
+# 扫描字体名称时使用的字号（名称与字号无关，取较小值以减少开销）
+_SCAN_SIZE = 16
+
+FontKey = Tuple[str, int, int]
+FontType = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+def collection_face_count(path: Union[str, Path]) -> int:
+    """读取字体文件包含的字面数：.ttc/.otc 读取 'ttcf' 头部，其他格式视为 1"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    if len(header) == 12 and header[:4] == b'ttcf':
+        return struct.unpack('>I', header[8:12])[0]
+    return 1
+
+class FontRegistry:
+    """扫描结果与 FreeTypeFont 的缓存"""
+
+    def __init__(self, max_fonts: int = DEFAULT_MAX_FONTS):
+        self.max_fonts = max_fonts
+        self._faces: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self._fonts: 'OrderedDict[FontKey, ImageFont.FreeTypeFont]' = OrderedDict()
+        self._probe = ImageDraw.Draw(Image.new("RGB", (10, 10), (255, 255, 255)))
+
+    def faces(self, path: Union[str, Path]) -> Dict[Tuple[str, str], int]:
+        """返回 (字体族, 字重) -> 字面下标；每个文件只扫描一次"""
+        path = str(path)
+        faces = self._faces.get(path)
+        if faces is None:
+            faces = {}
+            for index in range(collection_face_count(path)):
+                try:
+                    name = ImageFont.truetype(path, _SCAN_SIZE, index=index).getname()
+                except OSError as exc:
+                    logging.debug("读取字面失败 %s#%d: %s", path, index, exc)
+                    continue
+                family, style = (tuple(name) + ("", ""))[:2]
+                # 同名字面以第一次出现为准
+                faces.setdefault((family or "", style or ""), index)
+            self._faces[path] = faces
+            logging.debug("已扫描字体 %s，共 %d 个字面", path, len(faces))
+        return faces
+
+    def find_face(self, path: Union[str, Path], family: str, style: str) -> Optional[int]:
+        return self.faces(path).get((family, style))
+
+    def get(self, path: Union[str, Path], size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+        """按 (路径, 字号, 字面下标) 取得 FreeTypeFont，带 LRU 缓存"""
+        key = (str(path), int(size), int(index))
+        font = self._fonts.get(key)
+        if font is not None:
+            tracing.count('font.cache_hit')
+            self._fonts.move_to_end(key)
+            return font
+        tracing.count('font.load')
+        with tracing.span('font.load', path=Path(key[0]).name, size=key[1], index=key[2]):
+            font = ImageFont.truetype(key[0], key[1], index=key[2])
+        self._fonts[key] = font
+        if len(self._fonts) > self.max_fonts:
+            self._fonts.popitem(last=False)
+        return font
+
+    def get_face(self, path: Union[str, Path], size: int, family: str, style: str) -> ImageFont.FreeTypeFont:
+        """按字体族与字重取得 FreeTypeFont，找不到时抛出 LookupError"""
+        index = self.find_face(path, family, style)
+        if index is None:
+            raise LookupError(f"未在 {path} 中找到 '{family} {style}' 字面")
+        return self.get(path, size, index)
+
+    def is_effective(self, font: FontType, target_size: int) -> bool:
+        # 通过测量一个代表性字符的 bbox 高度，判断当前字体是否接近目标字号（避免退回到很小的位图字体）
+        try:
+            bbox = self._probe.textbbox((0, 0), "国", font=font)
+            height = bbox[3] - bbox[1]
+            return height >= max(12, target_size // 2)
+        except Exception:
+            return False
+
+    def clear(self) -> None:
+        self._faces.clear()
+        self._fonts.clear()
+
+# 进程内共用的注册表
+default_registry = FontRegistry()
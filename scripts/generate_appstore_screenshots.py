@@ -8,7 +8,11 @@
   python scripts/generate_appstore_screenshots.py \
     --input-dir /path/to/folder \
     --config config.json \
-    --output-dir /path/to/output
+    --output-dir /path/to/output \
+    --jobs 4                    # 可选，并行渲染的进程数（0 表示按 CPU 核数）
+    [--force]                   # 可选，不跳过未变化的输出，全部重新生成（仍列出遗留输出）
+    [--export-profile release]  # 可选，导出配置 standard/draft/release/jpeg/webp（见 export_profiles.py）
+    [--max-decode-megapixels 8] # 可选，单张截图解码后的像素上限，限制每个工作进程的内存（PNG 等源图超出时报错）
 
 目录结构要求：
   input-dir/
@@ -36,6 +40,10 @@ JSON 配置示例（字段命名大小写不敏感，以下为参考）：
     "screenshotMaxHeightRatio": 0.72,   // 截图在成品图中占比的最大高度
     "screenshotTopOffset": null         // 可选，像素偏移（覆盖自动布局）
   },
+  "devices": [                        // 可选，多设备输出：以 styleConfig 的 width/height 为参考尺寸按比例缩放布局，
+    { "name": "iphone-6.9", "width": 1320, "height": 2868 },   // 输出到 output-dir/<name>/
+    { "name": "ipad-13", "width": 2064, "height": 2752 }
+  ],
   "configs": [
     { "title": "标题", "subtitle": "副标题", "screenshot": "screenshot1.png", "outputName": "01.png" }
   ]
@@ -43,7 +51,7 @@ JSON 配置示例（字段命名大小写不敏感，以下为参考）：
 
 注意：
 - 不在代码中硬编码任何业务 mock 数据；如未提供样式字段，将采用通用安全默认值。
-- 文本排版按最大宽度自动换行，且支持居中/左/右对齐。
+- 文本排版按最大宽度自动换行（遵守中日文避头尾规则，见 text_layout.py），且支持居中/左/右对齐。
 """
 
 from __future__ import annotations
@@ -51,12 +59,23 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
 import os
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
+
+from build_cache import file_digest, params_digest, write_atomic
+from export_profiles import DEFAULT_PROFILE, PROFILES, ExportProfile, log_post_process, output_path, post_process, save_image
+from font_registry import default_registry
+from text_layout import default_engine
+from gradients import ColorStop, linear_gradient, normalize_stops, radial_gradient
+import tracing
 
 
 def parse_args() -> argparse.Namespace:
@@ -66,6 +85,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output-dir", default=None, help="输出目录，默认为输入目录下的 output 子目录")
     # 字体策略：始终使用开源字体（Noto/思源 等）。该参数保留但不再生效。
     parser.add_argument("--verbose", action="store_true", help="输出详细日志")
+    parser.add_argument("--jobs", type=int, default=1, help="并行渲染的进程数，默认 1（串行）；0 表示使用全部 CPU 核")
+    parser.add_argument("--force", action="store_true", help="不跳过未变化的输出，重新生成全部图片（仍按旧清单列出遗留输出）")
+    parser.add_argument(
+        "--export-profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+        help="导出配置：standard（PNG RGBA optimize，默认）/draft（快速 PNG RGB）/release（快速写出后多进程最高压缩）/jpeg/webp",
+    )
+    parser.add_argument(
+        "--max-decode-megapixels", type=float, default=None,
+        help="单张截图解码后的像素上限（百万像素），用于限制每个工作进程的内存：JPEG 超出时缩小解码（不小于最终显示尺寸），"
+             "其他格式无法缩小解码，源图超出时该条目报错",
+    )
+    tracing.add_arguments(parser)
     return parser.parse_args()
 
 
@@ -117,129 +148,31 @@ def _resolve_noto_cjk_ttc_path() -> Path:
     raise FileNotFoundError("未找到 NotoSansCJK.ttc，请先安装 'font-noto-sans-cjk'。")
 
 
-def _is_font_effective(draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, target_size: int) -> bool:
-    # 通过测量一个代表性字符的 bbox 高度，判断当前字体是否接近目标字号（避免退回到很小的位图字体）
-    try:
-        bbox = draw.textbbox((0, 0), "国", font=font)
-        height = bbox[3] - bbox[1]
-        # 允许一定误差；若小于目标字号的一半，则认为无效
-        return height >= max(12, target_size // 2)
-    except Exception:
-        return False
-
-
-def try_load_font(font_path: Optional[str], font_size: int, require_open_font: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    # 优先使用指定字体；失败则在候选集中回退，最后再回退到 PIL 默认字体
-    candidates: List[str] = []
-    if require_open_font:
-        if font_path:
-            base = os.path.basename(font_path).lower()
-            if any(token in base for token in ["notosans", "sourcehansans", "思源", "noto"]):
-                candidates.append(font_path)
-            else:
-                logging.warning("已启用 open-font-only，忽略非开源字体路径: %s", font_path)
-        candidates.extend(_open_font_candidates())
-    else:
-        if font_path:
-            candidates.append(font_path)
-        # 开源优先，再到通用候选
-        candidates.extend(_open_font_candidates())
-        candidates.extend(_font_candidates())
-
-    # 使用一个临时画布来验证字号是否有效
-    tmp_img = Image.new("RGB", (10, 10), (255, 255, 255))
-    tmp_draw = ImageDraw.Draw(tmp_img)
-
-    for path in candidates:
-        p = Path(path)
-        if not p.exists():
-            continue
-        try:
-            font = ImageFont.truetype(str(p), font_size)
-            if _is_font_effective(tmp_draw, font, font_size):
-                logging.debug("使用字体: %s @ %d", path, font_size)
-                return font
-            else:
-                logging.debug("字体有效性不足（字号过小）: %s @ %d，继续回退", path, font_size)
-        except Exception as exc:
-            logging.debug("尝试字体失败 %s: %s", path, exc)
-
-    # 最后退回 PIL 默认字体
-    fallback = ImageFont.load_default()
-    if require_open_font:
-        logging.warning("已启用 open-font-only，但未找到合适的开源中文字体，已回退到 PIL 默认字体（可能导致文字偏小）")
-    else:
-        logging.warning("未找到合适的可缩放中文字体，已回退到 PIL 默认字体（可能导致文字偏小）")
-    return fallback
-
-
 def _load_noto_cjk_jp_medium(font_size: int) -> ImageFont.FreeTypeFont:
-    """固定使用 Noto Sans CJK JP Medium。若找不到则报错。"""
-    ttc = str(_resolve_noto_cjk_ttc_path())
-    tmp_img = Image.new("RGB", (10, 10), (255, 255, 255))
-    tmp_draw = ImageDraw.Draw(tmp_img)
-    target_family = "Noto Sans CJK JP"
-    target_style = "Medium"
-    # 扫描较大的 index 范围以兼容不同版本
-    for idx in range(0, 128):
-        try:
-            f = ImageFont.truetype(ttc, font_size, index=idx)
-            name = getattr(f, "getname", lambda: ("", ""))()
-            family, subfam = (name + ("",))[:2] if isinstance(name, tuple) else (str(name), "")
-            if family == target_family and subfam == target_style and _is_font_effective(tmp_draw, f, font_size):
-                return ImageFont.truetype(ttc, font_size, index=idx)
-        except Exception:
-            continue
-    raise RuntimeError("未在 NotoSansCJK.ttc 中找到 'Noto Sans CJK JP Medium' 字面。请确认字体版本。")
+    """固定使用 Noto Sans CJK JP Medium。若找不到则报错。
+
+    字体集合只扫描一次，字面下标与各字号的字体由字体注册表缓存，在同一进程的所有 configs 间共用。
+    """
+    ttc = _resolve_noto_cjk_ttc_path()
+    try:
+        font = default_registry.get_face(ttc, font_size, "Noto Sans CJK JP", "Medium")
+    except LookupError:
+        raise RuntimeError("未在 NotoSansCJK.ttc 中找到 'Noto Sans CJK JP Medium' 字面。请确认字体版本。")
+    if not default_registry.is_effective(font, font_size):
+        raise RuntimeError(f"Noto Sans CJK JP Medium 在字号 {font_size} 下无法正常渲染")
+    return font
 
 def measure_multiline_text(draw: ImageDraw.ImageDraw, text_lines: List[str], font: ImageFont.ImageFont, line_spacing: int) -> Tuple[int, int]:
-    max_width = 0
-    total_height = 0
-    for line in text_lines:
-        bbox = draw.textbbox((0, 0), line, font=font)
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
-        max_width = max(max_width, width)
-        total_height += height + line_spacing
-    if text_lines:
-        total_height -= line_spacing
-    return max_width, total_height
+    layout = default_engine.place(text_lines, font, 0, line_spacing, "left", 0, 0)
+    return layout.width, layout.height
 
 
 def wrap_text_to_width(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
-    # 简单按字/空格断行（中文按字，英文按空格）
-    if not text:
-        return []
-    lines: List[str] = []
-    current = ""
-    words = []
-    # 将连续英文视为词，其他字符按单字切分
-    buffer = ""
-    for ch in text:
-        if ch.encode("utf-8").isalnum() or ch in "-_@#&/":
-            buffer += ch
-        else:
-            if buffer:
-                words.append(buffer)
-                buffer = ""
-            words.append(ch)
-    if buffer:
-        words.append(buffer)
-
-    for token in words:
-        tentative = current + token
-        width = draw.textlength(tentative, font=font)
-        if width <= max_width or not current:
-            current = tentative
-        else:
-            lines.append(current)
-            current = token
-    if current:
-        lines.append(current)
-    return lines
+    # 按宽度断行（中文按字、英文按词，遵守避头尾规则），详见 text_layout.py；draw 参数仅为兼容保留
+    return default_engine.wrap(text, font, max_width)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Style:
     width: int
     height: int
@@ -268,6 +201,10 @@ class Style:
     use_background_gradient: bool
     background_top_color: Tuple[int, int, int, int]
     background_bottom_color: Tuple[int, int, int, int]
+    # 背景渐变类型（linear/radial）、线性渐变角度（CSS 约定，180 为自上而下）与色标
+    background_gradient_type: str
+    background_gradient_angle: float
+    background_gradient_stops: Tuple[ColorStop, ...]
     # 是否绘制主体灰色面板（开启则会覆盖 backgroundColor）
     use_panel: bool
     # 主体灰色面板（代替外层白边），圆角与内边距
@@ -279,6 +216,106 @@ class Style:
     # 文案强调：将副标题作为主标题（更大）
     subtitle_is_headline: bool
     subtitle_scale: float
+    # 文案自动适配：每段文字不超过最大行数，必要时在 [最小字号, 配置字号] 内取能放下的最大字号
+    auto_fit: bool
+    title_max_lines: int
+    subtitle_max_lines: int
+    title_min_font_size: int
+    subtitle_min_font_size: int
+    # 相对参考尺寸的布局缩放比例（多设备输出时由 scale_style 设置）
+    layout_scale: float = 1.0
+
+
+def parse_gradient_stops(value: Any, default: Tuple[ColorStop, ...]) -> Tuple[ColorStop, ...]:
+    """解析渐变色标，支持以下写法（可混用）：
+
+    - "#FFFFFF"：未给出位置的色标在相邻已知位置之间均匀分布
+    - [0.3, "#FFFFFF"]
+    - {"offset": 0.3, "color": "#FFFFFF"}
+    """
+    if not value:
+        return default
+    if not isinstance(value, list):
+        logging.warning("渐变色标 %r 应为数组，使用默认值", value)
+        return default
+
+    offsets: List[Optional[float]] = []
+    colors: List[Tuple[int, int, int, int]] = []
+    for entry in value:
+        if isinstance(entry, dict):
+            offset = get_value_case_insensitive(entry, "offset")
+            color = get_value_case_insensitive(entry, "color")
+        elif isinstance(entry, (list, tuple)) and len(entry) == 2:
+            offset, color = entry
+        else:
+            offset, color = None, entry
+        offsets.append(float(offset) if offset is not None else None)
+        colors.append(parse_color(color, (255, 255, 255, 255)))
+
+    # 首尾缺省为 0 与 1，中间缺省的位置按线性补齐
+    if offsets[0] is None:
+        offsets[0] = 0.0
+    if offsets[-1] is None:
+        offsets[-1] = 1.0
+    known = [i for i, offset in enumerate(offsets) if offset is not None]
+    for left, right in zip(known, known[1:]):
+        for i in range(left + 1, right):
+            offsets[i] = offsets[left] + (offsets[right] - offsets[left]) * (i - left) / (right - left)
+    try:
+        return normalize_stops(list(zip(offsets, colors)))
+    except ValueError as exc:
+        logging.warning("渐变色标无效（%s），使用默认值", exc)
+        return default
+
+
+def build_background_layer(style: Style) -> Image.Image:
+    """背景图层：纯色，或 use_background_gradient 时的线性/径向渐变"""
+    size = (style.width, style.height)
+    if not style.use_background_gradient:
+        return Image.new("RGBA", size, style.background)
+    if style.background_gradient_type == "radial":
+        return radial_gradient(size, style.background_gradient_stops).copy()
+    return linear_gradient(size, style.background_gradient_stops, style.background_gradient_angle).copy()
+
+
+# 渲染分两阶段：与条目无关的静态图层（背景、面板、截图圆角遮罩与描边）按 Style 和截图尺寸缓存，
+# 每个条目只绘制文字与截图，背景直接从缓存复制。Style 为不可变数据类（含画布尺寸），可直接作为缓存键。
+# 每个图层都是整幅画布（1242x2688 的 RGBA 约 13 MB），缓存只需容纳一次运行中的设备尺寸数（通常 2～3 个），
+# 超出时按最近最少使用淘汰。
+STATIC_LAYER_CACHE_SIZE = 4
+
+
+@lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+def static_background(style: Style) -> Image.Image:
+    """背景与主体面板合成后的底图；调用方需 copy() 后再绘制"""
+    canvas = build_background_layer(style)
+    # 主体面板：默认关闭，若 use_panel=true 则叠加自上而下的灰色渐变面板；否则直接用 backgroundColor
+    if style.use_panel:
+        panel_stops = normalize_stops([(0.0, style.panel_top_color), (1.0, style.panel_bottom_color)])
+        canvas.alpha_composite(linear_gradient((style.width, style.height), panel_stops))
+    return canvas
+
+
+@lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+def screenshot_frame(
+    target_size: Tuple[int, int],
+    border_width: int,
+    border_color: Tuple[int, int, int, int],
+    layout_scale: float = 1.0,
+) -> Tuple[Image.Image, Optional[Image.Image]]:
+    """截图的圆角遮罩与外描边图层（描边宽度为 0 时不生成）"""
+    mask = Image.new("L", target_size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, target_size[0], target_size[1]], radius=round(56 * layout_scale), fill=255)
+    border_img = None
+    if border_width > 0:
+        border_img = Image.new("RGBA", (target_size[0] + border_width * 2, target_size[1] + border_width * 2), (0, 0, 0, 0))
+        ImageDraw.Draw(border_img).rounded_rectangle(
+            [0, 0, border_img.width - 1, border_img.height - 1],
+            radius=round(60 * layout_scale),
+            outline=border_color,
+            width=border_width,
+        )
+    return mask, border_img
 
 
 def build_style(style_cfg: Dict[str, Any]) -> Style:
@@ -315,6 +352,12 @@ def build_style(style_cfg: Dict[str, Any]) -> Style:
     use_background_gradient = bool(get_value_case_insensitive(style_cfg, "usebackgroundgradient", False))
     background_top_color = parse_color(get_value_case_insensitive(style_cfg, "backgroundtopcolor", "#FFFFFF"), (255, 255, 255, 255))
     background_bottom_color = parse_color(get_value_case_insensitive(style_cfg, "backgroundbottomcolor", "#FFFFFF"), (255, 255, 255, 255))
+    background_gradient_type = str(get_value_case_insensitive(style_cfg, "backgroundgradienttype", "linear")).lower()
+    background_gradient_angle = float(get_value_case_insensitive(style_cfg, "backgroundgradientangle", 180))
+    background_gradient_stops = parse_gradient_stops(
+        get_value_case_insensitive(style_cfg, "backgroundgradientstops"),
+        ((0.0, background_top_color), (1.0, background_bottom_color)),
+    )
     # 默认不再绘制灰色面板，直接使用 backgroundColor 作为背景色
     use_panel = bool(get_value_case_insensitive(style_cfg, "usepanel", False))
     # 灰色主体面板（参考图视觉主体）
@@ -326,10 +369,19 @@ def build_style(style_cfg: Dict[str, Any]) -> Style:
     # 文案强调
     subtitle_is_headline = bool(get_value_case_insensitive(style_cfg, "subtitleisheadline", True))
     subtitle_scale = float(get_value_case_insensitive(style_cfg, "subtitlescale", 1.4))
+    # 文案自动适配（多语言文案长度差异大时使用）；最小字号默认为配置字号的 60%
+    auto_fit = bool(get_value_case_insensitive(style_cfg, "autofit", False))
+    title_max_lines = int(get_value_case_insensitive(style_cfg, "titlemaxlines", 2))
+    subtitle_max_lines = int(get_value_case_insensitive(style_cfg, "subtitlemaxlines", 3))
+    title_min_font_size = int(get_value_case_insensitive(style_cfg, "titleminfontsize", round(title_font_size * 0.6)))
+    subtitle_min_font_size = int(get_value_case_insensitive(style_cfg, "subtitleminfontsize", round(subtitle_font_size * 0.6)))
 
     if text_align not in {"center", "left", "right"}:
         logging.warning("textAlign=%r 无效，回退为 center", text_align)
         text_align = "center"
+    if background_gradient_type not in {"linear", "radial"}:
+        logging.warning("backgroundGradientType=%r 无效，回退为 linear", background_gradient_type)
+        background_gradient_type = "linear"
     if screenshot_mode not in {"fit"}:  # 目前仅实现 fit
         logging.warning("screenshotMode=%r 暂不支持，回退为 fit", screenshot_mode)
         screenshot_mode = "fit"
@@ -360,6 +412,9 @@ def build_style(style_cfg: Dict[str, Any]) -> Style:
         use_background_gradient=use_background_gradient,
         background_top_color=background_top_color,
         background_bottom_color=background_bottom_color,
+        background_gradient_type=background_gradient_type,
+        background_gradient_angle=background_gradient_angle,
+        background_gradient_stops=background_gradient_stops,
         use_panel=use_panel,
         panel_corner_radius=panel_corner_radius,
         panel_top_color=panel_top_color,
@@ -368,29 +423,198 @@ def build_style(style_cfg: Dict[str, Any]) -> Style:
         panel_padding=panel_padding,
         subtitle_is_headline=subtitle_is_headline,
         subtitle_scale=subtitle_scale,
+        auto_fit=auto_fit,
+        title_max_lines=title_max_lines,
+        subtitle_max_lines=subtitle_max_lines,
+        title_min_font_size=title_min_font_size,
+        subtitle_min_font_size=subtitle_min_font_size,
     )
 
 
-def compute_text_x(style: Style, draw: ImageDraw.ImageDraw, line: str, font: ImageFont.ImageFont) -> int:
-    line_width = draw.textlength(line, font=font)
-    if style.text_align == "left":
-        return style.padding
-    if style.text_align == "right":
-        return style.width - style.padding - int(line_width)
-    # center
-    return (style.width - int(line_width)) // 2
+@dataclass(frozen=True)
+class Device:
+    """一个目标输出尺寸；输出写入 output-dir 下以 name 命名的子目录"""
+    name: str
+    width: int
+    height: int
 
 
-def render_single_image(
+def parse_devices(value: Any) -> List[Device]:
+    """解析配置中的 devices 数组：[{"name": "iphone-6.9", "width": 1320, "height": 2868}, ...]"""
+    if not value:
+        return []
+    if not isinstance(value, list):
+        raise SystemExit("devices 必须为数组")
+    devices: List[Device] = []
+    names = set()
+    for idx, entry in enumerate(value):
+        name = get_value_case_insensitive(entry, "name")
+        width = get_value_case_insensitive(entry, "width")
+        height = get_value_case_insensitive(entry, "height")
+        if not name or width is None or height is None:
+            raise SystemExit(f"devices[{idx}] 需要 name、width、height 字段")
+        if name in names:
+            raise SystemExit(f"devices[{idx}] 名称重复: {name}")
+        names.add(name)
+        devices.append(Device(name=str(name), width=int(width), height=int(height)))
+    return devices
+
+
+def scaled_font_size(font_size: int, scale: float) -> int:
+    """按比例缩放字号并向下取整：四舍五入可能比按比例缩放的大小多出 1，使参考尺寸下换好的行溢出"""
+    return max(1, math.floor(font_size * scale + 1e-9))
+
+
+def scale_style(style: Style, device: Device) -> Style:
+    """按设备尺寸缩放样式：以 styleConfig 的 width/height 为参考尺寸，取宽高缩放比例中较小者，
+    字号与各像素间距统一按该比例缩放。字号向下取整，保证参考尺寸下换好的行在目标尺寸下仍放得下。"""
+    scale = min(device.width / style.width, device.height / style.height)
+
+    def px(value: int) -> int:
+        return max(1, round(value * scale)) if value > 0 else value
+
+    return replace(
+        style,
+        width=device.width,
+        height=device.height,
+        title_font_size=scaled_font_size(style.title_font_size, scale),
+        subtitle_font_size=scaled_font_size(style.subtitle_font_size, scale),
+        padding=px(style.padding),
+        line_spacing=px(style.line_spacing),
+        screenshot_top_offset=round(style.screenshot_top_offset * scale) if style.screenshot_top_offset is not None else None,
+        text_to_image_spacing=px(style.text_to_image_spacing),
+        text_top_offset=px(style.text_top_offset),
+        screenshot_bottom_margin=px(style.screenshot_bottom_margin),
+        screenshot_border_width=px(style.screenshot_border_width),
+        panel_corner_radius=px(style.panel_corner_radius),
+        panel_margin=px(style.panel_margin),
+        panel_padding=px(style.panel_padding),
+        title_min_font_size=scaled_font_size(style.title_min_font_size, scale),
+        subtitle_min_font_size=scaled_font_size(style.subtitle_min_font_size, scale),
+        layout_scale=style.layout_scale * scale,
+    )
+
+
+@dataclass
+class PreparedItem:
+    """一个 configs 条目解码后的共享状态：多设备输出时截图只解码一次"""
+    title: str
+    subtitle: str
+    screenshot_path: Path
+    # 解码后的截图：源图无透明通道时为 RGB；可能已按目标尺寸缩小
+    screenshot: Image.Image
+    out_name: str
+    # 源图原始尺寸，布局按原始尺寸计算，与是否缩小解码无关
+    source_size: Tuple[int, int] = (0, 0)
+
+
+@dataclass
+class TextBlock:
+    """按参考尺寸换好行的一段文字；font_size 为参考尺寸下的字号"""
+    label: str
+    lines: List[str]
+    font_size: int
+    color: Tuple[int, int, int, int]
+
+
+def output_file_name(item: Dict[str, Any]) -> str:
+    """导出文件名：outputName，缺省为 <截图名>_appstore.png"""
+    output_name = get_value_case_insensitive(item, "outputname")
+    if output_name:
+        return output_name
+    base = Path(get_value_case_insensitive(item, "screenshot")).stem
+    return f"{base}_appstore.png"
+
+
+# 缩小解码时保留的余量：解码结果至少为最终尺寸的 REDUCING_GAP 倍，再用 LANCZOS 缩放到最终尺寸，
+# 与 Image.thumbnail 的 reducing_gap 含义相同
+REDUCING_GAP = 2.0
+
+# Image.reduce 支持的模式；其他模式（如 P）先转换再缩小
+_REDUCIBLE_MODES = {"L", "LA", "RGB", "RGBA", "RGBa", "La", "I", "F"}
+
+
+def screenshot_bound(style: Style, devices: Sequence[Device] = ()) -> Tuple[int, int]:
+    """截图在所有输出尺寸中可能占用的最大区域（宽, 高）"""
+    styles = [scale_style(style, device) for device in devices] if devices else [style]
+    return (
+        max(item.width - item.panel_padding * 2 for item in styles),
+        max(int(item.height * item.screenshot_max_height_ratio) for item in styles),
+    )
+
+
+def decode_size(
+    source_size: Tuple[int, int],
+    bound: Tuple[int, int],
+    max_pixels: Optional[int] = None,
+) -> Tuple[int, int]:
+    """解码目标尺寸：源图等比放入 bound 后的尺寸乘以 REDUCING_GAP，不超过源图；
+    给出 max_pixels 时进一步限制像素数，但不小于最终显示尺寸"""
+    width, height = source_size
+    ratio = min(1.0, bound[0] / width, bound[1] / height)
+    fitted = ratio * REDUCING_GAP
+    if max_pixels:
+        fitted = min(fitted, (max_pixels / (width * height)) ** 0.5)
+    fitted = min(1.0, max(ratio, fitted))
+    return max(1, int(width * fitted)), max(1, int(height * fitted))
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA", "RGBa", "La") or "transparency" in image.info
+
+
+@tracing.traced('decode')
+def decode_screenshot(
+    path: Path,
+    bound: Optional[Tuple[int, int]] = None,
+    max_pixels: Optional[int] = None,
+) -> Tuple[Image.Image, Tuple[int, int]]:
+    """按目标尺寸解码截图，返回 (图像, 原始尺寸)
+
+    JPEG 用 draft 在解码时按 1/2、1/4、1/8 缩小，其他格式解码后用 reduce 整数倍缩小，
+    都保证不小于 decode_size 的结果；源图没有透明通道时保持 RGB，不再额外转换为 RGBA。
+    其他格式（如 PNG）只能先完整解码，源图像素数超过 max_pixels（及解码目标）时直接拒绝，不再解码。
+    """
+    # 不使用 with：按文件名打开的单帧图像在 load() 后会自动关闭文件，解码结果可直接返回，省去一次整图复制
+    src = Image.open(path)
+    source_size = src.size
+    target = decode_size(source_size, bound, max_pixels) if bound else source_size
+    if max_pixels and src.format != "JPEG":
+        source_pixels = source_size[0] * source_size[1]
+        if source_pixels > max(max_pixels, target[0] * target[1]):
+            src.close()
+            raise ValueError(
+                f"{path.name} 为 {src.format} 格式（{source_size[0]}x{source_size[1]}），无法缩小解码，"
+                f"完整解码超出 --max-decode-megapixels {max_pixels / 1_000_000:g}；请缩小源图或改用 JPEG"
+            )
+    has_alpha = _has_alpha(src)
+    if src.format == "JPEG" and target != source_size:
+        src.draft("RGB", target)
+    src.load()
+    image = src
+    factor = min(image.width // target[0], image.height // target[1])
+    if factor >= 2:
+        if image.mode not in _REDUCIBLE_MODES:
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        image = image.reduce(factor)
+    mode = "RGBA" if has_alpha else "RGB"
+    decoded = image.convert(mode) if image.mode != mode else image
+    if decoded is not src:
+        src.close()
+    if decoded.size != source_size:
+        logging.debug("缩小解码 %s: %s -> %s", path, source_size, decoded.size)
+    return decoded, source_size
+
+
+def prepare_item(
     input_dir: Path,
-    output_dir: Path,
-    style: Style,
     item: Dict[str, Any],
-) -> Optional[Path]:
+    bound: Optional[Tuple[int, int]] = None,
+    max_pixels: Optional[int] = None,
+) -> Optional[PreparedItem]:
     title = get_value_case_insensitive(item, "title", "")
     subtitle = get_value_case_insensitive(item, "subtitle", "")
     screenshot_name = get_value_case_insensitive(item, "screenshot")
-    output_name = get_value_case_insensitive(item, "outputname")
 
     if not screenshot_name:
         logging.error("缺少 screenshot 字段，跳过该条目: %s", item)
@@ -401,156 +625,385 @@ def render_single_image(
         logging.error("找不到截图文件: %s", screenshot_path)
         return None
 
-    # 背景：纯白画布（外层白边忽略，仅作画布），不再绘制背景渐变
-    canvas = Image.new("RGBA", (style.width, style.height), style.background)
+    screenshot, source_size = decode_screenshot(screenshot_path, bound, max_pixels)
+    return PreparedItem(
+        title=title, subtitle=subtitle, screenshot_path=screenshot_path, screenshot=screenshot,
+        out_name=output_file_name(item), source_size=source_size,
+    )
 
-    # 主体面板：默认关闭，若 use_panel=true 则按旧逻辑绘制灰面板；否则直接用 backgroundColor
-    if style.use_panel:
-        panel = Image.new("RGBA", (style.width, style.height), (0, 0, 0, 0))
-        panel_draw = ImageDraw.Draw(panel)
-        panel_rect = [0, 0, style.width, style.height]
-        grad_panel = Image.new("RGBA", (1, panel_rect[3] - panel_rect[1]), (0, 0, 0, 0))
-        top_c = style.panel_top_color
-        bot_c = style.panel_bottom_color
-        for y in range(grad_panel.height):
-            t = y / max(1, grad_panel.height - 1)
-            r = int(top_c[0] * (1 - t) + bot_c[0] * t)
-            g = int(top_c[1] * (1 - t) + bot_c[1] * t)
-            b = int(top_c[2] * (1 - t) + bot_c[2] * t)
-            a = int(top_c[3] * (1 - t) + bot_c[3] * t)
-            grad_panel.putpixel((0, y), (r, g, b, a))
-        grad_panel = grad_panel.resize((panel_rect[2] - panel_rect[0], panel_rect[3] - panel_rect[1]))
-        panel.paste(grad_panel, (0, 0))
-        canvas.alpha_composite(panel)
-    draw = ImageDraw.Draw(canvas)
 
-    # 根据配置决定是否仅限开源字体
-    # 固定使用 Noto Sans CJK JP Medium（标题与副标题统一）
-    title_font = _load_noto_cjk_jp_medium(style.title_font_size)
-    subtitle_font = _load_noto_cjk_jp_medium(style.subtitle_font_size)
-    try:
-        logging.debug("title_font: %s", getattr(title_font, "getname", lambda: (str(title_font), ""))())
-        logging.debug("subtitle_font: %s", getattr(subtitle_font, "getname", lambda: (str(subtitle_font), ""))())
-    except Exception:
-        pass
+def fit_font_size(text: str, font_size: int, min_font_size: int, max_lines: int, max_width: int) -> Tuple[int, List[str]]:
+    """二分查找 [min_font_size, font_size] 内换行后不超过 max_lines 行的最大字号
+
+    行数随字号单调不减，每次试探的字体与测量结果都有缓存；最小字号仍放不下时使用最小字号。
+    """
+    def wrap(size: int) -> List[str]:
+        return default_engine.wrap(text, _load_noto_cjk_jp_medium(size), max_width)
+
+    lines = wrap(font_size)
+    if len(lines) <= max_lines or min_font_size >= font_size:
+        return font_size, lines
+
+    best: Optional[Tuple[int, List[str]]] = None
+    low, high = max(1, min_font_size), font_size - 1
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = wrap(mid)
+        if len(candidate) <= max_lines:
+            best = (mid, candidate)
+            low = mid + 1
+        else:
+            high = mid - 1
+    if best is None:
+        size = max(1, min_font_size)
+        logging.warning("文案在最小字号 %d 下仍超过 %d 行: %r", size, max_lines, text)
+        return size, wrap(size)
+    return best
 
+
+@tracing.traced('layout')
+def layout_text(style: Style, prepared: PreparedItem) -> List[TextBlock]:
+    """在参考尺寸下为标题与副标题换行；auto_fit 时按最大行数自动缩小字号"""
     # 文本区域最大宽度
     max_text_width = int(style.width * style.max_text_width_ratio) - style.padding * (0 if style.text_align == "center" else 1)
 
     # 标题与副标题：支持“副标题更醒目”的风格
-    # 将文本整体下移：使用 text_top_offset
-    current_y = style.panel_padding + max(0, style.text_top_offset)
     if style.subtitle_is_headline:
-        # 先绘制小标题（原 title）
-        title_lines = wrap_text_to_width(draw, title or " ", title_font, max_text_width)
-        logging.debug("title raw=%r -> lines=%s", title, title_lines)
-        for line in title_lines:
-            x = compute_text_x(style, draw, line, title_font)
-            draw.text((x, current_y), line, font=title_font, fill=style.title_color)
-            bbox = draw.textbbox((x, current_y), line, font=title_font)
-            line_h = bbox[3] - bbox[1]
-            current_y += line_h + style.line_spacing
-
-        # 再绘制大字号副标题
-        # 副标题采用与主标题相同的字体族（保持一致性），字号为放大后的副标题尺寸
-        big_subtitle_font = title_font if isinstance(title_font, ImageFont.FreeTypeFont) else try_load_font(None, int(style.subtitle_font_size * style.subtitle_scale), require_open_font=style.open_font_only)
-        subtitle_lines = wrap_text_to_width(draw, subtitle or " ", big_subtitle_font, max_text_width)
-        logging.debug("subtitle(headline) raw=%r -> lines=%s", subtitle, subtitle_lines)
-        for line in subtitle_lines:
-            x = compute_text_x(style, draw, line, big_subtitle_font)
-            draw.text((x, current_y), line, font=big_subtitle_font, fill=style.title_color)
-            bbox = draw.textbbox((x, current_y), line, font=big_subtitle_font)
-            line_h = bbox[3] - bbox[1]
-            current_y += line_h + style.line_spacing
+        # 先绘制小标题（原 title），再绘制醒目的副标题
+        # 副标题采用与主标题相同的字体（保持一致性）
+        specs = [
+            ("title", prepared.title, style.title_font_size, style.title_color, style.title_max_lines, style.title_min_font_size),
+            ("subtitle(headline)", prepared.subtitle, style.title_font_size, style.title_color,
+             style.subtitle_max_lines, round(style.title_font_size * style.subtitle_min_font_size / style.subtitle_font_size)),
+        ]
     else:
         # 常规：大标题 + 小副标题
-        title_lines = wrap_text_to_width(draw, title or " ", title_font, max_text_width)
-        logging.debug("title raw=%r -> lines=%s", title, title_lines)
-        for line in title_lines:
-            x = compute_text_x(style, draw, line, title_font)
-            draw.text((x, current_y), line, font=title_font, fill=style.title_color)
-            bbox = draw.textbbox((x, current_y), line, font=title_font)
-            line_h = bbox[3] - bbox[1]
-            current_y += line_h + style.line_spacing
-
-        subtitle_lines = wrap_text_to_width(draw, subtitle or " ", subtitle_font, max_text_width)
-        logging.debug("subtitle raw=%r -> lines=%s", subtitle, subtitle_lines)
-        for line in subtitle_lines:
-            x = compute_text_x(style, draw, line, subtitle_font)
-            draw.text((x, current_y), line, font=subtitle_font, fill=style.subtitle_color)
-            bbox = draw.textbbox((x, current_y), line, font=subtitle_font)
-            line_h = bbox[3] - bbox[1]
-            current_y += line_h + style.line_spacing
+        specs = [
+            ("title", prepared.title, style.title_font_size, style.title_color, style.title_max_lines, style.title_min_font_size),
+            ("subtitle", prepared.subtitle, style.subtitle_font_size, style.subtitle_color, style.subtitle_max_lines, style.subtitle_min_font_size),
+        ]
+
+    blocks: List[TextBlock] = []
+    for label, text, font_size, color, max_lines, min_font_size in specs:
+        # 固定使用 Noto Sans CJK JP Medium（标题与副标题统一）
+        if style.auto_fit and max_lines > 0:
+            font_size, lines = fit_font_size(text or " ", font_size, min_font_size, max_lines, max_text_width)
+        else:
+            lines = default_engine.wrap(text or " ", _load_noto_cjk_jp_medium(font_size), max_text_width)
+        logging.debug("%s raw=%r -> size=%d lines=%s", label, text, font_size, lines)
+        blocks.append(TextBlock(label=label, lines=lines, font_size=font_size, color=color))
+    return blocks
+
+
+def render_prepared(
+    style: Style,
+    prepared: PreparedItem,
+    blocks: List[TextBlock],
+    out_path: Path,
+    text_scale: float = 1.0,
+    profile: ExportProfile = PROFILES[DEFAULT_PROFILE],
+) -> Path:
+    """绘制一张成品图：文字按 text_scale 缩放参考字号，截图按 style 的尺寸重新缩放，按 profile 导出"""
+    # 背景与面板：从静态图层缓存复制
+    with tracing.span('background'):
+        canvas = static_background(style).copy()
+    draw = ImageDraw.Draw(canvas)
+
+    # 将文本整体下移：使用 text_top_offset
+    current_y = style.panel_padding + max(0, style.text_top_offset)
+    with tracing.span('draw_text'):
+        for block in blocks:
+            font = _load_noto_cjk_jp_medium(scaled_font_size(block.font_size, text_scale))
+            # 行坐标与行高由排版引擎一次算出（测量结果有缓存），绘制时直接使用
+            layout = default_engine.place(block.lines, font, current_y, style.line_spacing, style.text_align, style.width, style.padding)
+            for line in layout.lines:
+                draw.text((line.x, line.y), line.text, font=font, fill=block.color)
+            current_y = layout.bottom
 
     # 文本区到截图之间美观间距
     current_y += max(style.text_to_image_spacing, style.padding // 2)
 
     # 3) 绘制截图（居中偏下，带设备卡片与阴影）
-    with Image.open(screenshot_path) as src:
-        src = src.convert("RGBA")
-        available_height = int(style.height * style.screenshot_max_height_ratio)
-        if style.screenshot_top_offset is not None:
-            # 若提供了绝对偏移，则覆盖当前 y
-            current_y = style.screenshot_top_offset
-
-        # 截图最大显示区域（左右各留 padding）
-        # 截图放置在主体面板内部，底部对齐
-        panel_left = style.panel_padding
-        panel_right = style.width - style.panel_padding
-        panel_bottom = style.height - style.panel_padding
-        max_w = panel_right - panel_left
-        max_h = min(available_height, panel_bottom - current_y)
-        if max_w <= 0 or max_h <= 0:
-            logging.warning("可用区域不足，跳过截图绘制: %s", screenshot_path)
-        else:
-            # 等比缩放
-            ratio = min(max_w / src.width, max_h / src.height)
-            target_size = (max(1, int(src.width * ratio)), max(1, int(src.height * ratio)))
+    src = prepared.screenshot
+    source_width, source_height = prepared.source_size
+    available_height = int(style.height * style.screenshot_max_height_ratio)
+    if style.screenshot_top_offset is not None:
+        # 若提供了绝对偏移，则覆盖当前 y
+        current_y = style.screenshot_top_offset
+
+    # 截图最大显示区域（左右各留 padding）
+    # 截图放置在主体面板内部，底部对齐
+    panel_left = style.panel_padding
+    panel_right = style.width - style.panel_padding
+    panel_bottom = style.height - style.panel_padding
+    max_w = panel_right - panel_left
+    max_h = min(available_height, panel_bottom - current_y)
+    if max_w <= 0 or max_h <= 0:
+        logging.warning("可用区域不足，跳过截图绘制: %s", prepared.screenshot_path)
+    else:
+        # 等比缩放（按源图原始尺寸计算，缩小解码不影响布局）
+        ratio = min(max_w / source_width, max_h / source_height)
+        target_size = (max(1, int(source_width * ratio)), max(1, int(source_height * ratio)))
+        with tracing.span('resize', source=f"{src.width}x{src.height}", target=f"{target_size[0]}x{target_size[1]}"):
             resized = src.resize(target_size, Image.LANCZOS)
-            x = panel_left + (max_w - target_size[0]) // 2
-            # 让图片紧贴面板底部（保留少量底部内边距）
-            y = panel_bottom - target_size[1]
-            # 截图圆角裁切 + 外描边（更大圆角）
-            screenshot_mask = Image.new("L", target_size, 0)
-            ImageDraw.Draw(screenshot_mask).rounded_rectangle(
-                [0, 0, target_size[0], target_size[1]],
-                radius=56,
-                fill=255,
+        x = panel_left + (max_w - target_size[0]) // 2
+        # 让图片紧贴面板底部（保留少量底部内边距）
+        y = panel_bottom - target_size[1]
+        # 截图圆角裁切 + 外描边（更大圆角）；遮罩与描边图层按截图尺寸缓存
+        with tracing.span('composite'):
+            screenshot_mask, border_img = screenshot_frame(
+                target_size, style.screenshot_border_width, style.screenshot_border_color, style.layout_scale
             )
-            rounded = Image.new("RGBA", target_size, (0, 0, 0, 0))
-            rounded.paste(resized, (0, 0), screenshot_mask)
-            # 外描边
-            if style.screenshot_border_width > 0:
-                border_img = Image.new("RGBA", (target_size[0] + style.screenshot_border_width * 2, target_size[1] + style.screenshot_border_width * 2), (0, 0, 0, 0))
-                border_draw = ImageDraw.Draw(border_img)
-                border_draw.rounded_rectangle(
-                    [0, 0, border_img.width - 1, border_img.height - 1],
-                    radius=60,
-                    outline=style.screenshot_border_color,
-                    width=style.screenshot_border_width,
-                )
+            if border_img is not None:
                 canvas.alpha_composite(border_img, (x - style.screenshot_border_width, y - style.screenshot_border_width))
-            canvas.alpha_composite(rounded, (x, y))
-            # 删除重复贴图与矩形描边，避免双边问题
-
-    # 导出文件名
-    if output_name:
-        out_name = output_name
-    else:
-        base = Path(screenshot_name).stem
-        out_name = f"{base}_appstore.png"
+            if resized.mode == "RGBA":
+                # 遮罩为 0/255 二值，直接并入截图的 alpha 通道，无需另建透明图层
+                resized.putalpha(ImageChops.multiply(resized.getchannel("A"), screenshot_mask))
+                canvas.alpha_composite(resized, (x, y))
+            else:
+                # 不透明截图：按遮罩直接贴入，与合成不透明图层的结果相同
+                canvas.paste(resized, (x, y), screenshot_mask)
 
-    out_path = output_dir / out_name
+    out_path = output_path(out_path, profile)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     # 按需导出为常规矩形图片（不再对最外层做圆角）
-    canvas.save(out_path, format="PNG", optimize=True)
-    logging.info("已生成: %s", out_path)
+    start = time.perf_counter()
+    with tracing.span('save', path=out_path.name, profile=profile.name):
+        size = save_image(canvas, out_path, profile)
+    logging.info("已生成: %s（%.1f KB，编码 %.2fs）", out_path, size / 1024, time.perf_counter() - start)
     return out_path
 
 
+def render_single_image(
+    input_dir: Path,
+    output_dir: Path,
+    style: Style,
+    item: Dict[str, Any],
+    devices: Sequence[Device] = (),
+    profile: ExportProfile = PROFILES[DEFAULT_PROFILE],
+    max_decode_pixels: Optional[int] = None,
+    decode_bound: Optional[Tuple[int, int]] = None,
+) -> List[Path]:
+    """渲染 configs 中的一项，返回生成的文件列表（条目被跳过时为空）
+
+    未配置 devices 时按 style 的尺寸输出到 output_dir；否则截图解码与文字换行只做一次，
+    再按每个设备缩放后分别输出到 output_dir/<设备名>/。截图按各尺寸中最大的显示区域缩小解码。
+    增量生成只重新渲染部分设备时，decode_bound 应取自全部设备，使解码结果（进而输出）与完整生成一致。
+    """
+    bound = decode_bound or screenshot_bound(style, devices)
+    prepared = prepare_item(input_dir, item, bound, max_decode_pixels)
+    if prepared is None:
+        return []
+    blocks = layout_text(style, prepared)
+    if not devices:
+        return [render_prepared(style, prepared, blocks, output_dir / prepared.out_name, profile=profile)]
+
+    outputs: List[Path] = []
+    for device in devices:
+        device_style = scale_style(style, device)
+        outputs.append(render_prepared(
+            device_style, prepared, blocks, output_dir / device.name / prepared.out_name,
+            device_style.layout_scale / style.layout_scale, profile,
+        ))
+    return outputs
+
+
+@dataclass
+class RenderResult:
+    index: int
+    screenshot: str
+    outputs: List[Path]
+    seconds: float
+    error: Optional[str] = None
+    # 输入未变化、沿用已有文件的输出
+    skipped: List[Path] = field(default_factory=list)
+    # 工作进程中记录的 trace 事件（未开启 --trace 或串行渲染时为 None）
+    trace: Optional[Dict[str, Any]] = None
+
+
+# 输出清单：记录每个输出文件对应的输入哈希，用于增量生成。
+# 渲染逻辑变化会影响输出时递增 RENDER_VERSION，使旧清单全部失效。
+MANIFEST_NAME = ".screenshot_manifest.json"
+MANIFEST_VERSION = 1
+RENDER_VERSION = 3
+
+
+@dataclass
+class OutputTarget:
+    """一个待生成的输出文件；device 为 None 表示未配置 devices 时的单一输出"""
+    device: Optional[Device]
+    path: Path
+    key: Optional[str]
+
+
+def font_identity() -> Optional[Dict[str, Any]]:
+    """渲染所用字体文件的标识（路径、大小、修改时间）"""
+    try:
+        path = _resolve_noto_cjk_ttc_path()
+    except FileNotFoundError:
+        return None
+    stat = path.stat()
+    return {"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def plan_outputs(
+    input_dir: Path,
+    output_dir: Path,
+    style: Style,
+    item: Dict[str, Any],
+    devices: Sequence[Device],
+    font: Optional[Dict[str, Any]],
+    profile: ExportProfile = PROFILES[DEFAULT_PROFILE],
+    max_decode_pixels: Optional[int] = None,
+) -> List[OutputTarget]:
+    """列出条目的全部输出及其输入哈希：截图内容、文案、样式、设备与字体
+
+    截图缺失时哈希为 None，总是交给渲染阶段处理（并报告失败）。
+    """
+    screenshot_name = get_value_case_insensitive(item, "screenshot")
+    screenshot_path = input_dir / screenshot_name if screenshot_name else None
+    out_name = output_file_name(item) if screenshot_name else ""
+    screenshot_digest = file_digest(str(screenshot_path)) if screenshot_path and screenshot_path.exists() else None
+
+    targets: List[OutputTarget] = []
+    for device in (devices or [None]):
+        path = output_path(output_dir / device.name / out_name if device else output_dir / out_name, profile)
+        key = None
+        if screenshot_digest is not None:
+            key = params_digest({
+                "render": RENDER_VERSION,
+                "screenshot": screenshot_digest,
+                "title": get_value_case_insensitive(item, "title", ""),
+                "subtitle": get_value_case_insensitive(item, "subtitle", ""),
+                "style": asdict(style),
+                "device": asdict(device) if device else None,
+                "font": font,
+                "export": profile.name,
+                "maxDecodePixels": max_decode_pixels,
+            })
+        targets.append(OutputTarget(device=device, path=path, key=key))
+    return targets
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """读取输出清单：相对路径 -> {key, config}；不存在或版本不符时视为空"""
+    path = output_dir / MANIFEST_NAME
+    try:
+        data = load_json(path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("outputs", {})
+
+
+def save_manifest(output_dir: Path, outputs: Dict[str, Dict[str, Any]]) -> None:
+    payload = {"version": MANIFEST_VERSION, "outputs": dict(sorted(outputs.items()))}
+    write_atomic(str(output_dir / MANIFEST_NAME), json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def _setup_logging(level: int) -> None:
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
+
+
+def _init_worker(level: int, trace: bool) -> None:
+    _setup_logging(level)
+    tracing.init_worker(trace)
+
+
+def render_task(
+    index: int,
+    input_dir: Path,
+    output_dir: Path,
+    style: Style,
+    item: Dict[str, Any],
+    devices: Sequence[Device] = (),
+    profile: ExportProfile = PROFILES[DEFAULT_PROFILE],
+    max_decode_pixels: Optional[int] = None,
+    decode_bound: Optional[Tuple[int, int]] = None,
+) -> RenderResult:
+    """渲染 configs 中的一项并记录耗时；异常不向外抛出，记录为失败"""
+    screenshot = str(get_value_case_insensitive(item, "screenshot", ""))
+    start = time.perf_counter()
+    try:
+        with tracing.span('render_item', index=index, screenshot=screenshot):
+            outputs = render_single_image(
+                input_dir, output_dir, style, item, devices, profile, max_decode_pixels, decode_bound,
+            )
+        error = None if outputs else "已跳过（缺少 screenshot 字段或截图文件）"
+    except Exception as exc:
+        logging.exception("渲染 configs[%d] 失败", index)
+        outputs = []
+        error = f"{type(exc).__name__}: {exc}"
+    return RenderResult(index=index, screenshot=screenshot, outputs=outputs, seconds=time.perf_counter() - start, error=error,
+                        trace=tracing.take_worker_trace())
+
+
+def render_all(
+    input_dir: Path,
+    output_dir: Path,
+    style: Style,
+    tasks: List[Tuple[int, Dict[str, Any], Sequence[Device]]],
+    jobs: int,
+    log_level: int,
+    profile: ExportProfile = PROFILES[DEFAULT_PROFILE],
+    max_decode_pixels: Optional[int] = None,
+    decode_bound: Optional[Tuple[int, int]] = None,
+) -> List[RenderResult]:
+    """按 jobs 串行或多进程渲染，结果按 configs 顺序返回
+
+    tasks 中每项为 (configs 下标, 条目, 需要生成的设备)；decode_bound 为全部设备的截图显示区域。
+    每个工作进程有独立的字体注册表；输出文件名只取决于配置，与完成先后无关。
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        return [
+            render_task(index, input_dir, output_dir, style, item, devices, profile, max_decode_pixels, decode_bound)
+            for index, item, devices in tasks
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)), initializer=_init_worker, initargs=(log_level, tracing.enabled()),
+    ) as pool:
+        futures = [
+            pool.submit(
+                render_task, index, input_dir, output_dir, style, item, devices, profile, max_decode_pixels, decode_bound,
+            )
+            for index, item, devices in tasks
+        ]
+        results = [future.result() for future in futures]
+    for result in results:
+        tracing.merge(result.trace)
+    return results
+
+
+def log_render_summary(results: List[RenderResult], output_dir: Path, elapsed: float, orphaned: Sequence[str] = ()) -> None:
+    for result in results:
+        if result.error is not None:
+            logging.error("  configs[%d] %s 失败（%.2fs）: %s", result.index, result.screenshot, result.seconds, result.error)
+            continue
+        if result.outputs:
+            names = ", ".join(str(path.relative_to(output_dir)) for path in result.outputs)
+            logging.info("  configs[%d] %s -> %s（%.2fs）", result.index, result.screenshot, names, result.seconds)
+        if result.skipped:
+            names = ", ".join(str(path.relative_to(output_dir)) for path in result.skipped)
+            logging.info("  configs[%d] %s 未变化，跳过: %s", result.index, result.screenshot, names)
+    for name in orphaned:
+        logging.warning("  不再由配置生成的旧输出: %s", name)
+    failed = sum(1 for result in results if result.error is not None)
+    generated = sum(len(result.outputs) for result in results)
+    skipped = sum(len(result.skipped) for result in results)
+    render_seconds = sum(result.seconds for result in results)
+    logging.info(
+        "生成完成：重新生成 %d 张，跳过 %d 张，失败 %d 项，遗留 %d 个；总耗时 %.2fs（各项渲染合计 %.2fs）",
+        generated, skipped, failed, len(orphaned), elapsed, render_seconds,
+    )
+
+
 def main() -> None:
     args = parse_args()
-    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s: %(message)s")
+    tracing.start(args, "generate_appstore_screenshots")
+    log_level = logging.DEBUG if args.verbose else logging.INFO
+    _setup_logging(log_level)
 
     input_dir = Path(args.input_dir).expanduser().resolve()
     if not input_dir.exists() or not input_dir.is_dir():
@@ -573,17 +1026,93 @@ def main() -> None:
         raise SystemExit("configs 必须为非空数组")
 
     style = build_style(style_cfg if isinstance(style_cfg, dict) else {})
-
-    generated: List[Path] = []
-    for idx, item in enumerate(configs, start=1):
+    # 可选的多设备输出：styleConfig 的 width/height 作为参考尺寸
+    devices = parse_devices(get_value_case_insensitive(data, "devices", []))
+
+    profile = PROFILES[args.export_profile]
+    max_decode_pixels = int(args.max_decode_megapixels * 1_000_000) if args.max_decode_megapixels else None
+    start = time.perf_counter()
+    # 增量生成：输入哈希与清单一致且文件仍存在的输出直接跳过（--force 时全部重新生成，
+    # 但仍读取旧清单，用于列出不再由配置生成的旧输出）
+    previous = load_manifest(output_dir)
+    font = font_identity()
+    manifest: Dict[str, Dict[str, Any]] = {}
+    planned: Dict[int, List[OutputTarget]] = {}
+    tasks: List[Tuple[int, Dict[str, Any], Sequence[Device]]] = []
+    skipped_results: List[RenderResult] = []
+    for idx, item in enumerate(configs):
         if not isinstance(item, dict):
-            logging.warning("configs[%d] 非对象，已跳过", idx - 1)
+            logging.warning("configs[%d] 非对象，已跳过", idx)
             continue
-        out = render_single_image(input_dir, output_dir, style, item)
-        if out is not None:
-            generated.append(out)
-
-    logging.info("生成完成，共 %d 张", len(generated))
+        with tracing.span('plan_outputs', index=idx):
+            targets = plan_outputs(input_dir, output_dir, style, item, devices, font, profile, max_decode_pixels)
+        planned[idx] = targets
+        stale: List[OutputTarget] = []
+        current: List[Path] = []
+        for target in targets:
+            name = str(target.path.relative_to(output_dir))
+            entry = previous.get(name)
+            unchanged = target.key is not None and entry and entry.get("key") == target.key and target.path.exists()
+            if unchanged and not args.force:
+                manifest[name] = entry
+                current.append(target.path)
+            else:
+                stale.append(target)
+        if stale:
+            tasks.append((idx, item, [target.device for target in stale if target.device is not None]))
+        if current:
+            screenshot = str(get_value_case_insensitive(item, "screenshot", ""))
+            skipped_results.append(RenderResult(index=idx, screenshot=screenshot, outputs=[], seconds=0.0, skipped=current))
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    # 截图解码尺寸取决于全部设备，而不只是本次需要重新生成的设备
+    decode_bound = screenshot_bound(style, devices)
+    results = render_all(input_dir, output_dir, style, tasks, jobs, log_level, profile, max_decode_pixels, decode_bound)
+    render_elapsed = time.perf_counter() - start
+
+    # 记录成功生成的输出
+    for result in results:
+        keys = {target.path: target.key for target in planned[result.index]}
+        for path in result.outputs:
+            if keys.get(path) is not None:
+                manifest[str(path.relative_to(output_dir))] = {"key": keys[path], "config": result.index}
+    # 同一条目可能部分跳过、部分重新生成，合并后按 configs 顺序汇总
+    merged: Dict[int, RenderResult] = {result.index: result for result in results}
+    for result in skipped_results:
+        if result.index in merged:
+            merged[result.index].skipped = result.skipped
+        else:
+            merged[result.index] = result
+    # 清单中有、但当前配置不再生成的旧输出：文件仍存在时保留在清单中，每次运行都会列出，便于手动清理
+    planned_names = {str(target.path.relative_to(output_dir)) for targets in planned.values() for target in targets}
+    orphaned = sorted(name for name in previous if name not in planned_names and (output_dir / name).exists())
+    for name in orphaned:
+        manifest[name] = previous[name]
+    # 先保存清单：后处理阶段即使中断，已渲染的输出也不必重新渲染
+    save_manifest(output_dir, manifest)
+
+    # release：渲染阶段快速写出，再统一多进程重新压缩；失败的文件保留渲染结果，并从清单中移除以便下次重新生成
+    post_failed: List[str] = []
+    if profile.post_process:
+        post_start = time.perf_counter()
+        with tracing.span('post_process'):
+            stats = post_process([path for result in results for path in result.outputs], jobs)
+        log_post_process(stats, time.perf_counter() - post_start)
+        post_failed = [path for path, _, _, _, error in stats if error is not None]
+        if post_failed:
+            for path in post_failed:
+                manifest.pop(str(Path(path).relative_to(output_dir)), None)
+            save_manifest(output_dir, manifest)
+
+    log_render_summary([merged[idx] for idx in sorted(merged)], output_dir, time.perf_counter() - start, orphaned)
+    generated = [path for result in results for path in result.outputs]
+    total_bytes = sum(path.stat().st_size for path in generated)
+    logging.info(
+        "导出配置 %s：%d 张共 %.1f KB（平均 %.1f KB），渲染阶段 %.2fs",
+        profile.name, len(generated), total_bytes / 1024, total_bytes / 1024 / max(1, len(generated)), render_elapsed,
+    )
+    if post_failed or any(result.error is not None for result in results):
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -3,31 +3,98 @@
 """
 生成儿童发育评估量表数据
 从Excel表格中解析数据并生成符合assessment_data.json结构的数据
+
+多个量表版本（地区版、修订版等）可通过构建清单一次生成：
+  python scripts/generate_assessment_data.py --variants variants.json --jobs 4
+清单格式见 load_variants。
+
+--reader openpyxl 使用 xlsx_reader.py 逐行读取工作簿并逐行解析，整个过程不导入 pandas；
+--check-reader 用两种读取方式分别生成并逐字节比较结果；--check-mode 比较 vectorized 与 reference 两种解析模式。
+
+A.1 项目在 B.1 中找不到相同编号时按名称模糊匹配（见 name_index.py），
+--fuzzy-threshold 设置最低置信度，--no-fuzzy-match 关闭。
 """
 
-import pandas as pd
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
 import json
 import re
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Optional, Set, Tuple, Union
+
+from assessment_builder import AGE_MONTHS, AREA_ORDER, AssessmentDataBuilder
+from assessment_index import INDEX_VERSION, build_assessment_index, check_assessment_index, write_assessment_index
+from build_cache import BUILD_FULL, BUILD_HIT, BUILD_PARTIAL, BUILD_STATUS_LABELS, BuildCache, write_atomic
+from name_index import DEFAULT_MIN_SCORE, NameIndex, strip_leading_id
+from packed_dataset import FORMAT_VERSION as PACKED_FORMAT_VERSION, write_packed
+import tracing
+from xlsx_reader import Sheet, cell_text, read_sheet
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 工作簿读取结果：pandas 读取为 DataFrame，openpyxl 读取为 Sheet
+Table = Union['pd.DataFrame', Sheet]
+
+# 输出数据结构版本：修改 assessment_data.json 字段或含义时递增，使增量构建缓存失效
+SCHEMA_VERSION = 1
 
-def parse_excel_data():
+SCALE_WORKBOOK = 'docs/v-表A.1  0 岁～6 岁儿童发育行为评估量表（儿心量表- Ⅱ).xlsx'
+OPERATION_WORKBOOK = 'docs/v-表 B.1  0 岁～6 岁儿童发育行为评估量表（儿心量表-Ⅱ)操作方法和测查通过要求.xlsx'
+OUTPUT_FILE = 'child_development_assessment/assets/data/assessment_data.json'
+# 紧凑二进制格式（见 packed_dataset.py）：App 尚未读取，按 --packed 生成，写在打包进 App 的 assets/ 之外
+PACKED_OUTPUT_FILE = 'build/data/assessment_data.bin'
+# 与 JSON 同时生成的预计算索引（见 assessment_index.py）：App 尚未读取，写在打包进 App 的 assets/ 之外
+INDEX_OUTPUT_FILE = 'build/data/assessment_index.json'
+DEFAULT_CACHE_DIR = 'scripts/.build_cache'
+
+# 工作簿读取方式：pandas（默认）或 openpyxl（逐行读取，不导入 pandas）
+READERS = ('pandas', 'openpyxl')
+
+def read_workbook(path: str, reader: str = 'pandas') -> Table:
+    """读取工作簿的第一个工作表"""
+    with tracing.span('read_workbook', path=os.path.basename(path), reader=reader):
+        if reader == 'openpyxl':
+            return read_sheet(path)
+        import pandas as pd
+        return pd.read_excel(path)
+
+def read_workbook_openpyxl(path: str) -> Sheet:
+    return read_workbook(path, 'openpyxl')
+
+@tracing.traced()
+def parse_excel_data(scale_path: str = SCALE_WORKBOOK, operation_path: str = OPERATION_WORKBOOK,
+                     reader: str = 'pandas') -> Tuple[Table, Table]:
     """解析Excel表格数据"""
+    if reader not in READERS:
+        raise ValueError(f"未知的读取方式: {reader}")
+
     # 读取量表数据
-    scale_df = pd.read_excel('docs/v-表A.1  0 岁～6 岁儿童发育行为评估量表（儿心量表- Ⅱ).xlsx')
+    scale_df = read_workbook(scale_path, reader)
     
     # 读取操作方法数据
-    operation_df = pd.read_excel('docs/v-表 B.1  0 岁～6 岁儿童发育行为评估量表（儿心量表-Ⅱ)操作方法和测查通过要求.xlsx')
+    operation_df = read_workbook(operation_path, reader)
     
     return scale_df, operation_df
 
+# 表A.1 单元格形如 “□12 俯卧头抬离床面”
+ITEM_PATTERN = r'□(\d+)\s*(.+)'
+
+# 解析模式：vectorized 为列式批量解析；reference 为逐单元格解析，作为等价性对照
+PARSE_MODES = ('vectorized', 'reference')
+
 def extract_item_info(item_text: str) -> Dict[str, Any]:
     """从项目文本中提取信息"""
-    if pd.isna(item_text) or item_text == '':
+    if item_text is None or item_text != item_text or item_text == '':  # item_text != item_text 即 NaN
         return None
     
     # 匹配项目编号和名称
-    pattern = r'□(\d+)\s*(.+)'
-    match = re.search(pattern, str(item_text))
+    match = re.search(ITEM_PATTERN, str(item_text))
     
     if match:
         item_id = int(match.group(1))
@@ -38,75 +105,207 @@ def extract_item_info(item_text: str) -> Dict[str, Any]:
         }
     return None
 
-def get_area_name(row_index: int, scale_df: pd.DataFrame) -> str:
+# 表A.1 的行索引 -> 能区：每个能区占两行
+# 需要从项目名称或编号推断能区时以此为准
+ROW_AREA_MAPPING = {
+    0: 'motor',      # 大运动
+    1: 'motor',      # 大运动  
+    2: 'fineMotor',  # 精细动作
+    3: 'fineMotor',  # 精细动作
+    4: 'adaptive',   # 适应能力
+    5: 'adaptive',   # 适应能力
+    6: 'language',   # 语言
+    7: 'language',   # 语言
+    8: 'social',     # 社会行为
+    9: 'social',     # 社会行为
+}
+
+def get_area_name(row_index: int, scale_df: Table) -> str:
     """根据行索引获取能区名称"""
     # 根据Excel表格的实际结构，每行代表一个测试项目
-    # 需要从项目名称或编号推断能区
-    area_mapping = {
-        0: 'motor',      # 大运动
-        1: 'motor',      # 大运动  
-        2: 'fineMotor',  # 精细动作
-        3: 'fineMotor',  # 精细动作
-        4: 'adaptive',   # 适应能力
-        5: 'adaptive',   # 适应能力
-        6: 'language',   # 语言
-        7: 'language',   # 语言
-        8: 'social',     # 社会行为
-        9: 'social',     # 社会行为
-    }
-    return area_mapping.get(row_index, 'unknown')
-
-def get_score(age_month: int) -> float:
-    """根据月龄获取分数"""
-    if 1 <= age_month <= 12:
-        return 1.0
-    elif 15 <= age_month <= 36:
-        return 3.0
-    elif 42 <= age_month <= 84:
-        return 6.0
-    else:
-        return 0.0
-
-def get_item_score(age_month: int, item_count: int) -> float:
-    """根据月龄和项目数量计算单个项目的分值"""
-    total_score = get_score(age_month)
-    if item_count == 0:
-        return 0.0
-    return total_score / item_count
-
-def get_area_display_name(area: str) -> str:
-    """获取能区的中文显示名称"""
-    area_mapping = {
-        'motor': '大运动',
-        'fineMotor': '精细动作', 
-        'language': '语言',
-        'adaptive': '适应能力',
-        'social': '社会行为'
+    return ROW_AREA_MAPPING.get(row_index, 'unknown')
+
+# B.1 中未找到对应项目时使用的占位文本（validate_data.py 依赖这两个字符串给出警告）
+PLACEHOLDER_OPERATION = '请参考标准操作方法'
+PLACEHOLDER_PASS_CONDITION = '请参考标准通过要求'
+
+# B.1 “测查项目”列形如 “12．俯卧头抬离床面”，取开头的完整编号
+OPERATION_ID_PATTERN = re.compile(r'^\s*(\d+)')
+
+@dataclass
+class OperationIndex:
+    """B.1 操作方法表的索引：项目编号 -> 操作方法与通过要求
+
+    按编号找不到时，如给出项目名称且 fuzzy_threshold 不为 None，再按名称在 B.1 全部行中模糊匹配
+    （名称索引在第一次需要时才建立）；最高置信度有多行并列、或最相近的行已被 A.1 中的其他项目按编号使用时
+    不采用（记为冲突），仍使用占位文本。解析表A.1 前先用 claim() 登记其全部编号。
+    """
+    entries: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    # 同一编号出现在多行时记录所有行号（取第一行作为结果）
+    ambiguous: Dict[int, List[int]] = field(default_factory=dict)
+    # 无法解析出编号的行号及原始文本
+    unparsed_rows: List[Dict[str, Any]] = field(default_factory=list)
+    # 在 A.1 中出现但 B.1 中没有、也未能按名称匹配的项目编号（查询时记录）
+    unmatched: List[int] = field(default_factory=list)
+    # B.1 的全部行（含重复编号与无法解析编号的行）：row, id（无法解析时为 None）, name, operation, passCondition
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # 按名称匹配的最低置信度，None 表示只按编号匹配
+    fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE
+    # 按名称匹配的结果（A.1 编号 -> 诊断信息），含因并列或冲突而未采用的
+    fuzzy: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    # 已被 A.1 项目按编号精确使用的 B.1 行号（见 claim）
+    claimed_rows: Set[int] = field(default_factory=set)
+    _name_index: Optional[NameIndex] = field(default=None, repr=False)
+
+    def lookup(self, item_id: int, name: Optional[str] = None) -> Dict[str, str]:
+        """按编号精确查找，找不到时按名称模糊匹配；都找不到时返回占位文本并记录"""
+        info = self.entries.get(item_id)
+        if info is not None:
+            return info
+        match = self.fuzzy.get(item_id)
+        if match is None and name and self.fuzzy_threshold is not None and item_id not in self.unmatched:
+            match = self.match_name(item_id, name)
+        if match is not None and fuzzy_match_applied(match):
+            return self.rows[match['row']]
+        if item_id not in self.unmatched:
+            self.unmatched.append(item_id)
+        return {
+            'operation': PLACEHOLDER_OPERATION,
+            'passCondition': PLACEHOLDER_PASS_CONDITION
+        }
+
+    def claim(self, item_ids: Iterable[int]) -> None:
+        """登记 A.1 中出现的编号：按编号精确匹配到的 B.1 行不再作为其他项目按名称匹配的结果"""
+        for item_id in item_ids:
+            entry = self.entries.get(item_id)
+            if entry is not None:
+                self.claimed_rows.add(entry['row'])
+
+    def match_name(self, item_id: int, name: str) -> Optional[Dict[str, Any]]:
+        """按名称在 B.1 中查找最相近的行并记录；没有置信度达到阈值的行时返回 None"""
+        if self._name_index is None:
+            with tracing.span('build_name_index', rows=len(self.rows)):
+                self._name_index = NameIndex()
+                for row in self.rows:
+                    self._name_index.add(row['row'], row['name'])
+        resolution = self._name_index.resolve(name, self.fuzzy_threshold)
+        tracing.count('operation.fuzzy_lookups')
+        if resolution.best is None:
+            return None
+        best = self.rows[resolution.best.key]
+        match = {
+            'id': item_id,
+            'name': name,
+            'row': best['row'],
+            'matchedId': best['id'],
+            'matchedName': best['name'],
+            'confidence': round(resolution.best.score, 4),
+            'tie': resolution.is_tie,
+            # 最相近的行已被 A.1 中编号相同的项目使用：采用会把同一段操作方法复制给两个项目
+            'conflict': best['row'] in self.claimed_rows,
+        }
+        if resolution.is_tie:
+            match['tiedRows'] = [best['row']] + [tied.key for tied in resolution.tied]
+        self.fuzzy[item_id] = match
+        return match
+
+    def diagnostics(self, used_ids: Optional[Set[int]] = None) -> Dict[str, Any]:
+        """以结构化形式返回匹配诊断信息"""
+        result = {
+            'unmatched': sorted(self.unmatched),
+            'ambiguous': {item_id: rows for item_id, rows in sorted(self.ambiguous.items())},
+            'unparsed': list(self.unparsed_rows),
+            'fuzzy': [match for _, match in sorted(self.fuzzy.items())],
+        }
+        if used_ids is not None:
+            # 按名称匹配采用的 B.1 行也算作被引用
+            fuzzy_ids = {match['matchedId'] for match in self.fuzzy.values() if fuzzy_match_applied(match)}
+            result['unused'] = sorted(set(self.entries) - set(used_ids) - fuzzy_ids)
+        return result
+
+def fuzzy_match_applied(match: Dict[str, Any]) -> bool:
+    """按名称匹配的结果是否被采用：并列与冲突时不采用"""
+    return not match['tie'] and not match['conflict']
+
+def text_column(table: Table, name: str) -> List[str]:
+    """按列取单元格文本（缺失值为空字符串），两种读取方式结果一致"""
+    values = table.column(name) if isinstance(table, Sheet) else table[name].tolist()
+    return [cell_text(value) for value in values]
+
+@tracing.traced()
+def build_operation_index(operation_df: Table, fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> OperationIndex:
+    """一次性解析 B.1 操作方法表，建立按编号精确匹配的索引（并保留全部行供按名称匹配）"""
+    index = OperationIndex(fuzzy_threshold=fuzzy_threshold)
+    projects = text_column(operation_df, '测查项目')
+    operations = text_column(operation_df, '操作方法')
+    pass_conditions = text_column(operation_df, '测查通过要求')
+
+    for row_idx, (project_name, operation, pass_condition) in enumerate(zip(projects, operations, pass_conditions)):
+        match = OPERATION_ID_PATTERN.match(project_name)
+        index.rows.append({
+            'row': row_idx,
+            'id': int(match.group(1)) if match else None,
+            'name': strip_leading_id(project_name).strip(),
+            'operation': operation,
+            'passCondition': pass_condition,
+        })
+        if not match:
+            index.unparsed_rows.append({'row': row_idx, 'text': project_name})
+            continue
+
+        item_id = int(match.group(1))
+        if item_id in index.entries:
+            index.ambiguous.setdefault(item_id, [index.entries[item_id]['row']]).append(row_idx)
+            continue
+
+        index.entries[item_id] = {
+            'operation': operation,
+            'passCondition': pass_condition,
+            'row': row_idx
+        }
+
+    return index
+
+@tracing.traced()
+def find_operation_info(item_id: int, operation_index: OperationIndex, name: Optional[str] = None) -> Dict[str, str]:
+    """在操作方法索引中查找对应的操作方法和通过要求（编号找不到时按名称匹配）"""
+    info = operation_index.lookup(item_id, name)
+    return {
+        'operation': info['operation'],
+        'passCondition': info['passCondition']
     }
-    return area_mapping.get(area, area)
-
-def find_operation_info(item_id: int, operation_df: pd.DataFrame) -> Dict[str, str]:
-    """在操作方法表中查找对应的操作方法和通过要求"""
-    for _, row in operation_df.iterrows():
-        project_name = str(row['测查项目'])
-        if project_name.startswith(str(item_id)):
-            return {
-                'operation': str(row['操作方法']),
-                'passCondition': str(row['测查通过要求'])
-            }
+
+def make_test_item(item_id: int, name: str, area: str, operation_info: Dict[str, str]) -> Dict[str, Any]:
+    """构造单个测试项目"""
     return {
-        'operation': '请参考标准操作方法',
-        'passCondition': '请参考标准通过要求'
+        'id': item_id,
+        'name': name,
+        'desc': name,  # 描述暂时使用名称
+        'operation': operation_info['operation'],
+        'passCondition': operation_info['passCondition'],
+        'score': 0.0,  # 临时分值，由 builder 统一计算
+        'area': area  # 添加能区字段
     }
 
-def generate_assessment_data():
-    """生成评估数据"""
-    scale_df, operation_df = parse_excel_data()
-    
-    # 月龄列表
-    age_months = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 15, 18, 21, 24, 27, 30, 33, 36, 42, 48, 54, 60, 66, 72, 78, 84]
-    
-    assessment_data = []
+def scale_item_ids(scale_table: Table, age_months: List[int]) -> Set[int]:
+    """表A.1 各月龄列中出现的全部项目编号"""
+    item_ids: Set[int] = set()
+    columns = set(scale_table.columns)
+    for age_month in age_months:
+        column = f'{age_month} 月龄'
+        if column in columns:
+            for text in text_column(scale_table, column):
+                item_info = extract_item_info(text)
+                if item_info:
+                    item_ids.add(item_info['id'])
+    return item_ids
+
+@tracing.traced()
+def parse_items_reference(scale_df: pd.DataFrame, operation_index: OperationIndex,
+                          builder: AssessmentDataBuilder, used_ids: Set[int]) -> None:
+    """逐单元格解析表A.1（参考实现，用于与列式解析做等价性对照）"""
+    age_months = builder.age_months
+    operation_index.claim(scale_item_ids(scale_df, age_months))
     
     # 遍历每一行（每个测试项目）
     for row_idx in range(len(scale_df)):
@@ -126,78 +325,574 @@ def generate_assessment_data():
             
             if item_info:
                 # 查找操作方法信息
-                operation_info = find_operation_info(item_info['id'], operation_df)
-                
-                test_item = {
-                    'id': item_info['id'],
-                    'name': item_info['name'],
-                    'desc': item_info['name'],  # 描述暂时使用名称
-                    'operation': operation_info['operation'],
-                    'passCondition': operation_info['passCondition'],
-                    'score': 0.0,  # 临时分值，稍后计算
-                    'area': area  # 添加能区字段
-                }
+                operation_info = find_operation_info(item_info['id'], operation_index, item_info['name'])
+                used_ids.add(item_info['id'])
                 
-                # 检查是否已存在该月龄和能区的数据
-                existing_item = None
-                for item in assessment_data:
-                    if item['ageMonth'] == age_month and item['area'] == area:
-                        existing_item = item
-                        break
-                
-                if existing_item:
-                    # 添加到现有项目
-                    existing_item['testItems'].append(test_item)
-                else:
-                    # 创建新项目
-                    assessment_data.append({
-                        'ageMonth': age_month,
-                        'area': area,
-                        'score': get_score(age_month),
-                        'testItems': [test_item]
-                    })
+                test_item = make_test_item(item_info['id'], item_info['name'], area, operation_info)
+                builder.add_item(age_month, area, test_item)
+
+@tracing.traced()
+def parse_items_records(scale_sheet: Sheet, operation_index: OperationIndex,
+                        builder: AssessmentDataBuilder, used_ids: Set[int]) -> None:
+    """逐行解析 xlsx_reader 读取的表A.1（不依赖 pandas），项目顺序与列式解析相同（先行后列）"""
+    columns = scale_sheet.column_index()
+    age_columns = [(age, columns[f'{age} 月龄']) for age in builder.age_months if f'{age} 月龄' in columns]
+    operation_index.claim(scale_item_ids(scale_sheet, builder.age_months))
+
+    for row_idx, row in enumerate(scale_sheet.rows):
+        area = get_area_name(row_idx, scale_sheet)
+        for age_month, col_idx in age_columns:
+            item_info = extract_item_info(row[col_idx])
+            if item_info:
+                operation_info = find_operation_info(item_info['id'], operation_index, item_info['name'])
+                used_ids.add(item_info['id'])
+                builder.add_item(age_month, area, make_test_item(item_info['id'], item_info['name'], area, operation_info))
+
+def extract_scale_items(scale_df: pd.DataFrame, age_months: List[int]) -> pd.DataFrame:
+    """列式解析表A.1：将 “N 月龄” 列展开为长表，并批量提取项目编号与名称
+
+    返回列：row, ageMonth, area, id, name，按 (行, 月龄) 顺序排列
+    """
+    age_columns = {f'{age} 月龄': age for age in age_months if f'{age} 月龄' in scale_df.columns}
+    age_order = {age: idx for idx, age in enumerate(age_months)}
+
+    wide_df = scale_df[list(age_columns)].copy()
+    wide_df['row'] = range(len(scale_df))
+    long_df = wide_df.melt(id_vars='row', var_name='column', value_name='text').dropna(subset=['text'])
+
+    extracted = long_df['text'].astype(str).str.extract(ITEM_PATTERN)
+    long_df = long_df.assign(id=extracted[0], name=extracted[1].str.strip()).dropna(subset=['id'])
+    long_df['id'] = long_df['id'].astype(int)
+    long_df['ageMonth'] = long_df['column'].map(age_columns)
+    long_df['area'] = long_df['row'].map(ROW_AREA_MAPPING).fillna('unknown')
+
+    # 与逐单元格解析保持相同的项目顺序（先行后列）
+    long_df['ageOrder'] = long_df['ageMonth'].map(age_order)
+    long_df = long_df.sort_values(['row', 'ageOrder'], kind='stable')
+    return long_df[['row', 'ageMonth', 'area', 'id', 'name']].reset_index(drop=True)
+
+def operation_frame(operation_index: OperationIndex) -> pd.DataFrame:
+    """将操作方法索引转为以 id 为列的 DataFrame，便于 merge"""
+    import pandas as pd
+    return pd.DataFrame(
+        [(item_id, info['operation'], info['passCondition']) for item_id, info in operation_index.entries.items()],
+        columns=['id', 'operation', 'passCondition'],
+    )
+
+@tracing.traced()
+def parse_items_vectorized(scale_df: pd.DataFrame, operation_index: OperationIndex,
+                           builder: AssessmentDataBuilder, used_ids: Set[int]) -> None:
+    """列式解析表A.1，并通过 merge 关联表B.1 的操作方法"""
+    items_df = extract_scale_items(scale_df, builder.age_months)
+    operation_index.claim(int(item_id) for item_id in items_df['id'].unique())
+    merged = items_df.merge(operation_frame(operation_index), on='id', how='left', indicator=True, sort=False)
+
+    # 编号未匹配的项目逐个查找（按名称匹配或占位文本），同一编号以第一次出现的名称为准，与逐单元格解析一致
+    missing = merged['_merge'] == 'left_only'
+    if missing.any():
+        fallback = {
+            item_id: operation_index.lookup(int(item_id), name)
+            for item_id, name in merged.loc[missing, ['id', 'name']].drop_duplicates('id').itertuples(index=False)
+        }
+        for column in ('operation', 'passCondition'):
+            merged.loc[missing, column] = merged.loc[missing, 'id'].map(lambda item_id: fallback[item_id][column])
+    used_ids.update(int(item_id) for item_id in merged['id'].unique())
+
+    for record in merged.itertuples(index=False):
+        operation_info = {'operation': record.operation, 'passCondition': record.passCondition}
+        test_item = make_test_item(int(record.id), record.name, record.area, operation_info)
+        builder.add_item(int(record.ageMonth), record.area, test_item)
+
+def generate_assessment_data(diagnostics: Optional[Dict[str, Any]] = None, mode: str = 'vectorized',
+                             frames: Optional[Tuple[Table, Table]] = None,
+                             fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE):
+    """生成评估数据
+
+    mode 为 vectorized（默认）或 reference；
+    frames 为已读取的 (表A.1, 表B.1)，未提供时从默认工作簿读取；
+    frames 由 openpyxl 读取（Sheet）时逐行解析，不依赖 pandas，mode 不影响结果；
+    fuzzy_threshold 为编号未匹配时按名称匹配的最低置信度，None 表示只按编号匹配；
+    如传入 diagnostics 字典，会把操作方法匹配的诊断信息写入其中
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"未知的解析模式: {mode}")
+
+    scale_df, operation_df = frames if frames is not None else parse_excel_data()
+    operation_index = build_operation_index(operation_df, fuzzy_threshold)
+    used_ids: Set[int] = set()
     
-    # 计算每个项目的分值
-    for item in assessment_data:
-        item_count = len(item['testItems'])
-        if item_count > 0:
-            item_score = get_item_score(item['ageMonth'], item_count)
-            for test_item in item['testItems']:
-                test_item['score'] = item_score
+    builder = AssessmentDataBuilder(AGE_MONTHS)
+    if isinstance(scale_df, Sheet):
+        parse_items_records(scale_df, operation_index, builder, used_ids)
+    elif mode == 'reference':
+        parse_items_reference(scale_df, operation_index, builder, used_ids)
+    else:
+        parse_items_vectorized(scale_df, operation_index, builder, used_ids)
+    
+    # 按固定顺序输出分组，并计算每个项目的分值
+    with tracing.span('group'):
+        assessment_data = builder.build()
+
+    if diagnostics is not None:
+        diagnostics.update(operation_index.diagnostics(used_ids))
     
     return assessment_data
 
+def print_operation_diagnostics(diagnostics: Dict[str, Any]):
+    """打印操作方法匹配诊断信息"""
+    print("\n操作方法匹配诊断:")
+    if not any(diagnostics.get(key) for key in ('unmatched', 'ambiguous', 'unparsed', 'unused', 'fuzzy')):
+        print("  全部项目均按编号精确匹配")
+        return
+    for match in diagnostics.get('fuzzy', []):
+        matched_id = '无编号' if match['matchedId'] is None else f"编号 {match['matchedId']}"
+        target = f"B.1 第 {match['row']} 行「{match['matchedName']}」（{matched_id}）"
+        if match['tie']:
+            print(f"  编号 {match['id']}「{match['name']}」按名称匹配到多行且置信度相同（行 {match['tiedRows']}，"
+                  f"置信度 {match['confidence']:.2f}），未采用")
+        elif match['conflict']:
+            print(f"  编号 {match['id']}「{match['name']}」按名称匹配到 {target}，置信度 {match['confidence']:.2f}，"
+                  f"但该行已按编号用于A.1的编号 {match['matchedId']}，视为冲突，未采用")
+        else:
+            print(f"  编号 {match['id']}「{match['name']}」在B.1中无此编号，按名称匹配到 {target}，置信度 {match['confidence']:.2f}")
+    if diagnostics.get('unmatched'):
+        print(f"  未匹配（使用占位文本）: {diagnostics['unmatched']}")
+    for item_id, rows in diagnostics.get('ambiguous', {}).items():
+        print(f"  编号 {item_id} 在B.1中重复出现（行 {rows}），已使用第一行")
+    for entry in diagnostics.get('unparsed', []):
+        print(f"  B.1 第 {entry['row']} 行无法解析编号: {entry['text']}")
+    if diagnostics.get('unused'):
+        print(f"  B.1 中未被A.1引用的编号: {diagnostics['unused']}")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="从Excel表格生成 assessment_data.json")
+    parser.add_argument("--mode", choices=PARSE_MODES, default="vectorized",
+                        help="表A.1 解析模式：vectorized 列式批量解析（默认），reference 逐单元格参考实现")
+    parser.add_argument("--incremental", action="store_true",
+                        help="增量构建：输入工作簿、解析参数与数据结构版本均未变化时跳过生成")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"增量构建缓存目录，默认 {DEFAULT_CACHE_DIR}")
+    parser.add_argument("--packed", action="store_true", help=f"同时生成紧凑二进制文件 {PACKED_OUTPUT_FILE}")
+    parser.add_argument("--packed-compress", action="store_true", help="二进制文件的字符串表使用 zlib 压缩（同时开启 --packed）")
+    parser.add_argument("--reader", choices=READERS, default="pandas",
+                        help="工作簿读取方式：pandas（默认）；openpyxl 逐行读取并逐行解析，不导入 pandas")
+    parser.add_argument("--check-reader", action="store_true",
+                        help="用两种读取方式分别生成默认工作簿的数据，检查结果是否逐字节一致（不写出文件）")
+    parser.add_argument("--fuzzy-threshold", type=float, default=DEFAULT_MIN_SCORE, metavar="SCORE",
+                        help=f"A.1 项目编号在B.1中找不到时按名称匹配的最低置信度（0～1），默认 {DEFAULT_MIN_SCORE}")
+    parser.add_argument("--no-fuzzy-match", action="store_true", help="只按编号匹配，找不到时直接使用占位文本")
+    parser.add_argument("--check-mode", action="store_true",
+                        help="用 vectorized 与 reference 两种解析模式分别生成默认工作簿的数据，检查结果是否逐字节一致（不写出文件）")
+    parser.add_argument("--variants", help="构建清单（JSON），按清单一次生成多个量表版本，见 load_variants")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="--variants 时并行构建的进程数，0 表示按 CPU 核数（默认）")
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    if not 0 < args.fuzzy_threshold <= 1:
+        parser.error("--fuzzy-threshold 应在 (0, 1] 范围内")
+    return args
+
+def fuzzy_threshold_arg(args: argparse.Namespace) -> Optional[float]:
+    """命令行参数对应的按名称匹配阈值，--no-fuzzy-match 时为 None"""
+    return None if args.no_fuzzy_match else args.fuzzy_threshold
+
+def build_parameters(mode: str, fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> Dict[str, Any]:
+    """影响生成结果的解析参数（参与增量构建的缓存键）"""
+    return {
+        'schemaVersion': SCHEMA_VERSION,
+        'mode': mode,
+        'ageMonths': AGE_MONTHS,
+        'rowAreaMapping': ROW_AREA_MAPPING,
+        'itemPattern': ITEM_PATTERN,
+        'operationIdPattern': OPERATION_ID_PATTERN.pattern,
+        'fuzzyThreshold': fuzzy_threshold,
+    }
+
+def output_parameters(mode: str, index: bool, packed_compress: Optional[bool],
+                      fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> Dict[str, Any]:
+    """构建键参数：解析参数加上各输出文件的格式版本；packed_compress 为 None 表示不生成二进制文件"""
+    params = build_parameters(mode, fuzzy_threshold)
+    params['indexVersion'] = INDEX_VERSION if index else None
+    params['packed'] = None if packed_compress is None else {'version': PACKED_FORMAT_VERSION, 'compress': packed_compress}
+    return params
+
+def reader_parameters(reader: str = 'pandas') -> Dict[str, Any]:
+    """影响中间数据的读取参数（参与中间数据的缓存键）"""
+    if reader == 'openpyxl':
+        import openpyxl
+        return {'reader': 'xlsx_reader.read_sheet', 'openpyxl': openpyxl.__version__}
+    import pandas as pd
+    return {
+        'reader': 'pandas.read_excel',
+        'pandas': pd.__version__,
+    }
+
+def load_frames_incremental(cache: BuildCache, reader: str = 'pandas') -> Tuple[Tuple[Table, Table], str]:
+    """通过缓存读取两个工作簿，返回 (frames, 构建状态)"""
+    params = reader_parameters(reader)
+    parser = read_workbook_openpyxl if reader == 'openpyxl' else read_workbook
+    scale_df, scale_hit = cache.load_or_parse(SCALE_WORKBOOK, parser, params)
+    operation_df, operation_hit = cache.load_or_parse(OPERATION_WORKBOOK, parser, params)
+    status = BUILD_PARTIAL if scale_hit or operation_hit else BUILD_FULL
+    return (scale_df, operation_df), status
+
+def collect_statistics(assessment_data: List[Dict[str, Any]]) -> Tuple[int, Dict[str, int], Dict[int, int]]:
+    """统计测试项目总数，以及各能区、各月龄的项目数"""
+    area_stats: Dict[str, int] = {}
+    age_stats: Dict[int, int] = {}
+    total_items = 0
+    for item in assessment_data:
+        count = len(item['testItems'])
+        area_stats[item['area']] = area_stats.get(item['area'], 0) + count
+        age_stats[item['ageMonth']] = age_stats.get(item['ageMonth'], 0) + count
+        total_items += count
+    return total_items, area_stats, age_stats
+
+def write_outputs(assessment_data: List[Dict[str, Any]], output_file: str, index_file: Optional[str] = None,
+                  packed_file: Optional[str] = None, packed_compress: bool = False) -> Optional[int]:
+    """写出 JSON 及可选的预计算索引与二进制文件，返回二进制文件字节数
+
+    索引在写出前先与分组数据核对；每个文件都先写临时文件再替换，中断时不会留下半截文件。
+    """
+    if index_file:
+        with tracing.span('build_index'):
+            index = build_assessment_index(assessment_data, AGE_MONTHS)
+            index_problems = check_assessment_index(assessment_data, index)
+        if index_problems:
+            raise ValueError("预计算索引与评估数据不一致: " + "; ".join(index_problems))
+
+    with tracing.span('json.dump', path=output_file):
+        payload = json.dumps(assessment_data, ensure_ascii=False, indent=2)
+        write_atomic(output_file, payload.encode('utf-8'))
+    if index_file:
+        os.makedirs(os.path.dirname(index_file) or '.', exist_ok=True)
+        with tracing.span('write_index', path=index_file):
+            write_assessment_index(index, index_file)
+    if packed_file:
+        os.makedirs(os.path.dirname(packed_file) or '.', exist_ok=True)
+        with tracing.span('write_packed', path=packed_file):
+            return write_packed(assessment_data, packed_file, compress=packed_compress)
+    return None
+
+@dataclass
+class Variant:
+    """构建清单中的一个量表版本"""
+    name: str
+    scale_workbook: str
+    operation_workbook: str
+    output_file: str
+    index_file: Optional[str] = None
+    packed_file: Optional[str] = None
+
+    @property
+    def inputs(self) -> List[str]:
+        return [self.scale_workbook, self.operation_workbook]
+
+    @property
+    def output_files(self) -> List[str]:
+        return [path for path in (self.output_file, self.index_file, self.packed_file) if path]
+
+def load_variants(manifest_path: str) -> List[Variant]:
+    """读取构建清单，相对路径以清单所在目录为基准
+
+    清单格式（也可以直接是数组；name 缺省为 output，index 与 packed 可省略）：
+    {
+      "variants": [
+        {"name": "national", "scale": "A.1.xlsx", "operation": "B.1.xlsx",
+         "output": "national/assessment_data.json", "index": "national/assessment_index.json",
+         "packed": "national/assessment_data.bin"}
+      ]
+    }
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data.get('variants') if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("构建清单中没有 variants")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def resolve(path: Optional[str]) -> Optional[str]:
+        return os.path.normpath(os.path.join(base_dir, path)) if path else None
+
+    variants: List[Variant] = []
+    names: Set[str] = set()
+    outputs: Set[str] = set()
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"variants[{idx}] 应为对象")
+        missing = [key for key in ('scale', 'operation', 'output') if not entry.get(key)]
+        if missing:
+            raise ValueError(f"variants[{idx}] 缺少字段: {', '.join(missing)}")
+        variant = Variant(
+            name=str(entry.get('name') or entry['output']),
+            scale_workbook=resolve(entry['scale']),
+            operation_workbook=resolve(entry['operation']),
+            output_file=resolve(entry['output']),
+            index_file=resolve(entry.get('index')),
+            packed_file=resolve(entry.get('packed')),
+        )
+        if variant.name in names:
+            raise ValueError(f"variants[{idx}] 名称重复: {variant.name}")
+        names.add(variant.name)
+        for path in variant.output_files:
+            if path in outputs:
+                raise ValueError(f"variants[{idx}] 的输出文件与其他版本重复: {path}")
+            outputs.add(path)
+        variants.append(variant)
+    return variants
+
+@dataclass
+class VariantResult:
+    name: str
+    status: str
+    seconds: float
+    groups: int = 0
+    total_items: int = 0
+    area_stats: Dict[str, int] = field(default_factory=dict)
+    unmatched: int = 0
+    # 编号未匹配、按名称匹配采用的项目数
+    fuzzy: int = 0
+    error: Optional[str] = None
+    # 工作进程中记录的 trace 事件（未开启 --trace 或在主进程中构建时为 None）
+    trace: Optional[Dict[str, Any]] = None
+
+def build_variant(variant: Variant, mode: str, packed_compress: bool, reader: str = 'pandas',
+                  fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> VariantResult:
+    """解析并写出一个量表版本（在工作进程中运行）；异常不向外抛出，记录为失败"""
+    start = time.perf_counter()
+    try:
+        with tracing.span('variant', variant=variant.name):
+            frames = parse_excel_data(variant.scale_workbook, variant.operation_workbook, reader)
+            diagnostics: Dict[str, Any] = {}
+            assessment_data = generate_assessment_data(diagnostics, mode=mode, frames=frames,
+                                                       fuzzy_threshold=fuzzy_threshold)
+            for path in variant.output_files:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_outputs(assessment_data, variant.output_file, variant.index_file, variant.packed_file, packed_compress)
+    except Exception as e:
+        return VariantResult(variant.name, BUILD_FULL, time.perf_counter() - start, error=f"{type(e).__name__}: {e}",
+                             trace=tracing.take_worker_trace())
+
+    total_items, area_stats, _ = collect_statistics(assessment_data)
+    return VariantResult(
+        variant.name, BUILD_FULL, time.perf_counter() - start, groups=len(assessment_data),
+        total_items=total_items, area_stats=area_stats, unmatched=len(diagnostics['unmatched']),
+        fuzzy=sum(1 for match in diagnostics['fuzzy'] if fuzzy_match_applied(match)),
+        trace=tracing.take_worker_trace(),
+    )
+
+def cached_variant_result(variant: Variant) -> VariantResult:
+    """输入与输出均未变化的版本：统计信息从现有的 JSON 读取"""
+    with open(variant.output_file, 'r', encoding='utf-8') as f:
+        assessment_data = json.load(f)
+    total_items, area_stats, _ = collect_statistics(assessment_data)
+    return VariantResult(variant.name, BUILD_HIT, 0.0, groups=len(assessment_data),
+                         total_items=total_items, area_stats=area_stats)
+
+def build_variants(variants: List[Variant], mode: str, packed_compress: bool, jobs: int,
+                   cache: Optional[BuildCache] = None, reader: str = 'pandas',
+                   fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> List[VariantResult]:
+    """按 jobs 串行或多进程构建多个量表版本，结果按清单顺序返回
+
+    openpyxl 解析为 CPU 密集型，每个工作进程一次处理一个版本，总耗时随 CPU 核数而非版本数增长。
+    给出 cache 时，工作簿、解析参数与输出文件都未变化的版本直接跳过；构建缓存只由主进程读写。
+    """
+    results: Dict[int, VariantResult] = {}
+    build_keys: Dict[int, str] = {}
+    pending: List[int] = []
+    for idx, variant in enumerate(variants):
+        # 缺少工作簿的版本交给构建阶段报告失败
+        if cache is not None and all(os.path.exists(path) for path in variant.inputs):
+            params = output_parameters(mode, variant.index_file is not None,
+                                       packed_compress if variant.packed_file else None, fuzzy_threshold)
+            build_keys[idx] = cache.build_key(variant.inputs, params)
+            if all(cache.output_is_current(path, build_keys[idx]) for path in variant.output_files):
+                results[idx] = cached_variant_result(variant)
+                continue
+        pending.append(idx)
+
+    if jobs <= 1 or len(pending) <= 1:
+        for idx in pending:
+            results[idx] = build_variant(variants[idx], mode, packed_compress, reader, fuzzy_threshold)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending)),
+                                 initializer=tracing.init_worker, initargs=(tracing.enabled(),)) as pool:
+            futures = {idx: pool.submit(build_variant, variants[idx], mode, packed_compress, reader, fuzzy_threshold)
+                       for idx in pending}
+            for idx, future in futures.items():
+                results[idx] = future.result()
+                tracing.merge(results[idx].trace)
+
+    if cache is not None:
+        for idx in pending:
+            if results[idx].error is None and idx in build_keys:
+                for path in variants[idx].output_files:
+                    cache.record_output(path, build_keys[idx], BUILD_FULL)
+    return [results[idx] for idx in range(len(variants))]
+
+def print_variant_report(variants: List[Variant], results: List[VariantResult], jobs: int, elapsed: float) -> None:
+    """多版本构建的汇总报告：每个版本一行，最后为合计"""
+    build_seconds = sum(result.seconds for result in results)
+    print(f"\n多版本构建报告：{len(variants)} 个版本，{jobs} 个进程，"
+          f"总耗时 {elapsed:.2f}s（各版本构建合计 {build_seconds:.2f}s）")
+    columns = ['分组', '项目'] + AREA_ORDER + ['名称匹配', '未匹配', '耗时']
+    print(f"  {'版本':<20}{'状态':<12}" + "".join(f"{column:>11}" for column in columns))
+
+    totals = {'groups': 0, 'items': 0, 'fuzzy': 0, 'unmatched': 0, 'areas': {area: 0 for area in AREA_ORDER}}
+    for result in results:
+        if result.error is not None:
+            print(f"  {result.name:<20}{'失败':<12}{result.error}")
+            continue
+        values = [result.groups, result.total_items] + [result.area_stats.get(area, 0) for area in AREA_ORDER]
+        values += [result.fuzzy, result.unmatched, f"{result.seconds:.2f}s"]
+        print(f"  {result.name:<20}{BUILD_STATUS_LABELS[result.status]:<12}" + "".join(f"{value:>11}" for value in values))
+        totals['groups'] += result.groups
+        totals['items'] += result.total_items
+        totals['fuzzy'] += result.fuzzy
+        totals['unmatched'] += result.unmatched
+        for area in AREA_ORDER:
+            totals['areas'][area] += result.area_stats.get(area, 0)
+
+    values = [totals['groups'], totals['items']] + [totals['areas'][area] for area in AREA_ORDER]
+    values += [totals['fuzzy'], totals['unmatched'], f"{build_seconds:.2f}s"]
+    print(f"  {'合计':<32}" + "".join(f"{value:>11}" for value in values))
+    for variant, result in zip(variants, results):
+        if result.error is None:
+            print(f"  {variant.name}: {', '.join(variant.output_files)}")
+
+def run_variants(args: argparse.Namespace) -> None:
+    """--variants：按构建清单生成多个量表版本，任一版本失败时以非零状态码退出"""
+    try:
+        variants = load_variants(args.variants)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"无法读取构建清单 {args.variants}: {e}")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    print(f"开始按构建清单生成 {len(variants)} 个版本的评估数据...")
+
+    cache = BuildCache(args.cache_dir) if args.incremental else None
+    start = time.perf_counter()
+    results = build_variants(variants, args.mode, args.packed_compress, jobs, cache, args.reader,
+                             fuzzy_threshold_arg(args))
+    print_variant_report(variants, results, jobs, time.perf_counter() - start)
+    if any(result.error is not None for result in results):
+        sys.exit(1)
+
+def compare_outputs(labels: Tuple[str, str], outputs: Dict[str, Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """比较两次生成的 (JSON 文本, 诊断信息)，返回差异描述（JSON 只报告第一处不同的行）"""
+    expected_label, actual_label = labels
+    (expected, expected_diagnostics), (actual, actual_diagnostics) = outputs[expected_label], outputs[actual_label]
+    problems: List[str] = []
+    if actual != expected:
+        expected_lines, actual_lines = expected.splitlines(), actual.splitlines()
+        for line_no, (left, right) in enumerate(zip(expected_lines, actual_lines), 1):
+            if left != right:
+                problems.append(f"JSON 第 {line_no} 行不同: {expected_label} {left.strip()!r}，{actual_label} {right.strip()!r}")
+                break
+        else:
+            problems.append(f"JSON 行数不同: {expected_label} {len(expected_lines)} 行，{actual_label} {len(actual_lines)} 行")
+    if actual_diagnostics != expected_diagnostics:
+        problems.append(f"诊断信息不同: {expected_label} {expected_diagnostics}，{actual_label} {actual_diagnostics}")
+    return problems
+
+def check_modes(frames: Optional[Tuple[Table, Table]] = None,
+                fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> List[str]:
+    """用 vectorized 与 reference 两种解析模式分别生成数据，返回差异描述（为空表示 JSON 与诊断信息完全一致）
+
+    frames 为 pandas 读取的 (表A.1, 表B.1)，未提供时从默认工作簿读取。
+    """
+    if frames is None:
+        frames = parse_excel_data()
+    outputs = {}
+    for mode in PARSE_MODES:
+        diagnostics: Dict[str, Any] = {}
+        assessment_data = generate_assessment_data(diagnostics, mode=mode, frames=frames,
+                                                   fuzzy_threshold=fuzzy_threshold)
+        outputs[mode] = (json.dumps(assessment_data, ensure_ascii=False, indent=2), diagnostics)
+    return compare_outputs(('vectorized', 'reference'), outputs)
+
+def check_readers(scale_path: str = SCALE_WORKBOOK, operation_path: str = OPERATION_WORKBOOK,
+                  mode: str = 'vectorized', fuzzy_threshold: Optional[float] = DEFAULT_MIN_SCORE) -> List[str]:
+    """用 pandas 与 openpyxl 两种读取方式分别生成数据，返回差异描述（为空表示 JSON 与诊断信息完全一致）"""
+    outputs = {}
+    for reader in READERS:
+        diagnostics: Dict[str, Any] = {}
+        frames = parse_excel_data(scale_path, operation_path, reader)
+        assessment_data = generate_assessment_data(diagnostics, mode=mode, frames=frames,
+                                                   fuzzy_threshold=fuzzy_threshold)
+        outputs[reader] = (json.dumps(assessment_data, ensure_ascii=False, indent=2), diagnostics)
+    return compare_outputs(('pandas', 'openpyxl'), outputs)
+
 def main():
     """主函数"""
+    args = parse_args()
+    tracing.start(args, 'generate_assessment_data')
+    if args.check_reader:
+        problems = check_readers(mode=args.mode, fuzzy_threshold=fuzzy_threshold_arg(args))
+        for problem in problems:
+            print(f"错误：{problem}")
+        if problems:
+            sys.exit(1)
+        print(f"两种读取方式生成的数据一致（{args.mode} 解析 / 逐行解析）")
+        return
+    if args.check_mode:
+        problems = check_modes(fuzzy_threshold=fuzzy_threshold_arg(args))
+        for problem in problems:
+            print(f"错误：{problem}")
+        if problems:
+            sys.exit(1)
+        print("两种解析模式生成的数据一致（vectorized / reference）")
+        return
+    if args.variants:
+        run_variants(args)
+        return
     print("开始生成评估数据...")
     
     try:
-        assessment_data = generate_assessment_data()
-        
         # 保存到data文件夹
-        output_file = 'child_development_assessment/assets/data/assessment_data.json'
+        output_file = OUTPUT_FILE
+        packed = args.packed or args.packed_compress
+        packed_file = PACKED_OUTPUT_FILE if packed else None
+        index_file = INDEX_OUTPUT_FILE
+        output_files = [output_file, index_file] + ([packed_file] if packed_file else [])
+
+        cache = None
+        frames = None
+        status = BUILD_FULL
+        if args.incremental:
+            cache = BuildCache(args.cache_dir)
+            params = output_parameters(args.mode, True, args.packed_compress if packed else None,
+                                       fuzzy_threshold_arg(args))
+            build_key = cache.build_key([SCALE_WORKBOOK, OPERATION_WORKBOOK], params)
+            if all(cache.output_is_current(path, build_key) for path in output_files):
+                print(f"构建状态: {BUILD_STATUS_LABELS[BUILD_HIT]}")
+                print(f"输入与参数均未变化，保留现有文件: {output_file}")
+                return
+            frames, status = load_frames_incremental(cache, args.reader)
+
+        if frames is None:
+            frames = parse_excel_data(reader=args.reader)
+        diagnostics: Dict[str, Any] = {}
+        assessment_data = generate_assessment_data(diagnostics, mode=args.mode, frames=frames,
+                                                   fuzzy_threshold=fuzzy_threshold_arg(args))
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(assessment_data, f, ensure_ascii=False, indent=2)
+        # 预计算索引在写出前先与分组数据核对
+        packed_size = write_outputs(assessment_data, output_file, index_file, packed_file, args.packed_compress)
+
+        if cache is not None:
+            for path in output_files:
+                cache.record_output(path, build_key, status)
         
         print(f"数据生成完成，已保存到: {output_file}")
+        print(f"预计算索引已保存到: {index_file}")
+        if packed_file:
+            print(f"紧凑二进制数据已保存到: {packed_file}（{packed_size} 字节）")
+        print(f"构建状态: {BUILD_STATUS_LABELS[status]}")
         print(f"共生成 {len(assessment_data)} 个评估项目")
         
         # 统计信息
-        area_stats = {}
-        age_stats = {}
-        total_items = 0
+        total_items, area_stats, age_stats = collect_statistics(assessment_data)
         
-        for item in assessment_data:
-            area = item['area']
-            age = item['ageMonth']
-            test_items = item['testItems']
-            
-            area_stats[area] = area_stats.get(area, 0) + len(test_items)
-            age_stats[age] = age_stats.get(age, 0) + len(test_items)
-            total_items += len(test_items)
-        
-        print(f"\n统计信息:")
+        print("\n统计信息:")
         print(f"总测试项目数: {total_items}")
         print("各能区项目数量:")
         for area, count in area_stats.items():
@@ -206,6 +901,8 @@ def main():
         print("\n各月龄项目数量:")
         for age in sorted(age_stats.keys()):
             print(f"  {age}月龄: {age_stats[age]} 项")
+
+        print_operation_diagnostics(diagnostics)
             
     except Exception as e:
         print(f"生成数据时出错: {e}")
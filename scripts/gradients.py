@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+渐变图层生成（线性 / 径向，支持多个色标）
+用 NumPy 按行或按像素一次性插值，代替逐像素 putpixel。
+同一批次的图片共用相同的背景，生成结果按 (尺寸, 色标, 参数) 缓存。
+
+色标为 (位置, RGBA) 序列，位置取 0~1 且递增；相邻色标之间按 c0 * (1 - t) + c1 * t 线性插值后取整。
+"""
+
+import math
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+RGBA = Tuple[int, int, int, int]
+ColorStop = Tuple[float, RGBA]
+
+# 缓存的渐变图层数量上限（每张 1242×2688 RGBA 约 13MB，与截图的静态图层缓存一致，按设备尺寸数取值）
+GRADIENT_CACHE_SIZE = 4
+
+# 二维渐变（斜向、径向）先把 0~1 的位置量化到该精度的查找表，再按下标取色
+LUT_SIZE = 1 << 16
+
+def normalize_stops(stops: Sequence[ColorStop]) -> Tuple[ColorStop, ...]:
+    """检查并规整色标，返回可哈希的元组"""
+    if not stops:
+        raise ValueError("渐变至少需要一个色标")
+    result = []
+    previous = 0.0
+    for offset, color in stops:
+        offset = min(1.0, max(0.0, float(offset)))
+        if offset < previous:
+            raise ValueError(f"色标位置必须递增: {offset} < {previous}")
+        previous = offset
+        result.append((offset, tuple(int(c) for c in color)))
+    return tuple(result)
+
+def interpolate_stops(positions: np.ndarray, stops: Tuple[ColorStop, ...]) -> np.ndarray:
+    """按色标对位置数组插值，返回形状为 positions.shape + (4,) 的 uint8 数组"""
+    positions = np.clip(positions, 0.0, 1.0)
+    offsets = np.array([offset for offset, _ in stops], dtype=np.float64)
+    colors = np.array([color for _, color in stops], dtype=np.float64)
+    if len(stops) == 1:
+        out = np.broadcast_to(colors[0], positions.shape + (4,))
+        return out.astype(np.uint8)
+
+    # 每个位置所在的色标区间 [segment, segment + 1]
+    segment = np.clip(np.searchsorted(offsets, positions, side='right') - 1, 0, len(stops) - 2)
+    start = offsets[segment]
+    span = offsets[segment + 1] - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(span > 0, (positions - start) / span, 1.0)
+    t = np.clip(t, 0.0, 1.0)[..., np.newaxis]
+    values = colors[segment] * (1 - t) + colors[segment + 1] * t
+    # 与 int() 截断一致
+    return values.astype(np.uint8)
+
+def lookup_stops(positions: np.ndarray, stops: Tuple[ColorStop, ...]) -> np.ndarray:
+    """与 interpolate_stops 相同，但经由查找表取色，适合整幅图的位置数组
+
+    RGBA 四个通道按 uint32 一次取出，误差不超过 1/LUT_SIZE 的位置偏差。
+    """
+    table = interpolate_stops(np.linspace(0.0, 1.0, LUT_SIZE), stops)
+    table32 = np.ascontiguousarray(table).view(np.uint32).reshape(LUT_SIZE)
+    indices = np.clip(positions, 0.0, 1.0) * (LUT_SIZE - 1) + 0.5
+    pixels = table32.take(indices.astype(np.intp))
+    return pixels.view(np.uint8).reshape(positions.shape + (4,))
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def linear_gradient(size: Tuple[int, int], stops: Tuple[ColorStop, ...], angle: float = 180.0) -> Image.Image:
+    """线性渐变，角度含义与 CSS 相同：180 为自上而下，90 为自左向右
+
+    返回的图像由多次调用共享，调用方不要原地修改（需要时先 copy()）。
+    """
+    width, height = size
+    radians = math.radians(angle % 360)
+    dx, dy = math.sin(radians), -math.cos(radians)
+
+    # 水平、竖直方向只需计算一行或一列，再广播到整幅图
+    if abs(dx) < 1e-12:
+        ramp = np.arange(height, dtype=np.float64) / max(1, height - 1)
+        if dy < 0:
+            ramp = 1.0 - ramp
+        column = interpolate_stops(ramp, stops)
+        pixels = np.broadcast_to(column[:, np.newaxis, :], (height, width, 4))
+    elif abs(dy) < 1e-12:
+        ramp = np.arange(width, dtype=np.float64) / max(1, width - 1)
+        if dx < 0:
+            ramp = 1.0 - ramp
+        row = interpolate_stops(ramp, stops)
+        pixels = np.broadcast_to(row[np.newaxis, :, :], (height, width, 4))
+    else:
+        # 渐变线过画布中心，长度取使四角恰好落在 0 与 1 上的投影长度
+        length = abs((width - 1) * dx) + abs((height - 1) * dy)
+        xs = np.arange(width, dtype=np.float64) - (width - 1) / 2
+        ys = np.arange(height, dtype=np.float64) - (height - 1) / 2
+        positions = (xs[np.newaxis, :] * dx + ys[:, np.newaxis] * dy) / length + 0.5
+        pixels = lookup_stops(positions, stops)
+    return Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def radial_gradient(
+    size: Tuple[int, int],
+    stops: Tuple[ColorStop, ...],
+    center: Tuple[float, float] = (0.5, 0.5),
+    radius: float = 0.0,
+) -> Image.Image:
+    """径向渐变：center 为相对坐标，radius 为像素半径（0 表示到最远角的距离）
+
+    返回的图像由多次调用共享，调用方不要原地修改（需要时先 copy()）。
+    """
+    width, height = size
+    cx, cy = center[0] * (width - 1), center[1] * (height - 1)
+    if radius <= 0:
+        radius = max(math.hypot(x - cx, y - cy) for x in (0, width - 1) for y in (0, height - 1)) or 1.0
+    xs = (np.arange(width, dtype=np.float64) - cx) ** 2
+    ys = (np.arange(height, dtype=np.float64) - cy) ** 2
+    positions = np.sqrt(ys[:, np.newaxis] + xs[np.newaxis, :]) / radius
+    return Image.fromarray(lookup_stops(positions, stops), "RGBA")
+
+def clear_gradient_cache() -> None:
+    linear_gradient.cache_clear()
+    radial_gradient.cache_clear()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目名称的模糊匹配索引
+表A.1 中的项目在表B.1 中找不到相同编号时（编号录入错误、修订版重新编号等），按名称找出最相近的 B.1 行。
+
+- 规范化：NFKC（全角字母数字转半角），只保留文字与数字，去掉空格、标点与符号（如 “° * ．”）
+- 相似度：字符二元组（bigram，首尾加边界标记，单字名称也有两个二元组）集合的 Dice 系数，
+  2|A∩B| / (|A| + |B|)，取值 0～1，作为匹配的置信度
+- 索引：二元组 -> 包含该二元组的名称列表（倒排索引）。查询时按前缀过滤只取候选：
+  相似度不低于 t 时两者至少共有 ceil(t·|A| / (2 - t)) 个二元组，因此候选必然出现在
+  查询中最少见的 |A| - 该数量 + 1 个二元组的倒排列表里，其余名称无需比较；候选再按二元组数过滤后
+  计算相似度。查询耗时取决于这些倒排列表的长度，而不是索引中的名称总数
+- 并列：最高相似度相同的候选有多个时标记为并列，由调用方决定是否采用
+
+用法示例：
+  python scripts/name_index.py "docs/表 B.1 ….xlsx" 俯卧抬头 拉腕坐起   # 在 B.1 的“测查项目”中查找
+"""
+
+import argparse
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Generic, Hashable, List, Optional, Set, TypeVar
+
+import tracing
+
+# 默认的最低置信度：低于该值的候选不视为匹配
+DEFAULT_MIN_SCORE = 0.6
+
+# 相似度相差不超过该值时视为并列
+TIE_TOLERANCE = 1e-9
+
+# 名称首尾的边界标记（不会出现在规范化后的名称中）
+_START, _END = '\x02', '\x03'
+
+# B.1 “测查项目”列开头的编号与分隔符，如 “12．”（编号缺失时只有分隔符，如 “．”）
+_LEADING_ID = re.compile(r'^\s*\d*\s*[．.、]?\s*')
+
+Key = TypeVar('Key', bound=Hashable)
+
+def normalize_name(text: str) -> str:
+    """规范化名称：NFKC 后只保留文字与数字"""
+    text = unicodedata.normalize('NFKC', text or '')
+    return ''.join(ch for ch in text if unicodedata.category(ch)[0] in 'LN').lower()
+
+def strip_leading_id(text: str) -> str:
+    """去掉 B.1 “测查项目”开头的编号与分隔符，如 “12．俯卧头抬离床面” -> “俯卧头抬离床面”"""
+    return _LEADING_ID.sub('', text or '', count=1)
+
+def name_grams(name: str) -> FrozenSet[str]:
+    """规范化名称的字符二元组集合（含首尾边界）；规范化后为空时返回空集"""
+    normalized = normalize_name(name)
+    if not normalized:
+        return frozenset()
+    padded = _START + normalized + _END
+    return frozenset(padded[idx:idx + 2] for idx in range(len(padded) - 1))
+
+@dataclass
+class NameMatch(Generic[Key]):
+    key: Key
+    name: str
+    score: float
+
+@dataclass
+class Resolution(Generic[Key]):
+    """一次查询的结果：best 为最相近的候选（低于阈值时为 None），tied 为与其并列的其他候选"""
+    best: Optional[NameMatch]
+    tied: List[NameMatch]
+    candidates: List[NameMatch]
+
+    @property
+    def is_tie(self) -> bool:
+        return bool(self.tied)
+
+class NameIndex(Generic[Key]):
+    """名称的二元组倒排索引；key 为调用方的标识（如 B.1 行号），按加入顺序决定并列时的先后"""
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._keys: List[Key] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: Key, name: str) -> None:
+        grams = name_grams(name)
+        slot = len(self._names)
+        self._names.append(name)
+        self._keys.append(key)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(slot)
+
+    def search(self, name: str, min_score: float = DEFAULT_MIN_SCORE, limit: int = 5) -> List[NameMatch]:
+        """返回相似度不低于 min_score 的候选，按相似度从高到低、相同时按加入顺序排列"""
+        query = name_grams(name)
+        if not query or not self._names:
+            return []
+        min_score = max(min_score, TIE_TOLERANCE)
+        # 前缀过滤：候选至少共有 min_overlap 个二元组，必然出现在最少见的 len(query) - min_overlap + 1 个二元组中
+        min_overlap = max(1, math.ceil(min_score * len(query) / (2 - min_score) - TIE_TOLERANCE))
+        if min_overlap > len(query):
+            return []
+        rare_first = sorted(query, key=lambda gram: len(self._postings.get(gram, ())))
+        slots: Set[int] = set()
+        for gram in rare_first[:len(query) - min_overlap + 1]:
+            slots.update(self._postings.get(gram, ()))
+
+        # 长度过滤：相似度不低于 t 时，候选的二元组数在 [t·|A| / (2 - t), (2 - t)·|A| / t] 之间
+        size = len(query)
+        min_size, max_size = min_overlap, (2 - min_score) * size / min_score + TIE_TOLERANCE
+        matches = []
+        for slot in slots:
+            grams = self._grams[slot]
+            if not min_size <= len(grams) <= max_size:
+                continue
+            score = 2 * len(query & grams) / (size + len(grams))
+            if score >= min_score - TIE_TOLERANCE:
+                matches.append((-score, slot))
+        matches.sort()
+        return [NameMatch(self._keys[slot], self._names[slot], -neg_score) for neg_score, slot in matches[:limit]]
+
+    def resolve(self, name: str, min_score: float = DEFAULT_MIN_SCORE, limit: int = 5) -> Resolution:
+        """查找最相近的候选，并标记与其相似度相同的其他候选"""
+        candidates = self.search(name, min_score, limit)
+        if not candidates:
+            return Resolution(best=None, tied=[], candidates=[])
+        best = candidates[0]
+        tied = [match for match in candidates[1:] if best.score - match.score <= TIE_TOLERANCE]
+        return Resolution(best=best, tied=tied, candidates=candidates)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="在表B.1 的“测查项目”中按名称模糊查找")
+    parser.add_argument("operation_workbook", help="表B.1 工作簿")
+    parser.add_argument("names", nargs="+", help="要查找的项目名称")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help=f"最低置信度，默认 {DEFAULT_MIN_SCORE}")
+    parser.add_argument("--limit", type=int, default=5, help="每个名称最多列出的候选数，默认 5")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
+def main() -> None:
+    from xlsx_reader import cell_text, read_sheet
+
+    args = parse_args()
+    tracing.start(args, 'name_index')
+    sheet = read_sheet(args.operation_workbook)
+    index: NameIndex[int] = NameIndex()
+    for row_idx, value in enumerate(sheet.column('测查项目')):
+        index.add(row_idx, strip_leading_id(cell_text(value)))
+    for name in args.names:
+        resolution = index.resolve(name, args.min_score, args.limit)
+        flag = "（并列）" if resolution.is_tie else ""
+        print(f"{name}{flag}:")
+        if not resolution.candidates:
+            print(f"  没有置信度不低于 {args.min_score} 的候选")
+        for match in resolution.candidates:
+            print(f"  第 {match.key} 行 {match.name}（置信度 {match.score:.2f}）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+评估数据的紧凑二进制格式（assessment_data.bin）
+由 generate_assessment_data.py --packed 生成（写在 build/data/，App 尚未读取，不打包进 assets/）；JSON 仍是便于人工编辑的源文件，
+二进制文件体积更小，加载时无需逐字符解析 JSON。
+
+文件布局（小端序）：
+  头部        magic 'BMAD' | u16 版本 | u16 标志 | u32 字符串数 | u16 月龄数 | u16 能区数 | u32 分组数 | u32 项目数
+  字符串表    u32 偏移[字符串数 + 1] | UTF-8 数据（FLAG_ZLIB 时为 zlib 压缩后的数据，前置 u32 压缩长度）
+  月龄表      u16 月龄[月龄数]
+  能区表      u32 能区名字符串下标[能区数]
+  偏移表      u16 分组下标[月龄数 × 能区数]（0xFFFF 表示该月龄该能区无数据）
+  分组记录    u16 月龄下标 | u16 能区下标 | f64 分数 | u32 首个项目下标 | u32 项目数
+  项目记录    u32 编号 | u16 项目能区下标 | u16 保留 | f64 分值 | u32 名称 | u32 描述 | u32 操作方法 | u32 通过要求
+
+字符串统一驻留在字符串表中，同一文本只存一份；分组按 JSON 中的顺序存放，可无损还原 JSON。
+
+用法示例：
+  python scripts/packed_dataset.py pack assessment_data.json assessment_data.bin
+  python scripts/packed_dataset.py verify assessment_data.json assessment_data.bin
+"""
+
+import argparse
+import json
+import struct
+import sys
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from build_cache import write_atomic
+import tracing
+
+MAGIC = b'BMAD'
+FORMAT_VERSION = 1
+
+# 标志位
+FLAG_ZLIB = 0x0001  # 字符串数据经 zlib 压缩
+
+NO_GROUP = 0xFFFF
+
+_HEADER = struct.Struct('<4sHHIHHII')
+_GROUP = struct.Struct('<HHdII')
+_ITEM = struct.Struct('<IHHdIIII')
+
+class PackedFormatError(ValueError):
+    """二进制数据格式错误"""
+
+class StringTable:
+    """字符串驻留表：相同文本只保存一次"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._index[value] = index
+            self.strings.append(value)
+        return index
+
+def pack_assessment_data(assessment_data: List[Dict[str, Any]], compress: bool = False) -> bytes:
+    """将 assessment_data 结构打包为二进制"""
+    strings = StringTable()
+    ages: List[int] = []
+    age_index: Dict[int, int] = {}
+    areas: List[int] = []
+    area_index: Dict[str, int] = {}
+
+    def area_slot(area: str) -> int:
+        if area not in area_index:
+            area_index[area] = len(areas)
+            areas.append(strings.intern(area))
+        return area_index[area]
+
+    groups: List[bytes] = []
+    items: List[bytes] = []
+    offsets: Dict[Tuple[int, int], int] = {}
+    for group_idx, group in enumerate(assessment_data):
+        if group['ageMonth'] not in age_index:
+            age_index[group['ageMonth']] = len(ages)
+            ages.append(group['ageMonth'])
+        age_slot = age_index[group['ageMonth']]
+        group_area_slot = area_slot(group['area'])
+        offsets.setdefault((age_slot, group_area_slot), group_idx)
+
+        groups.append(_GROUP.pack(age_slot, group_area_slot, float(group['score']), len(items), len(group['testItems'])))
+        for test_item in group['testItems']:
+            items.append(_ITEM.pack(
+                test_item['id'],
+                area_slot(test_item['area']),
+                0,
+                float(test_item['score']),
+                strings.intern(test_item['name']),
+                strings.intern(test_item['desc']),
+                strings.intern(test_item['operation']),
+                strings.intern(test_item['passCondition']),
+            ))
+
+    if len(assessment_data) >= NO_GROUP:
+        raise PackedFormatError(f"分组数量过多: {len(assessment_data)}")
+
+    encoded = [value.encode('utf-8') for value in strings.strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    string_data = b''.join(encoded)
+
+    flags = 0
+    if compress:
+        flags |= FLAG_ZLIB
+        compressed = zlib.compress(string_data, 9)
+        string_data = struct.pack('<I', len(compressed)) + compressed
+
+    offset_table = [NO_GROUP] * (len(ages) * len(areas))
+    for (age_slot, group_area_slot), group_idx in offsets.items():
+        offset_table[age_slot * len(areas) + group_area_slot] = group_idx
+
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(encoded), len(ages), len(areas), len(groups), len(items)),
+        struct.pack(f'<{len(string_offsets)}I', *string_offsets),
+        string_data,
+        struct.pack(f'<{len(ages)}H', *ages),
+        struct.pack(f'<{len(areas)}I', *areas),
+        struct.pack(f'<{len(offset_table)}H', *offset_table),
+    ]
+    parts.extend(groups)
+    parts.extend(items)
+    return b''.join(parts)
+
+class PackedDataset:
+    """二进制评估数据的读取器"""
+
+    def __init__(self, data: bytes):
+        if len(data) < _HEADER.size:
+            raise PackedFormatError("文件长度不足")
+        magic, version, flags, string_count, age_count, area_count, group_count, item_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise PackedFormatError(f"文件标识不正确: {magic!r}")
+        if version != FORMAT_VERSION:
+            raise PackedFormatError(f"不支持的格式版本: {version}")
+
+        pos = _HEADER.size
+        string_offsets = struct.unpack_from(f'<{string_count + 1}I', data, pos)
+        pos += 4 * (string_count + 1)
+        if flags & FLAG_ZLIB:
+            (compressed_size,) = struct.unpack_from('<I', data, pos)
+            pos += 4
+            string_data = zlib.decompress(data[pos:pos + compressed_size])
+            pos += compressed_size
+        else:
+            string_data = data[pos:pos + string_offsets[-1]]
+            pos += string_offsets[-1]
+        self.strings = [
+            string_data[string_offsets[i]:string_offsets[i + 1]].decode('utf-8') for i in range(string_count)
+        ]
+
+        self.ages = list(struct.unpack_from(f'<{age_count}H', data, pos))
+        pos += 2 * age_count
+        self.areas = [self.strings[i] for i in struct.unpack_from(f'<{area_count}I', data, pos)]
+        pos += 4 * area_count
+        self.offset_table = struct.unpack_from(f'<{age_count * area_count}H', data, pos)
+        pos += 2 * age_count * area_count
+
+        self.groups = [_GROUP.unpack_from(data, pos + i * _GROUP.size) for i in range(group_count)]
+        pos += _GROUP.size * group_count
+        self.items = [_ITEM.unpack_from(data, pos + i * _ITEM.size) for i in range(item_count)]
+        pos += _ITEM.size * item_count
+        if pos != len(data):
+            raise PackedFormatError(f"文件长度与头部描述不符: {len(data)} != {pos}")
+
+        self._age_slot = {age: idx for idx, age in enumerate(self.ages)}
+        self._area_slot = {area: idx for idx, area in enumerate(self.areas)}
+
+    @classmethod
+    def load(cls, path: str) -> 'PackedDataset':
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def _item_dict(self, record: Tuple) -> Dict[str, Any]:
+        item_id, area_slot, _, score, name, desc, operation, pass_condition = record
+        return {
+            'id': item_id,
+            'name': self.strings[name],
+            'desc': self.strings[desc],
+            'operation': self.strings[operation],
+            'passCondition': self.strings[pass_condition],
+            'score': score,
+            'area': self.areas[area_slot],
+        }
+
+    def _group_dict(self, group: Tuple) -> Dict[str, Any]:
+        age_slot, area_slot, score, first_item, item_count = group
+        return {
+            'ageMonth': self.ages[age_slot],
+            'area': self.areas[area_slot],
+            'score': score,
+            'testItems': [self._item_dict(record) for record in self.items[first_item:first_item + item_count]],
+        }
+
+    def find_group(self, age_month: int, area: str) -> Optional[Dict[str, Any]]:
+        """通过偏移表直接定位 (月龄, 能区) 分组"""
+        age_slot = self._age_slot.get(age_month)
+        area_slot = self._area_slot.get(area)
+        if age_slot is None or area_slot is None:
+            return None
+        group_idx = self.offset_table[age_slot * len(self.areas) + area_slot]
+        if group_idx == NO_GROUP:
+            return None
+        return self._group_dict(self.groups[group_idx])
+
+    def to_assessment_data(self) -> List[Dict[str, Any]]:
+        """还原为与 assessment_data.json 相同的结构"""
+        return [self._group_dict(group) for group in self.groups]
+
+def write_packed(assessment_data: List[Dict[str, Any]], path: str, compress: bool = False) -> int:
+    """写出二进制文件（先写临时文件再替换），返回字节数"""
+    data = pack_assessment_data(assessment_data, compress=compress)
+    write_atomic(path, data)
+    return len(data)
+
+def read_packed(path: str) -> List[Dict[str, Any]]:
+    """读取二进制文件并还原为 assessment_data 结构"""
+    return PackedDataset.load(path).to_assessment_data()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="assessment_data.json 与紧凑二进制格式互相转换")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    pack = subparsers.add_parser("pack", help="将 JSON 打包为二进制")
+    pack.add_argument("json_file")
+    pack.add_argument("packed_file")
+    pack.add_argument("--compress", action="store_true", help="使用 zlib 压缩字符串表")
+    unpack = subparsers.add_parser("unpack", help="将二进制还原为 JSON")
+    unpack.add_argument("packed_file")
+    unpack.add_argument("json_file")
+    verify = subparsers.add_parser("verify", help="检查二进制文件能否无损还原 JSON")
+    verify.add_argument("json_file")
+    verify.add_argument("packed_file")
+    for subparser in (pack, unpack, verify):
+        tracing.add_arguments(subparser)
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'packed_dataset')
+    if args.command == "pack":
+        with open(args.json_file, 'r', encoding='utf-8') as f:
+            size = write_packed(json.load(f), args.packed_file, compress=args.compress)
+        print(f"已生成: {args.packed_file}（{size} 字节）")
+    elif args.command == "unpack":
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump(read_packed(args.packed_file), f, ensure_ascii=False, indent=2)
+        print(f"已还原: {args.json_file}")
+    else:
+        with open(args.json_file, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        if read_packed(args.packed_file) != expected:
+            print("错误：二进制文件与 JSON 内容不一致")
+            sys.exit(1)
+        print("二进制文件与 JSON 内容一致")
+
+if __name__ == "__main__":
+    main()
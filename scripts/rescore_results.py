@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+对导出的测评结果批量重新评分
+数据集或评分规则变化后，按当前 assessment_data.json 重新计算各能区智龄、总分与发育商。
+
+用法示例（在仓库根目录执行）：
+  python scripts/rescore_results.py exports/*.json --output rescored.jsonl
+  python scripts/rescore_results.py --check-fixtures     # 核对与 Dart 端共用的一致性用例
+
+输入文件可以是 ExportService 导出的单个 TestResult 对象、TestResult 数组，或每行一个对象的 .jsonl。
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from scoring import AREAS, ScoringEngine, ScoringModel, check_fixtures, load_fixtures, update_fixture_expectations
+from scoring.fixtures import parse_test_results
+import tracing
+
+DEFAULT_DATA_FILE = 'child_development_assessment/assets/data/assessment_data.json'
+DEFAULT_FIXTURE_FILE = 'scripts/scoring/fixtures/scoring_parity.json'
+
+def iter_results(paths: List[str]) -> Iterator[Tuple[str, int, Dict[str, Any]]]:
+    """逐条产出 (文件, 序号, TestResult)"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                for index, line in enumerate(line for line in f if line.strip()):
+                    yield path, index, json.loads(line)
+                continue
+            data = json.load(f)
+        records = data if isinstance(data, list) else [data]
+        for index, record in enumerate(records):
+            yield path, index, record
+
+def _changed(record: Dict[str, Any], rescored: Dict[str, Any]) -> bool:
+    """与原结果相比，发育商或任一能区智龄是否变化"""
+    if 'dq' not in record or not math.isclose(float(record['dq']), rescored['dq'], abs_tol=1e-9):
+        return True
+    stored_scores = record.get('areaScores') or {}
+    return any(
+        area not in stored_scores or not math.isclose(float(stored_scores[area]), rescored['areaScores'][area], abs_tol=1e-9)
+        for area in AREAS
+    )
+
+def rescore(engine: ScoringEngine, paths: List[str], output_path: str, batch_size: int) -> Dict[str, int]:
+    """按批读取、评分并写出 JSONL，返回统计信息"""
+    stats = {'total': 0, 'changed': 0}
+    batch: List[Tuple[str, int, Dict[str, Any]]] = []
+
+    def flush(out) -> None:
+        with tracing.span('score_batch', size=len(batch)):
+            results = engine.score_sessions(
+                [parse_test_results(record.get('testResults') or {}) for _, _, record in batch],
+                [float(record.get('actualAge', 0)) for _, _, record in batch],
+            )
+        for (source, index, record), rescored in zip(batch, results):
+            changed = _changed(record, rescored)
+            stats['total'] += 1
+            stats['changed'] += int(changed)
+            out.write(json.dumps({
+                'source': source,
+                'index': index,
+                'userName': record.get('userName'),
+                'actualAge': record.get('actualAge'),
+                'mainTestAge': record.get('mainTestAge'),
+                **rescored,
+                'changed': changed,
+            }, ensure_ascii=False) + '\n')
+        tracing.counter('rescore', total=stats['total'], changed=stats['changed'])
+        batch.clear()
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for entry in iter_results(paths):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                flush(out)
+        if batch:
+            flush(out)
+    return stats
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="按当前数据集对导出的测评结果批量重新评分")
+    parser.add_argument("inputs", nargs="*", help="导出的测评结果文件（.json / .jsonl）")
+    parser.add_argument("--data", default=DEFAULT_DATA_FILE, help=f"评估数据文件，默认 {DEFAULT_DATA_FILE}")
+    parser.add_argument("--output", default="rescored_results.jsonl", help="输出的 JSONL 文件，默认 rescored_results.jsonl")
+    parser.add_argument("--batch-size", type=int, default=50000, help="每批评分的测评数量，默认 50000")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURE_FILE, help=f"一致性用例文件，默认 {DEFAULT_FIXTURE_FILE}")
+    parser.add_argument("--check-fixtures", action="store_true", help="用参考实现与批量引擎核对一致性用例")
+    parser.add_argument("--update-fixtures", action="store_true", help="按参考实现重写一致性用例的期望结果")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'rescore_results')
+    with tracing.span('load_data', path=args.data):
+        with open(args.data, 'r', encoding='utf-8') as f:
+            all_data = json.load(f)
+
+    if args.update_fixtures:
+        fixtures = update_fixture_expectations(all_data, load_fixtures(args.fixtures))
+        with open(args.fixtures, 'w', encoding='utf-8') as f:
+            json.dump(fixtures, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"已更新一致性用例: {args.fixtures}（请运行 Flutter 端 test/scoring_parity_test.dart 确认）")
+        return
+
+    if args.check_fixtures:
+        problems = check_fixtures(all_data, load_fixtures(args.fixtures))
+        for problem in problems:
+            print(f"不一致：{problem}")
+        print("一致性用例全部通过" if not problems else f"共 {len(problems)} 处不一致")
+        sys.exit(1 if problems else 0)
+
+    if not args.inputs:
+        raise SystemExit("请指定需要重新评分的结果文件")
+
+    with tracing.span('build_model'):
+        engine = ScoringEngine(ScoringModel(all_data))
+    start = time.perf_counter()
+    stats = rescore(engine, args.inputs, args.output, args.batch_size)
+    elapsed = time.perf_counter() - start
+    rate = stats['total'] / elapsed if elapsed > 0 else 0
+    print(f"重新评分完成: {stats['total']} 条，结果变化 {stats['changed']} 条，已保存到: {args.output}")
+    print(f"耗时 {elapsed:.2f}s（约 {rate:,.0f} 条/秒）")
+
+if __name__ == "__main__":
+    main()
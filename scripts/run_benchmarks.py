@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行 scripts/ 下各流水线的基准测试，并与已保存的基线比较
+
+用法示例（在仓库根目录执行）：
+  python scripts/run_benchmarks.py                                  # 全部用例，与基线比较
+  python scripts/run_benchmarks.py --suites excel --scales 1,10     # 只测 Excel 解析
+  python scripts/run_benchmarks.py --font /path/to/NotoSansCJK.ttc  # 未安装 Noto Sans CJK 时指定字体
+  python scripts/run_benchmarks.py --update-baseline                # 以本次结果作为新的基线
+
+每个用例记录耗时、峰值内存与各阶段耗时，写入 --output；
+相对基线的耗时或峰值内存超过阈值时列出回归并以非零状态码退出。
+基线只在生成它的机器上有效：运行环境（Python 与依赖版本、CPU 数、字体）与基线不同时只列出变化，
+不判定回归（--ignore-environment 仍然判定）；更换构建机后先用 --update-baseline 重新生成。
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from bench import Thresholds, compare_results, load_results, run_case, write_results
+from bench.harness import environment_differences, format_comparison, make_results
+from bench.suites import SUITES, build_cases, prepare_inputs
+from bench.synthetic import DEVICE_SIZES, parse_counts
+import tracing
+
+DEFAULT_BASELINE = 'scripts/bench/baseline.json'
+DEFAULT_OUTPUT = 'scripts/bench/results.json'
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="scripts/ 流水线基准测试")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"逗号分隔的用例组，默认 {','.join(SUITES)}")
+    parser.add_argument("--scales", default="1,10,100", help="Excel、校验、比较与名称匹配用例的数据倍数（1× 为 28 个月龄 × 10 行），默认 1,10,100")
+    parser.add_argument("--screenshot-configs", default="4", help="截图用例的条目数 N，可传入多个，默认 4")
+    parser.add_argument("--screenshot-sizes", default="1,3",
+                        help=f"截图用例的输出尺寸数 M（不超过 {len(DEVICE_SIZES)}），可传入多个，默认 1,3")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例的重复次数（耗时取最小值），默认 3")
+    parser.add_argument("--font", help="截图用例使用的替代字体（未安装 Noto Sans CJK 时使用）")
+    parser.add_argument("--work-dir", help="合成输入的存放目录（保留并在下次运行时复用），默认使用临时目录")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"结果文件，默认 {DEFAULT_OUTPUT}")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"基线文件，默认 {DEFAULT_BASELINE}")
+    parser.add_argument("--update-baseline", action="store_true", help="将本次结果写入基线文件")
+    parser.add_argument("--no-compare", action="store_true", help="不与基线比较")
+    parser.add_argument("--ignore-environment", action="store_true", help="运行环境与基线不同时仍判定回归")
+    parser.add_argument("--time-threshold", type=float, default=Thresholds.time_ratio,
+                        help=f"耗时回归阈值（相对变化），默认 {Thresholds.time_ratio}")
+    parser.add_argument("--memory-threshold", type=float, default=Thresholds.memory_ratio,
+                        help=f"峰值内存回归阈值（相对变化），默认 {Thresholds.memory_ratio}")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    if 'skipped' in result:
+        return f"{name}: 已跳过（{result['skipped']}）"
+    peak = f"{result['peak_rss_mb']:.1f} MB" if result.get('peak_rss_mb') is not None else "-"
+    stages = "，".join(f"{stage} {entry['seconds']:.3f}s" for stage, entry in result['stages'].items())
+    return f"{name}: {result['wall_seconds']:.3f}s，峰值内存 {peak}（{stages}）"
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'run_benchmarks')
+    suites = [name.strip() for name in args.suites.split(",") if name.strip()]
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        raise SystemExit(f"未知的用例组: {unknown}")
+    try:
+        scales = parse_counts(args.scales)
+        screenshot_configs = parse_counts(args.screenshot_configs)
+        screenshot_sizes = parse_counts(args.screenshot_sizes)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    if max(screenshot_sizes) > len(DEVICE_SIZES):
+        raise SystemExit(f"--screenshot-sizes 不能超过 {len(DEVICE_SIZES)}")
+    if args.repeat < 1:
+        raise SystemExit("--repeat 至少为 1")
+
+    cases = build_cases(suites, scales, screenshot_configs, screenshot_sizes)
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="bench-"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        start = time.perf_counter()
+        with tracing.span('prepare_inputs'):
+            prepare_inputs(cases, work_dir)
+        print(f"合成输入已就绪: {work_dir}（{time.perf_counter() - start:.1f}s）")
+
+        case_results: Dict[str, Dict[str, Any]] = {}
+        for case in cases:
+            with tracing.span(case.name, repeat=args.repeat):
+                case_results[case.name] = run_case(case, work_dir, args.font, args.repeat)
+            print(format_result(case.name, case_results[case.name]))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    settings = {
+        'suites': suites,
+        'scales': scales,
+        'screenshotConfigs': screenshot_configs,
+        'screenshotSizes': screenshot_sizes,
+        'repeat': args.repeat,
+    }
+    results = make_results(case_results, settings, args.font)
+    write_results(args.output, results)
+    print(f"\n结果已保存到: {args.output}")
+
+    if args.update_baseline:
+        write_results(args.baseline, results)
+        print(f"基线已更新: {args.baseline}")
+        return
+    if args.no_compare:
+        return
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"没有可用的基线（{args.baseline}），可用 --update-baseline 生成")
+        return
+    print(f"\n与基线比较（{baseline['created']}）:")
+    differences = environment_differences(results, baseline)
+    if differences:
+        print("  注意：运行环境与基线不同，比较结果仅供参考: " + "; ".join(differences))
+    for line in format_comparison(results, baseline):
+        print(line)
+    if differences and not args.ignore_environment:
+        print("\n运行环境与基线不同，不判定回归（--ignore-environment 仍然判定，或在本机用 --update-baseline 生成基线）")
+        return
+
+    thresholds = Thresholds(time_ratio=args.time_threshold, memory_ratio=args.memory_threshold)
+    regressions = compare_results(results, baseline, thresholds)
+    if regressions:
+        print(f"\n发现 {len(regressions)} 处回归:")
+        for regression in regressions:
+            print(f"  {regression.case} {regression.metric}: {regression.baseline:.3f} -> {regression.current:.3f}"
+                  f"（{regression.change * 100:+.1f}%）")
+        sys.exit(1)
+    print("\n未发现回归")
+
+if __name__ == "__main__":
+    main()
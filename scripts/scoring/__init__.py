@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Python 版评分引擎
+- reference：lib/services/assessment_service.dart 的逐行移植，作为对照基准
+- engine：基于 NumPy 位图的批量评分，用于对导出的测评结果批量重新评分
+"""
+
+from .engine import AreaTable, ScoringEngine, ScoringModel
+from .fixtures import check_fixtures, load_fixtures, update_fixture_expectations
+from .reference import AGE_GROUPS, AREAS, score_session
+
+__all__ = [
+    'AGE_GROUPS',
+    'AREAS',
+    'AreaTable',
+    'ScoringEngine',
+    'ScoringModel',
+    'check_fixtures',
+    'load_fixtures',
+    'score_session',
+    'update_fixture_expectations',
+]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+批量评分引擎
+加载一次 assessment_data.json，预先计算各能区按编号排序的项目、单项分值与累计分值；
+评分时把多次测评编码为 通过/已测 位图矩阵，用 NumPy 按批计算智龄与发育商。
+结果与 reference.py（AssessmentService 的逐行移植）逐位一致。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .reference import AREAS, get_item_score
+
+@dataclass
+class AreaTable:
+    """单个能区的评分表（按项目编号升序）"""
+    area: str
+    item_ids: np.ndarray     # 项目编号
+    columns: slice           # 项目在位图矩阵中的列范围（各能区的列连续存放）
+    scores: np.ndarray       # 单项分值（与 getItemScoreById 相同）
+    cumulative: np.ndarray   # 单项分值的前缀和
+
+class ScoringModel:
+    """assessment_data.json 的评分视图"""
+
+    def __init__(self, assessment_data: List[Dict[str, Any]]):
+        item_scores: Dict[int, float] = {}
+        area_ids: Dict[str, List[int]] = {}
+        for data in assessment_data:
+            for item in data['testItems']:
+                # 与 getItemScoreById 一致：同一编号取第一次出现的分组
+                item_scores.setdefault(item['id'], get_item_score(data['ageMonth'], len(data['testItems'])))
+                area_ids.setdefault(data['area'], []).append(item['id'])
+
+        # 位图矩阵的列按能区连续排列，评分时按能区取切片即可，无需复制
+        ordered_ids: List[int] = []
+        self.areas: Dict[str, AreaTable] = {}
+        for area in AREAS:
+            ids = sorted(area_ids.get(area, []))
+            scores = np.array([item_scores[item_id] for item_id in ids], dtype=np.float64)
+            self.areas[area] = AreaTable(
+                area=area,
+                item_ids=np.array(ids, dtype=np.int64),
+                columns=slice(len(ordered_ids), len(ordered_ids) + len(ids)),
+                scores=scores,
+                cumulative=np.cumsum(scores),
+            )
+            ordered_ids.extend(ids)
+        # 不属于任何能区的项目放在最后，仅用于记录
+        known = set(ordered_ids)
+        ordered_ids.extend(sorted(item_id for item_id in item_scores if item_id not in known))
+
+        self.item_ids = np.array(ordered_ids, dtype=np.int64)
+        # 同一编号在同一能区出现多次时占多列（与 getAllAreaItemIds 相同，每次出现都参与累计），编码时全部标记
+        self.columns_of: Dict[int, List[int]] = {}
+        for col, item_id in enumerate(ordered_ids):
+            self.columns_of.setdefault(item_id, []).append(col)
+
+    @property
+    def item_count(self) -> int:
+        return len(self.item_ids)
+
+    def encode(self, sessions: Sequence[Mapping[int, bool]]) -> Tuple[np.ndarray, np.ndarray]:
+        """把多次测评的 {项目编号: 是否通过} 编码为 (已测, 通过) 两个布尔矩阵
+
+        不在数据集中的项目编号会被忽略（与 Dart 端按能区项目过滤的效果相同）。
+        """
+        tested = np.zeros((len(sessions), self.item_count), dtype=bool)
+        passed = np.zeros_like(tested)
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[bool] = []
+        columns_of = self.columns_of
+        for row, results in enumerate(sessions):
+            for item_id, value in results.items():
+                for col in columns_of.get(int(item_id), ()):
+                    rows.append(row)
+                    cols.append(col)
+                    values.append(bool(value))
+        tested[rows, cols] = True
+        passed[rows, cols] = values
+        return tested, passed
+
+class ScoringEngine:
+    """按批计算能区智龄、总分与发育商"""
+
+    def __init__(self, model: ScoringModel):
+        self.model = model
+
+    def area_mental_ages(self, tested: np.ndarray, passed: np.ndarray, area: str) -> np.ndarray:
+        """与 calculateAreaMentalAge 相同的规则：
+
+        按编号升序，首个通过项目之前未测的项目计为通过，从首个通过项目起只累加通过的项目；
+        没有任何通过项目时智龄为 0。按从左到右的顺序累加，保证浮点结果与 Dart 一致。
+        """
+        table = self.model.areas[area]
+        count = len(table.item_ids)
+        if count == 0:
+            return np.zeros(len(tested), dtype=np.float64)
+
+        area_tested = tested[:, table.columns]
+        area_passed = passed[:, table.columns]
+        has_pass = area_passed.any(axis=1)
+        first_pass = np.argmax(area_passed, axis=1)
+        before_first = np.arange(count)[np.newaxis, :] < first_pass[:, np.newaxis]
+        counted = np.where(before_first, ~area_tested, area_passed)
+        # cumsum 沿行顺序累加（不同于 sum 的两两求和），最后一列即为顺序求和结果
+        totals = np.cumsum(counted * table.scores, axis=1)[:, -1]
+        return np.where(has_pass, totals, 0.0)
+
+    def score(self, tested: np.ndarray, passed: np.ndarray, actual_ages: np.ndarray) -> Dict[str, np.ndarray]:
+        """计算各能区智龄、总分、平均智龄与发育商"""
+        area_scores = {area: self.area_mental_ages(tested, passed, area) for area in AREAS}
+        total_score = np.zeros(len(tested), dtype=np.float64)
+        for area in AREAS:
+            total_score = total_score + area_scores[area]
+        mental_age = total_score / 5.0
+        actual_ages = np.asarray(actual_ages, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dq = np.where(actual_ages == 0, 0.0, mental_age / actual_ages * 100)
+        return {
+            'areaScores': area_scores,
+            'totalScore': total_score,
+            'averageScore': mental_age,
+            'dq': dq,
+        }
+
+    def score_sessions(self, sessions: Sequence[Mapping[int, bool]], actual_ages: Sequence[float]) -> List[Dict[str, Any]]:
+        """对一批测评评分，返回与 reference.score_session 相同结构的结果列表"""
+        tested, passed = self.model.encode(sessions)
+        result = self.score(tested, passed, np.asarray(actual_ages, dtype=np.float64))
+        return [
+            {
+                'areaScores': {area: float(result['areaScores'][area][row]) for area in AREAS},
+                'totalScore': float(result['totalScore'][row]),
+                'averageScore': float(result['averageScore'][row]),
+                'dq': float(result['dq'][row]),
+            }
+            for row in range(len(sessions))
+        ]
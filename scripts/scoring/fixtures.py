@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+评分一致性用例（与 Flutter 端 test/scoring_parity_test.dart 共用）
+
+用例文件结构：
+{
+  "dataFile": "child_development_assessment/assets/data/assessment_data.json",  // 相对仓库根目录
+  "sessions": [
+    {
+      "name": "用例说明",
+      "actualAge": 10.0,
+      "testResults": {"91": true, "92": false},
+      "expected": {
+        "mainAge": 10,
+        "areas": {"motor": {"mentalAge": 9.0, "forwardAges": [8, 7], "backwardAges": [11, 12]}, ...},
+        "totalScore": 45.0, "averageScore": 9.0, "dq": 90.0
+      }
+    }
+  ]
+}
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Mapping
+
+from .engine import ScoringEngine, ScoringModel
+from .reference import AREAS, AllData, determine_main_test_age, score_session, test_area
+
+# 浮点比较容差（引擎按相同顺序累加，正常情况下结果逐位相同）
+TOLERANCE = 1e-9
+
+def load_fixtures(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_test_results(raw: Mapping[Any, Any]) -> Dict[int, bool]:
+    """JSON 中的对象键为字符串，转为 {int: bool}"""
+    return {int(item_id): bool(value) for item_id, value in raw.items()}
+
+def compute_expectations(all_data: AllData, session: Mapping[str, Any]) -> Dict[str, Any]:
+    """用逐行移植的参考实现计算一个用例的期望结果"""
+    test_results = parse_test_results(session['testResults'])
+    actual_age = float(session['actualAge'])
+    main_age = determine_main_test_age(actual_age)
+    final = score_session(all_data, test_results, actual_age)
+
+    areas = {}
+    for area in AREAS:
+        area_result = test_area(all_data, main_age, area, test_results)
+        areas[area] = {
+            'mentalAge': final['areaScores'][area],
+            'forwardAges': area_result['forwardAges'],
+            'backwardAges': area_result['backwardAges'],
+        }
+
+    return {
+        'mainAge': main_age,
+        'areas': areas,
+        'totalScore': final['totalScore'],
+        'averageScore': final['averageScore'],
+        'dq': final['dq'],
+    }
+
+def update_fixture_expectations(all_data: AllData, fixtures: Dict[str, Any]) -> Dict[str, Any]:
+    """按参考实现重写全部用例的期望结果（修改评分规则后使用，并需通过 Dart 端用例确认）"""
+    for session in fixtures['sessions']:
+        session['expected'] = compute_expectations(all_data, session)
+    return fixtures
+
+def _close(actual: float, expected: float) -> bool:
+    return math.isclose(actual, expected, rel_tol=0.0, abs_tol=TOLERANCE)
+
+def check_fixtures(all_data: AllData, fixtures: Dict[str, Any]) -> List[str]:
+    """分别用参考实现与批量引擎核对用例，返回不一致的描述列表"""
+    problems: List[str] = []
+    sessions = fixtures['sessions']
+
+    engine = ScoringEngine(ScoringModel(all_data))
+    batch = engine.score_sessions(
+        [parse_test_results(session['testResults']) for session in sessions],
+        [float(session['actualAge']) for session in sessions],
+    )
+
+    for session, batch_result in zip(sessions, batch):
+        name = session.get('name', '')
+        expected = session['expected']
+        reference = compute_expectations(all_data, session)
+
+        if reference['mainAge'] != expected['mainAge']:
+            problems.append(f"{name}: mainAge 参考实现为 {reference['mainAge']}，期望 {expected['mainAge']}")
+        for area in AREAS:
+            expected_area = expected['areas'][area]
+            for key in ('forwardAges', 'backwardAges'):
+                if reference['areas'][area][key] != expected_area[key]:
+                    problems.append(f"{name}: {area}.{key} 参考实现为 {reference['areas'][area][key]}，期望 {expected_area[key]}")
+            for label, value in (('参考实现', reference['areas'][area]['mentalAge']), ('批量引擎', batch_result['areaScores'][area])):
+                if not _close(value, expected_area['mentalAge']):
+                    problems.append(f"{name}: {area} 智龄{label}为 {value}，期望 {expected_area['mentalAge']}")
+
+        for key in ('totalScore', 'averageScore', 'dq'):
+            for label, value in (('参考实现', reference[key]), ('批量引擎', batch_result[key])):
+                if not _close(value, expected[key]):
+                    problems.append(f"{name}: {key} {label}为 {value}，期望 {expected[key]}")
+
+    return problems
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+AssessmentService 的逐行移植（标量实现）
+与 lib/services/assessment_service.dart 保持一一对应，作为批量评分引擎的对照基准。
+allData 为 assessment_data.json 解析后的列表，testResults 为 {项目编号: 是否通过}。
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Mapping
+
+AGE_GROUPS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 15, 18, 21, 24, 27, 30, 33, 36, 42, 48, 54, 60, 66, 72, 78, 84]
+
+# 与 AssessmentService._areas 相同；也是 TestArea 枚举顺序（总分按此顺序累加）
+AREAS = ['motor', 'fineMotor', 'language', 'adaptive', 'social']
+
+AllData = List[Dict[str, Any]]
+TestResults = Mapping[int, bool]
+
+def determine_main_test_age(actual_age: float) -> int:
+    """确定主测月龄"""
+    main_test_age = AGE_GROUPS[0]
+    min_diff = abs(actual_age - AGE_GROUPS[0])
+    for age in AGE_GROUPS:
+        diff = abs(actual_age - age)
+        if diff < min_diff:
+            min_diff = diff
+            main_test_age = age
+    return main_test_age
+
+def get_next_ages(current_age: int, count: int) -> List[int]:
+    ages = []
+    for _ in range(count):
+        if current_age not in AGE_GROUPS or AGE_GROUPS.index(current_age) >= len(AGE_GROUPS) - 1:
+            break
+        current_age = AGE_GROUPS[AGE_GROUPS.index(current_age) + 1]
+        ages.append(current_age)
+    return ages
+
+def get_previous_ages(current_age: int, count: int) -> List[int]:
+    ages = []
+    for _ in range(count):
+        if current_age not in AGE_GROUPS or AGE_GROUPS.index(current_age) <= 0:
+            break
+        current_age = AGE_GROUPS[AGE_GROUPS.index(current_age) - 1]
+        ages.append(current_age)
+    return ages
+
+def get_area_items(all_data: AllData, age: int, area: str) -> List[Dict[str, Any]]:
+    """获取指定月龄和能区的测试项目"""
+    return [item for data in all_data if data['ageMonth'] == age and data['area'] == area for item in data['testItems']]
+
+def _is_all_passed(age: int, area: str, test_results: TestResults, all_data: AllData) -> bool:
+    for item in get_area_items(all_data, age, area):
+        if not test_results.get(item['id'], False):
+            return False
+    return True
+
+def _has_passed(age: int, area: str, test_results: TestResults, all_data: AllData) -> bool:
+    return any(test_results.get(item['id']) is True for item in get_area_items(all_data, age, area))
+
+def get_forward_test_ages_for_area(main_age: int, tested_ages: List[int], area: str,
+                                   test_results: TestResults, all_data: AllData) -> List[int]:
+    """向前测查：连续 2 个月龄的项目均通过则结束"""
+    tested_forward_ages = sorted(age for age in tested_ages if age < main_age)
+    if len(tested_forward_ages) == 0:
+        return get_previous_ages(main_age, 2)
+    if len(tested_forward_ages) == 1:
+        if not _is_all_passed(tested_forward_ages[0], area, test_results, all_data):
+            return get_previous_ages(tested_forward_ages[0], 2)
+        return get_previous_ages(tested_forward_ages[0], 1)
+    if not _is_all_passed(tested_forward_ages[0], area, test_results, all_data):
+        return get_previous_ages(tested_forward_ages[0], 2)
+    if not _is_all_passed(tested_forward_ages[1], area, test_results, all_data):
+        return get_previous_ages(tested_forward_ages[0], 1)
+    return []
+
+def get_backward_test_ages_for_area(main_age: int, tested_ages: List[int], area: str,
+                                    test_results: TestResults, all_data: AllData) -> List[int]:
+    """向后测查：连续 2 个月龄的项目均不通过则结束"""
+    tested_backward_ages = sorted(age for age in tested_ages if age > main_age)
+    if len(tested_backward_ages) == 0:
+        return get_next_ages(main_age, 2)
+    if len(tested_backward_ages) == 1:
+        if _has_passed(tested_backward_ages[-1], area, test_results, all_data):
+            return get_next_ages(tested_backward_ages[-1], 2)
+        return get_next_ages(tested_backward_ages[-1], 1)
+    if _has_passed(tested_backward_ages[-1], area, test_results, all_data):
+        return get_next_ages(tested_backward_ages[-1], 2)
+    if _has_passed(tested_backward_ages[-2], area, test_results, all_data):
+        return get_next_ages(tested_backward_ages[-1], 1)
+    return []
+
+def get_item_age(item_id: int, all_data: AllData) -> int:
+    """获取项目的月龄（找不到时与 Dart 一样返回 1）"""
+    for data in all_data:
+        for item in data['testItems']:
+            if item['id'] == item_id:
+                return data['ageMonth']
+    return 1
+
+def get_tested_ages(test_results: TestResults, all_data: AllData) -> List[int]:
+    return list(dict.fromkeys(get_item_age(item_id, all_data) for item_id in test_results))
+
+def get_area_score_for_age(age: int) -> float:
+    """能区在指定月龄的分数（超出范围时与 Dart 一样返回 1.0）"""
+    if 1 <= age <= 12:
+        return 1.0
+    elif 15 <= age <= 36:
+        return 3.0
+    elif 42 <= age <= 84:
+        return 6.0
+    return 1.0
+
+def get_item_score(age: int, item_count: int) -> float:
+    if item_count == 0:
+        return 0.0
+    return get_area_score_for_age(age) / item_count
+
+def get_item_score_by_id(item_id: int, all_data: AllData) -> float:
+    for data in all_data:
+        for item in data['testItems']:
+            if item['id'] == item_id:
+                return get_item_score(data['ageMonth'], len(data['testItems']))
+    return 0.0
+
+def get_all_area_item_ids(area: str, all_data: AllData) -> List[int]:
+    return [item['id'] for data in all_data if data['area'] == area for item in data['testItems']]
+
+def calculate_area_mental_age(area: str, area_test_results: TestResults, all_data: AllData) -> float:
+    """计算能区智龄：首个通过项目之前未测的项目默认通过，之后只累加通过的项目"""
+    item_ids = sorted(get_all_area_item_ids(area, all_data))
+    score = 0.0
+    accumulated_score = 0.0
+    for item_id in item_ids:
+        if item_id not in area_test_results:
+            if score == 0:
+                accumulated_score += get_item_score_by_id(item_id, all_data)
+            continue
+        if area_test_results[item_id]:
+            if score == 0:
+                score = accumulated_score
+            score += get_item_score_by_id(item_id, all_data)
+    return score
+
+def calculate_development_quotient(mental_age: float, actual_age: float) -> float:
+    """计算发育商"""
+    if actual_age == 0:
+        return 0.0
+    return (mental_age / actual_age) * 100
+
+def calculate_total_mental_age(area_results: Mapping[str, float]) -> float:
+    """总体智龄：各能区平均后保留一位小数（与 Dart toStringAsFixed(1) 相同的四舍五入）"""
+    if not area_results:
+        return 0.0
+    total = 0.0
+    for value in area_results.values():
+        total += value
+    average = total / len(area_results)
+    return float(Decimal(average).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
+
+def test_area(all_data: AllData, main_age: int, area: str, test_results: TestResults) -> Dict[str, Any]:
+    """按能区汇总主测、向前、向后月龄的结果并计算智龄（对应 testArea）"""
+    area_test_results: Dict[int, bool] = {}
+    for item in get_area_items(all_data, main_age, area):
+        if item['id'] in test_results:
+            area_test_results[item['id']] = test_results[item['id']]
+
+    tested_ages = get_tested_ages(test_results, all_data)
+    forward_ages = get_forward_test_ages_for_area(main_age, tested_ages, area, test_results, all_data)
+    backward_ages = get_backward_test_ages_for_area(main_age, tested_ages, area, test_results, all_data)
+    for age in forward_ages + backward_ages:
+        for item in get_area_items(all_data, age, area):
+            if item['id'] in test_results:
+                area_test_results[item['id']] = test_results[item['id']]
+
+    return {
+        'area': area,
+        'mainAge': main_age,
+        'forwardAges': forward_ages,
+        'backwardAges': backward_ages,
+        'testResults': area_test_results,
+        'mentalAge': calculate_area_mental_age(area, area_test_results, all_data),
+    }
+
+def score_session(all_data: AllData, test_results: TestResults, actual_age: float) -> Dict[str, Any]:
+    """按 AssessmentProvider._generateFinalResult 的方式计算一次测评的最终结果"""
+    area_scores = {area: calculate_area_mental_age(area, test_results, all_data) for area in AREAS}
+    total_score = 0.0
+    for area in AREAS:
+        total_score += area_scores[area]
+    mental_age = total_score / 5.0
+    return {
+        'areaScores': area_scores,
+        'totalScore': total_score,
+        'averageScore': mental_age,
+        'dq': calculate_development_quotient(mental_age, actual_age),
+    }
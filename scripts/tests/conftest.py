@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/ 下各脚本的单元测试（在仓库根目录执行 python -m pytest -q scripts/tests）
+
+脚本之间以同目录模块的方式互相导入，这里把 scripts/ 加入 sys.path；
+默认工作簿等相对路径以仓库根目录为基准，用 REPO_ROOT 拼接为绝对路径。
+需要真实字体的测试可用环境变量 TEST_FONT 指定字体文件，找不到可用字体时跳过。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+@pytest.fixture(scope='session')
+def workbooks():
+    """默认的 (表A.1, 表B.1) 工作簿绝对路径"""
+    from generate_assessment_data import OPERATION_WORKBOOK, SCALE_WORKBOOK
+    return str(REPO_ROOT / SCALE_WORKBOOK), str(REPO_ROOT / OPERATION_WORKBOOK)
+
+@pytest.fixture(scope='session')
+def assessment_data(workbooks):
+    """由默认工作簿生成的评估数据（各测试只读，不写出文件）"""
+    from generate_assessment_data import generate_assessment_data, parse_excel_data
+    return generate_assessment_data(frames=parse_excel_data(*workbooks))
+
+# 依次尝试的字体：TEST_FONT、随仓库附带的字体、常见的系统字体
+_FONT_CANDIDATES = [
+    SCRIPTS_DIR / 'fonts' / 'NotoSansSC-Regular.ttf',
+    Path('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'),
+    Path('/usr/share/fonts/dejavu/DejaVuSans.ttf'),
+    Path('/System/Library/Fonts/Supplemental/Arial.ttf'),
+    Path('C:/Windows/Fonts/arial.ttf'),
+]
+
+@pytest.fixture(scope='session')
+def truetype_font():
+    """可被 FreeType 加载的字体文件路径"""
+    from PIL import ImageFont
+    candidates = [Path(os.environ['TEST_FONT'])] if os.environ.get('TEST_FONT') else []
+    for path in candidates + _FONT_CANDIDATES:
+        try:
+            ImageFont.truetype(str(path), 16)
+        except OSError:
+            continue
+        return path
+    pytest.skip("没有可用的 TrueType 字体，可用 TEST_FONT 指定")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""预计算索引与分组数据一致：以 scoring/reference.py（AssessmentService 的逐行移植）为对照"""
+
+import copy
+import json
+import math
+
+from assessment_index import build_assessment_index, check_assessment_index, write_assessment_index
+from bench.synthetic import assessment_bundle
+from scoring import reference
+
+def load_index(tmp_path, assessment_data):
+    """按 App 加载的方式经 JSON 读回（键为字符串）"""
+    path = tmp_path / 'assessment_index.json'
+    write_assessment_index(build_assessment_index(assessment_data), str(path))
+    return json.loads(path.read_text(encoding='utf-8'))
+
+def test_items_map_to_age_area_and_score(tmp_path, assessment_data):
+    index = load_index(tmp_path, assessment_data)
+    ids = {item['id'] for group in assessment_data for item in group['testItems']}
+    assert set(index['items']) == {str(item_id) for item_id in ids}
+    for group_idx, group in enumerate(assessment_data):
+        for item in group['testItems']:
+            entry = index['items'][str(item['id'])]
+            assert entry['ageMonth'] == reference.get_item_age(item['id'], assessment_data) == group['ageMonth']
+            assert entry['area'] == group['area']
+            assert math.isclose(entry['score'], reference.get_item_score_by_id(item['id'], assessment_data))
+            assert entry['group'] == group_idx
+
+def test_cumulative_area_scores(tmp_path, assessment_data):
+    index = load_index(tmp_path, assessment_data)
+    assert set(index['areaItems']) == set(reference.AREAS)
+    for area in reference.AREAS:
+        entry = index['areaItems'][area]
+        expected_ids = sorted(reference.get_all_area_item_ids(area, assessment_data))
+        assert entry['ids'] == expected_ids
+        total = 0.0
+        for item_id, cumulative in zip(expected_ids, entry['cumulativeScores'], strict=True):
+            total += reference.get_item_score_by_id(item_id, assessment_data)
+            assert math.isclose(cumulative, total, abs_tol=1e-9)
+        # 全部通过时的能区智龄即累计分值的最后一项
+        all_passed = {item_id: True for item_id in expected_ids}
+        assert math.isclose(entry['cumulativeScores'][-1],
+                            reference.calculate_area_mental_age(area, all_passed, assessment_data), abs_tol=1e-9)
+
+def test_previous_and_next_links(tmp_path, assessment_data):
+    index = load_index(tmp_path, assessment_data)
+    for area in reference.AREAS:
+        present = {group['ageMonth'] for group in assessment_data if group['area'] == area}
+        ages = [age for age in reference.AGE_GROUPS if age in present]
+        links = index['ageLinks'][area]
+        assert set(links) == {str(age) for age in ages}
+        for idx, age in enumerate(ages):
+            assert links[str(age)]['previous'] == (ages[idx - 1] if idx > 0 else None)
+            assert links[str(age)]['next'] == (ages[idx + 1] if idx + 1 < len(ages) else None)
+
+def test_links_skip_missing_groups():
+    # 去掉 motor 能区 3 月龄的分组，前后链接应跨过该月龄
+    bundle = [group for group in assessment_bundle(1) if (group['ageMonth'], group['area']) != (3, 'motor')]
+    links = build_assessment_index(bundle)['ageLinks']['motor']
+    assert '3' not in links
+    assert links['2']['next'] == 4 and links['4']['previous'] == 2
+    assert links['1']['previous'] is None and links['84']['next'] is None
+
+def test_check_accepts_fresh_index_and_detects_tampering(tmp_path, assessment_data):
+    index = load_index(tmp_path, assessment_data)
+    assert check_assessment_index(assessment_data, index) == []
+
+    tampered = copy.deepcopy(index)
+    first_id = str(assessment_data[0]['testItems'][0]['id'])
+    tampered['items'][first_id]['score'] += 1
+    assert check_assessment_index(assessment_data, tampered)
+
+    tampered = copy.deepcopy(index)
+    tampered['areaItems']['motor']['cumulativeScores'][3] += 0.5
+    assert check_assessment_index(assessment_data, tampered)
+
+    tampered = copy.deepcopy(index)
+    tampered['ageLinks']['motor']['2']['next'] = 5
+    assert check_assessment_index(assessment_data, tampered)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""增量构建缓存的构建键"""
+
+from build_cache import BuildCache
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_same_file_name_in_different_directories(tmp_path):
+    scale = write(tmp_path / 'north' / 'workbook.xlsx', 'scale')
+    operation = write(tmp_path / 'south' / 'workbook.xlsx', 'operation')
+    key = BuildCache(str(tmp_path / 'cache')).build_key([scale, operation], {})
+
+    # 任一输入变化都应改变构建键
+    write(tmp_path / 'north' / 'workbook.xlsx', 'scale v2')
+    assert BuildCache(str(tmp_path / 'cache')).build_key([scale, operation], {}) != key
+    write(tmp_path / 'north' / 'workbook.xlsx', 'scale')
+    write(tmp_path / 'south' / 'workbook.xlsx', 'operation v2')
+    assert BuildCache(str(tmp_path / 'cache')).build_key([scale, operation], {}) != key
+
+def test_key_depends_on_input_order_and_params(tmp_path):
+    first = write(tmp_path / 'a.xlsx', 'a')
+    second = write(tmp_path / 'b.xlsx', 'b')
+    cache = BuildCache(str(tmp_path / 'cache'))
+    key = cache.build_key([first, second], {'mode': 'vectorized'})
+    assert cache.build_key([second, first], {'mode': 'vectorized'}) != key
+    assert cache.build_key([first, second], {'mode': 'reference'}) != key
+
+def test_moved_input_keeps_key(tmp_path):
+    original = write(tmp_path / 'a' / 'scale.xlsx', 'same')
+    moved = write(tmp_path / 'b' / 'renamed.xlsx', 'same')
+    cache = BuildCache(str(tmp_path / 'cache'))
+    assert cache.build_key([original], {}) == cache.build_key([moved], {})
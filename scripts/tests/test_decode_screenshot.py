@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""截图缩小解码与 --max-decode-megapixels 上限"""
+
+import pytest
+from PIL import Image
+
+from generate_appstore_screenshots import decode_screenshot
+
+def _save(tmp_path, name, size=(800, 1600)):
+    path = tmp_path / name
+    Image.new('RGB', size, (10, 120, 200)).save(path)
+    return path
+
+def test_jpeg_is_reduced_while_decoding(tmp_path):
+    path = _save(tmp_path, 'shot.jpg')
+    image, source_size = decode_screenshot(path, bound=(100, 200), max_pixels=100_000)
+    assert source_size == (800, 1600)
+    assert image.width * image.height <= 100_000 and image.width >= 100
+
+def test_png_above_limit_is_refused(tmp_path):
+    path = _save(tmp_path, 'shot.png')
+    with pytest.raises(ValueError, match='PNG'):
+        decode_screenshot(path, bound=(100, 200), max_pixels=100_000)
+
+def test_png_within_limit_or_without_limit_is_decoded(tmp_path):
+    path = _save(tmp_path, 'shot.png')
+    image, _ = decode_screenshot(path, bound=(100, 200), max_pixels=2_000_000)
+    assert image.size == (200, 400)
+    image, _ = decode_screenshot(path, bound=(100, 200))
+    assert image.size == (200, 400)
+    # 最终显示尺寸本身超过上限时按显示尺寸解码，不拒绝
+    image, _ = decode_screenshot(path, bound=(800, 1600), max_pixels=100_000)
+    assert image.size == (800, 1600)
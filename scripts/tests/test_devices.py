@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""多设备输出：devices 配置解析与按设备缩放样式"""
+
+import pytest
+
+from generate_appstore_screenshots import Device, build_style, parse_devices, scale_style, scaled_font_size
+
+def test_parse_devices():
+    assert parse_devices(None) == []
+    assert parse_devices([{"Name": "iphone-6.9", "width": "1320", "HEIGHT": 2868}, {"name": "ipad", "width": 2048, "height": 2732}]) == [
+        Device("iphone-6.9", 1320, 2868),
+        Device("ipad", 2048, 2732),
+    ]
+
+@pytest.mark.parametrize("value, message", [
+    ({"name": "a"}, "devices 必须为数组"),
+    ([{"name": "a", "width": 100}], "devices[0] 需要 name、width、height 字段"),
+    ([{"name": "a", "width": 100, "height": 200}, {"name": "a", "width": 1, "height": 2}], "devices[1] 名称重复: a"),
+])
+def test_parse_devices_rejects_invalid(value, message):
+    with pytest.raises(SystemExit) as excinfo:
+        parse_devices(value)
+    assert str(excinfo.value) == message
+
+def test_scale_style_floors_font_sizes():
+    style = build_style({})
+    assert (style.width, style.height, style.title_font_size) == (1242, 2688, 76)
+    scaled = scale_style(style, Device("iphone-6.9", 1320, 2868))
+    scale = 1320 / 1242
+    assert scaled.layout_scale == pytest.approx(scale)
+    assert (scaled.width, scaled.height) == (1320, 2868)
+    # 76 × 1.0628 = 80.77：四舍五入为 81 会比按比例缩放的字号更宽
+    assert scaled.title_font_size == 80
+    for field in ("title_font_size", "subtitle_font_size", "title_min_font_size", "subtitle_min_font_size"):
+        assert getattr(scaled, field) <= getattr(style, field) * scale
+    # 间距仍按四舍五入缩放
+    assert scaled.padding == round(style.padding * scale)
+
+def test_scaled_font_size():
+    assert scaled_font_size(76, 1320 / 1242) == 80
+    assert scaled_font_size(42, 0.5) == 21
+    # 恰好整除时不因浮点误差少 1
+    assert scaled_font_size(100, 0.29) == 29
+    assert scaled_font_size(3, 0.1) == 1
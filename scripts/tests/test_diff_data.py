@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""diff_data.py：按 (月龄, 能区, 编号) 比较两个版本的评估数据"""
+
+import json
+import sys
+
+import pytest
+
+import diff_data
+from diff_data import GroupDiff, diff_files
+from validate_data import SCORE_TOLERANCE
+
+def _item(item_id, area, **fields):
+    item = {'id': item_id, 'name': f'项目{item_id}', 'desc': '', 'operation': '操作', 'passCondition': '通过',
+            'score': 0.5, 'area': area}
+    item.update(fields)
+    return item
+
+def _group(age, area, items, score=1.0):
+    return {'ageMonth': age, 'area': area, 'score': score, 'testItems': items}
+
+def _write(tmp_path, name, groups):
+    path = tmp_path / name
+    path.write_text(json.dumps(groups, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+OLD = [
+    _group(1, 'motor', [_item(1, 'motor'), _item(2, 'motor')]),
+    _group(1, 'social', [_item(3, 'social')]),
+    _group(2, 'motor', [_item(4, 'motor', desc='旧说明')]),
+]
+NEW = [
+    # 1：分值在容差以内；2：删除；5：新增
+    _group(1, 'motor', [_item(1, 'motor', score=0.5 + SCORE_TOLERANCE / 10), _item(5, 'motor')]),
+    _group(1, 'social', [_item(3, 'social', name='新名称')]),
+    _group(2, 'motor', []),
+    # 4：移到 social 能区，area 字段随之更新，说明也有修改
+    _group(2, 'social', [_item(4, 'social', desc='新说明')]),
+]
+
+@pytest.fixture
+def files(tmp_path):
+    return _write(tmp_path, 'old.json', OLD), _write(tmp_path, 'new.json', NEW)
+
+def test_diff_classifies_items(files):
+    diff = diff_files(*files)
+    assert [item.item_id for item in diff.added] == [5]
+    assert [item.item_id for item in diff.removed] == [2]
+    assert [(item.item_id, item.fields) for item in diff.changed] == [(3, {'name': ('项目3', '新名称')})]
+    # 移动时与分组能区一致的 area 字段不算作变化
+    assert [(item.item_id, item.old.group, item.new.group, item.fields) for item in diff.moved] == [
+        (4, (2, 'motor'), (2, 'social'), {'desc': ('旧说明', '新说明')}),
+    ]
+    assert diff.groups == [GroupDiff((2, 'social'), 'added', new_score=1.0)]
+    assert diff.field_counts() == {'name': 1, 'desc': 1}
+
+def test_area_field_change_is_reported_unless_it_follows_the_group(tmp_path):
+    old = _write(tmp_path, 'old.json', [_group(1, 'motor', [_item(1, 'motor'), _item(2, 'motor'), _item(3, 'motor')])])
+    new = _write(tmp_path, 'new.json', [
+        _group(1, 'motor', [_item(1, 'social')]),
+        # 2：移动后 area 字段未更新，字段本身没有变化；3：移动后 area 与所在分组不一致
+        _group(1, 'social', [_item(2, 'motor'), _item(3, 'language')]),
+    ])
+    diff = diff_files(old, new)
+    assert [(item.item_id, item.fields) for item in diff.changed] == [(1, {'area': ('motor', 'social')})]
+    assert [(item.item_id, item.fields) for item in diff.moved] == [(2, {}), (3, {'area': ('motor', 'language')})]
+
+def test_score_change_beyond_tolerance(tmp_path):
+    old = _write(tmp_path, 'old.json', [_group(1, 'motor', [_item(1, 'motor')])])
+    new = _write(tmp_path, 'new.json', [_group(1, 'motor', [_item(1, 'motor', score=0.5 + SCORE_TOLERANCE * 10)], score=2.0)])
+    diff = diff_files(old, new)
+    assert [item.fields for item in diff.changed] == [{'score': (0.5, 0.5 + SCORE_TOLERANCE * 10)}]
+    assert diff.groups == [GroupDiff((1, 'motor'), 'changed', 1.0, 2.0)]
+
+def test_repeated_id_moves_pair_in_file_order(tmp_path):
+    old = _write(tmp_path, 'old.json', [_group(1, 'motor', [_item(7, 'motor', desc='a')]),
+                                        _group(2, 'motor', [_item(7, 'motor', desc='b')])])
+    new = _write(tmp_path, 'new.json', [_group(1, 'social', [_item(7, 'social', desc='a')]),
+                                        _group(2, 'social', [_item(7, 'social', desc='b')])])
+    diff = diff_files(old, new)
+    assert [(item.old.group, item.new.group, item.fields) for item in diff.moved] == [
+        ((1, 'motor'), (1, 'social'), {}),
+        ((2, 'motor'), (2, 'social'), {}),
+    ]
+    assert not diff.added and not diff.removed
+
+def test_duplicate_group_and_item_warnings(tmp_path):
+    path = _write(tmp_path, 'dup.json', [
+        _group(1, 'motor', [_item(1, 'motor'), _item(1, 'motor', name='重复')]),
+        _group(1, 'motor', [_item(2, 'motor')]),
+    ])
+    index = diff_data.index_data(path)
+    assert index.warnings == [
+        f"{path}: /0/testItems/1 项目编号 1 在同一分组中重复，只比较第一次出现的项目",
+        f"{path}: /1 月龄 1 能区 motor 的分组重复出现，已合并",
+    ]
+    assert index.items[(1, 'motor', 1)].item['name'] == '项目1'
+    assert set(index.items) == {(1, 'motor', 1), (1, 'motor', 2)}
+
+def _main(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['diff_data.py', *args])
+    with pytest.raises(SystemExit) as excinfo:
+        diff_data.main()
+    captured = capsys.readouterr()
+    return excinfo.value.code, captured.out, captured.err
+
+def test_exit_codes(tmp_path, files, monkeypatch, capsys):
+    old, new = files
+    code, out, _ = _main(monkeypatch, capsys, old, old)
+    assert code == 0 and '两个文件的内容一致' in out
+    code, out, _ = _main(monkeypatch, capsys, old, new)
+    assert code == 1 and '新增 1 项，删除 1 项，移动 1 项，内容变化 1 项，分组变化 1 处' in out
+
+    code, _, err = _main(monkeypatch, capsys, old, str(tmp_path / 'missing.json'))
+    assert code == 2 and '无法读取' in err
+    broken = _write(tmp_path, 'broken.json', [{'ageMonth': 1, 'area': 'motor', 'testItems': []}])
+    code, _, err = _main(monkeypatch, capsys, old, broken)
+    assert code == 2 and 'validate_data.py' in err
+
+def test_json_report(files, monkeypatch, capsys):
+    old, new = files
+    code, out, _ = _main(monkeypatch, capsys, old, new, '--format', 'json')
+    report = json.loads(out)
+    assert code == 1
+    assert report['old'] == {'file': old, 'groups': 3, 'items': 4}
+    assert report['new'] == {'file': new, 'groups': 4, 'items': 4}
+    assert report['summary'] == {'added': 1, 'removed': 1, 'moved': 1, 'changed': 1, 'groups': 1,
+                                 'fields': {'name': 1, 'desc': 1}}
+    assert report['groups'] == [{'ageMonth': 2, 'area': 'social', 'status': 'added', 'oldScore': None, 'newScore': 1.0}]
+    assert report['added'] == [{'id': 5, 'name': '项目5', 'new': {'ageMonth': 1, 'area': 'motor', 'path': '/0/testItems/1'}}]
+    assert report['removed'] == [{'id': 2, 'name': '项目2', 'old': {'ageMonth': 1, 'area': 'motor', 'path': '/0/testItems/1'}}]
+    assert report['moved'] == [{
+        'id': 4, 'name': '项目4',
+        'old': {'ageMonth': 2, 'area': 'motor', 'path': '/2/testItems/0'},
+        'new': {'ageMonth': 2, 'area': 'social', 'path': '/3/testItems/0'},
+        'fields': {'desc': {'old': '旧说明', 'new': '新说明'}},
+    }]
+    assert report['changed'][0]['fields'] == {'name': {'old': '项目3', 'new': '新名称'}}
+    assert report['warnings'] == []
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""release 后处理阶段的容错"""
+
+from PIL import Image
+
+from export_profiles import post_process
+
+def test_post_process_keeps_going_after_a_failure(tmp_path):
+    good = tmp_path / 'good.png'
+    Image.new('RGB', (64, 64), (200, 30, 30)).save(good, compress_level=1)
+    broken = tmp_path / 'broken.png'
+    broken.write_bytes(b'not a png')
+
+    stats = post_process([broken, good], jobs=1)
+    assert [path for path, *_ in stats] == [str(broken), str(good)]
+    assert stats[0][4] is not None and stats[1][4] is None
+    # 失败的文件保持原样，不留下临时文件
+    assert broken.read_bytes() == b'not a png'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['broken.png', 'good.png']
+    assert stats[1][2] <= stats[1][1]
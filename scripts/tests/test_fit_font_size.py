@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""auto_fit：按最大行数二分查找字号"""
+
+import logging
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+import generate_appstore_screenshots as screenshots
+from font_registry import default_registry
+from text_layout import default_engine
+
+TEXT = "The quick brown fox jumps over the lazy dog while the cat watches from the fence"
+WIDTH = 600
+
+@pytest.fixture(autouse=True)
+def font(monkeypatch, truetype_font):
+    monkeypatch.setattr(screenshots, "_load_noto_cjk_jp_medium", lambda size: default_registry.get(truetype_font, size))
+    return truetype_font
+
+def _wrap(font, text, size, width=WIDTH):
+    return default_engine.wrap(text, default_registry.get(font, size), width)
+
+def test_returns_largest_size_that_fits(font):
+    size, lines = screenshots.fit_font_size(TEXT, 120, 10, 2, WIDTH)
+    # 逐个字号检查：size 放得下，size + 1 放不下
+    fitting = [candidate for candidate in range(10, 121) if len(_wrap(font, TEXT, candidate)) <= 2]
+    assert size == max(fitting) and 10 < size < 120
+    assert len(_wrap(font, TEXT, size + 1)) > 2
+    assert lines == _wrap(font, TEXT, size) and len(lines) <= 2
+
+def test_keeps_size_when_text_already_fits(font):
+    assert screenshots.fit_font_size("Short", 76, 40, 1, WIDTH) == (76, ["Short"])
+    # min_font_size 不小于 font_size 时不缩小
+    size, lines = screenshots.fit_font_size(TEXT, 76, 76, 1, WIDTH)
+    assert size == 76 and lines == _wrap(font, TEXT, 76)
+
+def test_falls_back_to_min_font_size_with_warning(font, caplog):
+    with caplog.at_level(logging.WARNING):
+        size, lines = screenshots.fit_font_size(TEXT, 80, 40, 1, WIDTH)
+    assert size == 40 and lines == _wrap(font, TEXT, 40) and len(lines) > 1
+    assert "文案在最小字号 40 下仍超过 1 行" in caplog.text
+
+def _prepared(title, subtitle):
+    return screenshots.PreparedItem(
+        title=title, subtitle=subtitle, screenshot_path=Path("shot.png"),
+        screenshot=Image.new("RGB", (10, 20)), out_name="shot.png",
+    )
+
+def test_layout_text_shrinks_only_with_auto_fit(font):
+    cfg = {"width": 700, "padding": 16, "titleFontSize": 80, "subtitleFontSize": 40,
+           "subtitleIsHeadline": False, "titleMaxLines": 1, "subtitleMaxLines": 1}
+    prepared = _prepared(TEXT, TEXT)
+    style = screenshots.build_style(cfg)
+
+    # auto_fit 默认关闭：字号不变，行数不限
+    blocks = screenshots.layout_text(style, prepared)
+    assert [block.font_size for block in blocks] == [80, 40]
+    assert all(len(block.lines) > 1 for block in blocks)
+
+    # 居中对齐时文本宽度为 width × maxTextWidthRatio
+    max_width = int(700 * style.max_text_width_ratio)
+    subtitle = screenshots.fit_font_size(TEXT, 40, style.subtitle_min_font_size, 1, max_width)
+
+    # max_lines 为 0 时该段不限制行数，也不缩小字号
+    blocks = screenshots.layout_text(screenshots.build_style({**cfg, "autoFit": True, "titleMaxLines": 0}), prepared)
+    assert (blocks[0].font_size, blocks[0].lines) == (80, _wrap(font, TEXT, 80, max_width))
+    assert (blocks[1].font_size, blocks[1].lines) == subtitle
+
+    blocks = screenshots.layout_text(screenshots.build_style({**cfg, "autoFit": True}), prepared)
+    title = screenshots.fit_font_size(TEXT, 80, style.title_min_font_size, 1, max_width)
+    assert [(block.font_size, block.lines) for block in blocks] == [title, subtitle]
+    assert title[0] < 80 and subtitle[0] < 40
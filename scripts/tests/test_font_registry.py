@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""字体注册表的 LRU 缓存与字面扫描"""
+
+import pytest
+
+from font_registry import FontRegistry, collection_face_count
+
+def test_get_reuses_cached_font(truetype_font):
+    registry = FontRegistry(max_fonts=4)
+    font = registry.get(truetype_font, 32)
+    assert font.size == 32
+    assert registry.get(str(truetype_font), 32.0) is font
+    assert registry.get(truetype_font, 33) is not font
+
+def test_get_evicts_least_recently_used(truetype_font):
+    registry = FontRegistry(max_fonts=2)
+    small = registry.get(truetype_font, 20)
+    registry.get(truetype_font, 30)
+    assert registry.get(truetype_font, 20) is small  # 20 号变为最近使用
+    registry.get(truetype_font, 40)                   # 淘汰最久未用的 30 号
+    assert list(registry._fonts) == [(str(truetype_font), 20, 0), (str(truetype_font), 40, 0)]
+    assert registry.get(truetype_font, 20) is small
+    reloaded = registry.get(truetype_font, 30)
+    assert reloaded.size == 30 and len(registry._fonts) == 2
+
+def test_faces_and_get_face(truetype_font):
+    registry = FontRegistry()
+    assert collection_face_count(truetype_font) == 1
+    faces = registry.faces(truetype_font)
+    (family, style), index = next(iter(faces.items()))
+    assert index == 0
+    assert registry.get_face(truetype_font, 24, family, style) is registry.get(truetype_font, 24)
+    with pytest.raises(LookupError):
+        registry.get_face(truetype_font, 24, family, 'No Such Style')
+
+def test_is_effective(truetype_font):
+    registry = FontRegistry()
+    assert registry.is_effective(registry.get(truetype_font, 48), 48)
+    registry.clear()
+    assert not registry._fonts and not registry._faces
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""gradients.py 的线性 / 径向渐变与截图配置中的色标解析"""
+
+import math
+from dataclasses import replace
+
+import numpy as np
+from PIL import Image
+
+from generate_appstore_screenshots import build_style, parse_gradient_stops, static_background
+from gradients import (
+    clear_gradient_cache,
+    interpolate_stops,
+    linear_gradient,
+    lookup_stops,
+    normalize_stops,
+    radial_gradient,
+)
+
+RED = (255, 0, 0, 255)
+GREEN = (0, 255, 0, 128)
+BLUE = (0, 0, 255, 0)
+STOPS = normalize_stops([(0.0, RED), (0.25, GREEN), (1.0, BLUE)])
+SIZE = (37, 23)
+
+def _pixels(image):
+    return np.asarray(image).astype(np.int16)
+
+def _direct_linear(size, stops, angle):
+    """逐像素按 CSS 约定计算位置后直接插值（渐变线过中心，四角落在 0 与 1 上）"""
+    width, height = size
+    dx, dy = math.sin(math.radians(angle)), -math.cos(math.radians(angle))
+    length = abs((width - 1) * dx) + abs((height - 1) * dy)
+    positions = np.array([
+        [((x - (width - 1) / 2) * dx + (y - (height - 1) / 2) * dy) / length + 0.5 for x in range(width)]
+        for y in range(height)
+    ])
+    return interpolate_stops(positions, stops).astype(np.int16)
+
+def test_interpolate_stops_multi_stop():
+    colors = interpolate_stops(np.array([0.0, 0.125, 0.25, 0.625, 1.0, 1.5]), STOPS)
+    assert colors.tolist() == [
+        list(RED),
+        [127, 127, 0, 191],
+        list(GREEN),
+        [0, 127, 127, 64],
+        list(BLUE),
+        list(BLUE),
+    ]
+    assert interpolate_stops(np.array([0.2, 0.9]), normalize_stops([(0.5, RED)])).tolist() == [list(RED)] * 2
+
+def test_axis_aligned_linear_gradient_matches_direct_evaluation():
+    width, height = SIZE
+    rows = np.arange(height)[:, np.newaxis] / (height - 1) + np.zeros((1, width))
+    columns = np.arange(width)[np.newaxis, :] / (width - 1) + np.zeros((height, 1))
+    clear_gradient_cache()
+    for angle, positions in ((180, rows), (0, 1.0 - rows), (90, columns), (270, 1.0 - columns)):
+        expected = interpolate_stops(positions, STOPS)
+        assert np.array_equal(np.asarray(linear_gradient(SIZE, STOPS, angle)), expected)
+        # 投影公式与逐行位置只差浮点误差
+        assert np.abs(_direct_linear(SIZE, STOPS, angle) - expected).max() <= 1
+
+def test_linear_gradient_follows_css_angles():
+    pixels = _pixels(linear_gradient(SIZE, STOPS, 180))
+    assert tuple(pixels[0, 0]) == RED and tuple(pixels[-1, -1]) == BLUE
+    pixels = _pixels(linear_gradient(SIZE, STOPS, 0))
+    assert tuple(pixels[-1, 0]) == RED and tuple(pixels[0, 0]) == BLUE
+    pixels = _pixels(linear_gradient(SIZE, STOPS, 90))
+    assert tuple(pixels[0, 0]) == RED and tuple(pixels[0, -1]) == BLUE
+    pixels = _pixels(linear_gradient(SIZE, STOPS, 270))
+    assert tuple(pixels[0, -1]) == RED and tuple(pixels[0, 0]) == BLUE
+
+def test_diagonal_linear_gradient_uses_lookup_table():
+    # 斜向渐变经查找表取色，与直接插值最多相差 1 个色阶
+    for angle in (45, 135, 200):
+        gradient = _pixels(linear_gradient(SIZE, STOPS, angle))
+        assert np.abs(gradient - _direct_linear(SIZE, STOPS, angle)).max() <= 1
+    gradient = _pixels(linear_gradient(SIZE, STOPS, 45))
+    assert tuple(gradient[-1, 0]) == RED and tuple(gradient[0, -1]) == BLUE
+
+def test_lookup_stops_close_to_interpolate_stops():
+    positions = np.random.default_rng(0).random((50, 40)) * 1.2 - 0.1
+    looked_up = lookup_stops(positions, STOPS).astype(np.int16)
+    direct = interpolate_stops(positions, STOPS).astype(np.int16)
+    assert looked_up.shape == (50, 40, 4)
+    assert np.abs(looked_up - direct).max() <= 1
+
+def test_radial_gradient_matches_direct_evaluation():
+    width, height = SIZE
+    center = (0.25, 0.5)
+    cx, cy = center[0] * (width - 1), center[1] * (height - 1)
+    radius = max(math.hypot(x - cx, y - cy) for x in (0, width - 1) for y in (0, height - 1))
+    positions = np.array([[math.hypot(x - cx, y - cy) / radius for x in range(width)] for y in range(height)])
+    gradient = _pixels(radial_gradient(SIZE, STOPS, center))
+    assert np.abs(gradient - interpolate_stops(positions, STOPS)).max() <= 1
+    # 指定半径时半径以外取末尾色标
+    gradient = _pixels(radial_gradient(SIZE, STOPS, center, 5.0))
+    assert tuple(gradient[0, -1]) == BLUE and tuple(gradient[11, 9]) == RED
+
+def test_parse_gradient_stops_fills_missing_offsets():
+    default = normalize_stops([(0.0, RED)])
+    stops = parse_gradient_stops(["#FF0000", [0.2, "#00FF00"], "#0000FF", "#FFFFFF", {"Offset": 0.8, "color": "#000000"}, "#FF0000"], default)
+    assert [offset for offset, _ in stops] == [0.0, 0.2, 0.4, 0.6000000000000001, 0.8, 1.0]
+    assert [color for _, color in stops] == [
+        (255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (255, 255, 255, 255), (0, 0, 0, 255), (255, 0, 0, 255),
+    ]
+    assert parse_gradient_stops(["#FF0000", "#0000FF"], default) == normalize_stops([(0.0, (255, 0, 0, 255)), (1.0, (0, 0, 255, 255))])
+
+def test_parse_gradient_stops_invalid_falls_back_to_default():
+    default = normalize_stops([(0.0, RED)])
+    assert parse_gradient_stops(None, default) is default
+    assert parse_gradient_stops("#FF0000", default) is default
+    # 位置不递增
+    assert parse_gradient_stops([[0.6, "#FF0000"], [0.2, "#0000FF"]], default) is default
+
+def _putpixel_column(style):
+    """改用 NumPy 之前的面板绘制：逐行 putpixel 生成 1 像素宽的渐变条（之后再缩放到整幅）"""
+    grad_panel = Image.new("RGBA", (1, style.height), (0, 0, 0, 0))
+    top_c, bot_c = style.panel_top_color, style.panel_bottom_color
+    for y in range(grad_panel.height):
+        t = y / max(1, grad_panel.height - 1)
+        grad_panel.putpixel((0, y), tuple(int(top_c[i] * (1 - t) + bot_c[i] * t) for i in range(4)))
+    return grad_panel
+
+def _composite(style, panel):
+    canvas = Image.new("RGBA", (style.width, style.height), style.background)
+    canvas.alpha_composite(panel)
+    return np.asarray(canvas).astype(np.int16)
+
+def test_use_panel_matches_putpixel_rendering():
+    style = replace(build_style({}), width=60, height=301, use_panel=True, background=(255, 255, 255, 255))
+    for bottom in (style.panel_bottom_color, (20, 90, 200, 96)):
+        style = replace(style, panel_bottom_color=bottom)
+        static_background.cache_clear()
+        clear_gradient_cache()
+        rendered = _pixels(static_background(style))
+        column = _putpixel_column(style)
+        # 与逐行 putpixel 的取值完全相同
+        assert np.array_equal(rendered, _composite(style, column.resize((style.width, style.height), Image.NEAREST)))
+        # 旧实现再用默认的双三次缩放铺满宽度，定点运算会让个别行偏差 1 个色阶
+        assert np.abs(rendered - _composite(style, column.resize((style.width, style.height)))).max() <= 1
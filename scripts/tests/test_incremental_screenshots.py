@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""截图生成 main() 的增量生成：跳过未变化的输出、--force、遗留输出与后处理失败"""
+
+import json
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import export_profiles
+import generate_appstore_screenshots as screenshots
+from font_registry import default_registry
+
+STYLE = {
+    "width": 400, "height": 800, "padding": 16, "panelPadding": 16,
+    "titleFontSize": 28, "subtitleFontSize": 18, "screenshotBorderWidth": 2,
+}
+DEVICES = [{"name": "big", "width": 800, "height": 1600}, {"name": "small", "width": 200, "height": 400}]
+ALL_OUTPUTS = {"big/01.png", "big/02.png", "small/01.png", "small/02.png"}
+
+def _screenshot(path, seed):
+    # 细条纹：不同的缩小解码倍数会得到不同的像素
+    y, x = np.mgrid[0:2000, 0:1000]
+    pixels = np.stack([(x * 37 + y * seed) % 256, (x * 5) % 256, (y * 3) % 256], axis=-1).astype(np.uint8)
+    Image.fromarray(pixels, "RGB").save(path)
+
+@pytest.fixture
+def shots(tmp_path, monkeypatch, truetype_font):
+    """输入目录与运行 main() 的函数；返回每次运行汇总的 (重新生成, 跳过, 遗留)"""
+    monkeypatch.setattr(screenshots, "_load_noto_cjk_jp_medium", lambda size: default_registry.get(truetype_font, size))
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    _screenshot(input_dir / "shot01.png", 1)
+    _screenshot(input_dir / "shot02.png", 2)
+    output_dir = tmp_path / "output"
+    summaries = []
+
+    def record(results, output_dir, elapsed, orphaned=()):
+        summaries.append((
+            {str(path.relative_to(output_dir)) for result in results for path in result.outputs},
+            {str(path.relative_to(output_dir)) for result in results for path in result.skipped},
+            set(orphaned),
+        ))
+
+    monkeypatch.setattr(screenshots, "log_render_summary", record)
+
+    class Shots:
+        input = input_dir
+        output = output_dir
+        configs = [
+            {"title": "First", "subtitle": "one", "screenshot": "shot01.png", "outputName": "01.png"},
+            {"title": "Second", "subtitle": "two", "screenshot": "shot02.png", "outputName": "02.png"},
+        ]
+
+        def run(self, *args):
+            config = {"styleConfig": STYLE, "devices": DEVICES, "configs": self.configs}
+            (input_dir / "config.json").write_text(json.dumps(config), encoding="utf-8")
+            argv = ["generate_appstore_screenshots.py", "--input-dir", str(input_dir), "--output-dir", str(output_dir)]
+            monkeypatch.setattr(sys, "argv", argv + list(args))
+            screenshots.main()
+            return summaries[-1]
+
+        def manifest(self):
+            return json.loads((output_dir / screenshots.MANIFEST_NAME).read_text(encoding="utf-8"))["outputs"]
+
+    return Shots()
+
+def test_rerun_rebuilds_only_changed_items(shots):
+    assert shots.run("--export-profile", "draft") == (ALL_OUTPUTS, set(), set())
+    assert shots.run("--export-profile", "draft") == (set(), ALL_OUTPUTS, set())
+
+    shots.configs[1]["subtitle"] = "changed"
+    assert shots.run("--export-profile", "draft") == ({"big/02.png", "small/02.png"}, {"big/01.png", "small/01.png"}, set())
+    assert set(shots.manifest()) == ALL_OUTPUTS
+
+    # 输出名改变后旧文件不会被删除，列为遗留输出并保留在清单中
+    shots.configs[1]["outputName"] = "renamed.png"
+    assert shots.run("--export-profile", "draft") == (
+        {"big/renamed.png", "small/renamed.png"}, {"big/01.png", "small/01.png"}, {"big/02.png", "small/02.png"},
+    )
+    assert set(shots.manifest()) == ALL_OUTPUTS | {"big/renamed.png", "small/renamed.png"}
+
+def test_force_rebuilds_everything(shots):
+    shots.run("--export-profile", "draft")
+    assert shots.run("--export-profile", "draft", "--force") == (ALL_OUTPUTS, set(), set())
+
+def test_partial_rerun_decodes_for_all_devices(shots, monkeypatch):
+    shots.run("--export-profile", "draft")
+    expected = (shots.output / "small" / "01.png").read_bytes()
+    (shots.output / "small" / "01.png").unlink()
+
+    bounds = []
+    prepare_item = screenshots.prepare_item
+
+    def recording_prepare_item(input_dir, item, bound=None, max_pixels=None):
+        bounds.append(bound)
+        return prepare_item(input_dir, item, bound, max_pixels)
+
+    monkeypatch.setattr(screenshots, "prepare_item", recording_prepare_item)
+    assert shots.run("--export-profile", "draft") == ({"small/01.png"}, ALL_OUTPUTS - {"small/01.png"}, set())
+    style = screenshots.build_style(STYLE)
+    assert bounds == [screenshots.screenshot_bound(style, screenshots.parse_devices(DEVICES))]
+    # 只重新生成一个设备的输出时，结果与完整生成逐字节相同
+    assert (shots.output / "small" / "01.png").read_bytes() == expected
+
+def test_post_process_failure_is_rebuilt_next_run(shots, monkeypatch):
+    optimize_png = export_profiles.optimize_png
+
+    def flaky(path):
+        if path.endswith("02.png") and "small" in path:
+            raise OSError("simulated")
+        return optimize_png(path)
+
+    monkeypatch.setattr(export_profiles, "optimize_png", flaky)
+    with pytest.raises(SystemExit) as excinfo:
+        shots.run("--export-profile", "release")
+    assert excinfo.value.code == 1
+    # 失败的文件保留渲染结果，但从清单中移除，下次运行重新生成
+    assert (shots.output / "small" / "02.png").exists()
+    assert set(shots.manifest()) == ALL_OUTPUTS - {"small/02.png"}
+
+    monkeypatch.setattr(export_profiles, "optimize_png", optimize_png)
+    assert shots.run("--export-profile", "release") == ({"small/02.png"}, ALL_OUTPUTS - {"small/02.png"}, set())
+    assert set(shots.manifest()) == ALL_OUTPUTS
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""NameIndex 的过滤查询与逐个计算 Dice 系数的结果一致"""
+
+import random
+
+import pytest
+
+from name_index import TIE_TOLERANCE, NameIndex, name_grams
+
+THRESHOLDS = [0.0, 0.3, 0.5, 0.6, 2 / 3, 0.9, 1.0]
+
+def brute_force(names, query, min_score):
+    """逐个名称计算相似度，按相似度从高到低、相同时按加入顺序排列（阈值为 0 时也要求至少共有一个二元组）"""
+    query_grams = name_grams(query)
+    if not query_grams:
+        return []
+    min_score = max(min_score, TIE_TOLERANCE)
+    scored = []
+    for slot, name in enumerate(names):
+        grams = name_grams(name)
+        if not grams:
+            continue
+        score = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+        if score > 0 and score >= min_score - TIE_TOLERANCE:
+            scored.append((-score, slot))
+    scored.sort()
+    return [(slot, -neg_score) for neg_score, slot in scored]
+
+def _random_name(rng):
+    # 小字母表使名称大量重叠，产生并列与恰好等于阈值的相似度
+    return ''.join(rng.choice('俯卧抬头a1 ．') for _ in range(rng.randint(0, 6)))
+
+@pytest.mark.parametrize('seed', range(5))
+def test_search_matches_brute_force(seed):
+    rng = random.Random(seed)
+    names = [_random_name(rng) for _ in range(300)]
+    index = NameIndex()
+    for slot, name in enumerate(names):
+        index.add(slot, name)
+    queries = [_random_name(rng) for _ in range(60)] + names[:20] + ['', '．  ．']
+    for query in queries:
+        for threshold in THRESHOLDS:
+            expected = brute_force(names, query, threshold)
+            found = index.search(query, threshold, limit=len(names))
+            assert [(match.key, match.score) for match in found] == pytest.approx(expected), (query, threshold)
+
+def test_ties_and_threshold_edges():
+    index = NameIndex()
+    for slot, name in enumerate(['抬头', '抬头', '俯卧抬头', '抬']):
+        index.add(slot, name)
+    # 并列时按加入顺序，resolve 标记并列
+    resolution = index.resolve('抬头', 0.9)
+    assert resolution.best.key == 0 and [match.key for match in resolution.tied] == [1]
+    # 「抬头」与「俯卧抬头」共有 2 个二元组：2·2 / (3 + 5) = 0.5，恰好等于阈值时保留
+    assert [match.key for match in index.search('抬头', 0.5, limit=10)] == [0, 1, 2]
+    assert [match.key for match in index.search('抬头', 0.5 + 1e-6, limit=10)] == [0, 1]
+    # 阈值 1.0 只保留规范化后完全相同的名称；空查询没有结果
+    assert [match.key for match in index.search('抬 头．', 1.0, limit=10)] == [0, 1]
+    assert index.search('', 0.0) == [] and index.search('．', 0.0) == []
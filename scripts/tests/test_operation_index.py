@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""B.1 操作方法索引：按名称匹配到已被其他项目按编号使用的行时记为冲突"""
+
+from bench.synthetic import scale_frames
+from generate_assessment_data import (
+    PLACEHOLDER_OPERATION,
+    check_modes,
+    fuzzy_match_applied,
+    generate_assessment_data,
+)
+
+def _renumber(operation_df, row, new_id):
+    operation_df.loc[row, '测查项目'] = f"{new_id}．" + operation_df.loc[row, '测查项目'].split('．', 1)[1]
+
+def _items(assessment_data):
+    return {item['id']: item for group in assessment_data for item in group['testItems']}
+
+def test_fuzzy_match_to_claimed_row_is_a_conflict():
+    scale_df, operation_df = scale_frames(1)
+    original = operation_df.loc[4, '操作方法']
+    # 编号 5 的行被误写为 200：该行先于原第 200 行出现，按编号成为 200 的结果
+    _renumber(operation_df, 4, 200)
+    # 编号 251 的行被误写为 3：原第 3 行在前，这一行只是重复编号，未被使用
+    _renumber(operation_df, 250, 3)
+
+    diagnostics = {}
+    items = _items(generate_assessment_data(diagnostics, frames=(scale_df, operation_df)))
+    fuzzy = {match['id']: match for match in diagnostics['fuzzy']}
+
+    assert fuzzy[5]['row'] == 4 and fuzzy[5]['conflict'] and not fuzzy_match_applied(fuzzy[5])
+    assert items[5]['operation'] == PLACEHOLDER_OPERATION
+    assert items[200]['operation'] == original
+    assert 5 in diagnostics['unmatched']
+
+    assert fuzzy[251]['row'] == 250 and fuzzy_match_applied(fuzzy[251])
+    assert items[251]['operation'] == operation_df.loc[250, '操作方法']
+    assert 251 not in diagnostics['unmatched']
+
+    assert check_modes((scale_df, operation_df)) == []
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""紧凑二进制格式：打包后还原的结果与 JSON 完全一致"""
+
+import json
+
+import pytest
+
+from bench.synthetic import assessment_bundle
+from packed_dataset import PackedDataset, PackedFormatError, pack_assessment_data, read_packed, write_packed
+
+def as_json(assessment_data):
+    """按 JSON 写出再读回，得到与 assessment_data.json 相同的内容"""
+    return json.loads(json.dumps(assessment_data, ensure_ascii=False))
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_round_trip_generated_data(tmp_path, assessment_data, compress):
+    path = tmp_path / 'assessment_data.bin'
+    size = write_packed(assessment_data, str(path), compress=compress)
+    assert size == path.stat().st_size
+    assert read_packed(str(path)) == as_json(assessment_data)
+
+def test_round_trip_synthetic_bundle():
+    bundle = assessment_bundle(5)
+    assert PackedDataset(pack_assessment_data(bundle)).to_assessment_data() == as_json(bundle)
+
+def test_find_group_matches_json(assessment_data):
+    dataset = PackedDataset(pack_assessment_data(assessment_data))
+    for group in as_json(assessment_data):
+        assert dataset.find_group(group['ageMonth'], group['area']) == group
+    assert dataset.find_group(999, 'motor') is None
+    assert dataset.find_group(1, 'unknown-area') is None
+
+def test_compressed_is_smaller(assessment_data):
+    assert len(pack_assessment_data(assessment_data, compress=True)) < len(pack_assessment_data(assessment_data))
+
+def test_rejects_corrupt_file(assessment_data):
+    data = pack_assessment_data(assessment_data)
+    with pytest.raises(PackedFormatError):
+        PackedDataset(data + b'\0')
+    with pytest.raises(PackedFormatError):
+        PackedDataset(b'XXXX' + data[4:])
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""表A.1 的 vectorized 列式解析与 reference 逐单元格解析结果逐字节一致"""
+
+import numpy as np
+
+from bench.synthetic import scale_frames
+from generate_assessment_data import check_modes, generate_assessment_data, parse_excel_data
+
+def test_modes_match_on_default_workbooks(workbooks):
+    assert check_modes(parse_excel_data(*workbooks)) == []
+
+def test_modes_match_with_gaps_and_unmatched_ids():
+    scale_df, operation_df = scale_frames(2)
+    # 空单元格、无法解析的单元格，以及 B.1 中缺少的编号（占位文本与按名称匹配）
+    scale_df.iloc[3, 2] = np.nan
+    scale_df.iloc[4, 5] = '说明文字'
+    operation_df = operation_df.drop(index=[0, 7, 30]).reset_index(drop=True)
+    operation_df.loc[10, '测查项目'] = '．' + operation_df.loc[10, '测查项目'].split('．', 1)[1]
+    assert check_modes((scale_df, operation_df)) == []
+    assert check_modes((scale_df, operation_df), fuzzy_threshold=None) == []
+
+    diagnostics = {}
+    generate_assessment_data(diagnostics, mode='reference', frames=(scale_df, operation_df), fuzzy_threshold=None)
+    assert diagnostics['unmatched'] and diagnostics['unparsed']
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""评分引擎：与 Dart 端共用的一致性用例，以及批量引擎与逐行移植的参考实现在随机测评上的结果一致"""
+
+import json
+import random
+
+import pytest
+
+from conftest import REPO_ROOT
+from rescore_results import DEFAULT_FIXTURE_FILE
+from scoring import AREAS, ScoringEngine, ScoringModel, check_fixtures, load_fixtures, score_session
+
+@pytest.fixture(scope='module')
+def fixtures():
+    return load_fixtures(str(REPO_ROOT / DEFAULT_FIXTURE_FILE))
+
+@pytest.fixture(scope='module')
+def bundled_data(fixtures):
+    """一致性用例对应的数据文件（App 打包的 assessment_data.json）"""
+    with open(REPO_ROOT / fixtures['dataFile'], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_parity_fixtures(bundled_data, fixtures):
+    assert fixtures['sessions']
+    assert check_fixtures(bundled_data, fixtures) == []
+
+def random_sessions(all_data, count, seed):
+    """随机测评：各月龄随机抽取部分项目，混入数据集中没有的编号，实际月龄含 0 与超出范围的值"""
+    rng = random.Random(seed)
+    item_ids = [item['id'] for group in all_data for item in group['testItems']]
+    sessions, ages = [], []
+    for _ in range(count):
+        tested = rng.sample(item_ids, rng.randint(0, min(len(item_ids), 60)))
+        results = {item_id: rng.random() < 0.6 for item_id in tested}
+        if rng.random() < 0.2:
+            results[max(item_ids) + rng.randint(1, 100)] = True
+        sessions.append(results)
+        ages.append(rng.choice([0.0, 0.5, 3.2, 12.0, 30.7, 84.0, 90.0]))
+    return sessions, ages
+
+def assert_engine_matches_reference(all_data, sessions, ages):
+    engine = ScoringEngine(ScoringModel(all_data))
+    for results, age, batch in zip(sessions, ages, engine.score_sessions(sessions, ages)):
+        expected = score_session(all_data, results, age)
+        # 引擎按与参考实现相同的顺序累加，结果逐位相同
+        assert batch['areaScores'] == expected['areaScores']
+        assert (batch['totalScore'], batch['averageScore'], batch['dq']) == (
+            expected['totalScore'], expected['averageScore'], expected['dq'])
+
+@pytest.mark.parametrize('seed', range(3))
+def test_engine_matches_reference_on_bundled_data(bundled_data, seed):
+    assert_engine_matches_reference(bundled_data, *random_sessions(bundled_data, 200, seed))
+
+def test_engine_matches_reference_on_generated_data(assessment_data):
+    assert_engine_matches_reference(assessment_data, *random_sessions(assessment_data, 200, seed=7))
+
+def test_engine_matches_reference_with_repeated_ids_and_empty_areas():
+    # 同一编号出现在两个分组时按第一次出现的分组计分；social 能区没有项目
+    all_data = [
+        {'ageMonth': 1, 'area': 'motor', 'score': 1.0, 'testItems': [{'id': 1}, {'id': 2}, {'id': 3}]},
+        {'ageMonth': 2, 'area': 'motor', 'score': 1.0, 'testItems': [{'id': 4}, {'id': 2}]},
+        {'ageMonth': 15, 'area': 'language', 'score': 3.0, 'testItems': [{'id': 10}, {'id': 11}, {'id': 12}]},
+    ]
+    assert 'social' in AREAS
+    assert_engine_matches_reference(all_data, *random_sessions(all_data, 300, seed=3))
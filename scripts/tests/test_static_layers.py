@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""截图静态图层缓存的上限"""
+
+from dataclasses import replace
+
+from generate_appstore_screenshots import STATIC_LAYER_CACHE_SIZE, build_style, screenshot_frame, static_background
+
+def test_static_layers_stay_within_cache_limit():
+    style = build_style({})
+    static_background.cache_clear()
+    screenshot_frame.cache_clear()
+    for width in range(100, 100 + 10 * (STATIC_LAYER_CACHE_SIZE + 2), 10):
+        static_background(replace(style, width=width, height=2 * width))
+        screenshot_frame((width, 2 * width), 2, (0, 0, 0, 255))
+    assert static_background.cache_info().currsize == STATIC_LAYER_CACHE_SIZE
+    assert screenshot_frame.cache_info().currsize == STATIC_LAYER_CACHE_SIZE
+    # 同一尺寸再次取用时命中缓存
+    before = static_background.cache_info().hits
+    static_background(replace(style, width=150, height=300))
+    assert static_background.cache_info().hits == before + 1
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""排版引擎的分词"""
+
+from text_layout import tokenize
+
+def test_tokenize_keeps_words_and_joiners():
+    assert tokenize("e-mail a_b@c#d&e/f") == ["e-mail", " ", "a_b@c#d&e/f"]
+    # 带重音的字母与数字连写；汉字逐字切分
+    assert tokenize("Café 2024年") == ["Café", " ", "2024", "年"]
+
+def test_tokenize_splits_at_other_punctuation():
+    # 与原 wrap_text_to_width 相同：撇号与句点不是连写符号
+    assert tokenize("don't") == ["don", "'", "t"]
+    assert tokenize("v1.2") == ["v1", ".", "2"]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""validate_data.py 的流式读取、问题条数上限与跨分组语义检查"""
+
+import io
+import json
+
+import pytest
+
+from validate_data import (
+    IssueList,
+    JSONStreamError,
+    SemanticChecker,
+    ValidationIssue,
+    iter_json_array,
+    validate_assessment_data,
+)
+
+class CountingReader(io.StringIO):
+    """记录已读取的字符数"""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size: int = -1) -> str:
+        chunk = super().read(size)
+        self.chars_read += len(chunk)
+        return chunk
+
+def test_reads_elements_split_across_chunks():
+    groups = [{'ageMonth': age, 'name': '项目' * 50, 'score': 4.5e3} for age in range(20)]
+    reader = io.StringIO(json.dumps(groups, ensure_ascii=False))
+    assert list(iter_json_array(reader, chunk_size=7)) == groups
+
+def test_syntax_error_stops_before_end_of_file():
+    # 第二个元素有语法错误，之后还有大量内容
+    text = '[{"a": 1}, {"a": oops}, ' + ', '.join(['{"a": 1}'] * 200_000) + ']'
+    reader = CountingReader(text)
+    with pytest.raises(JSONStreamError) as excinfo:
+        list(iter_json_array(reader, chunk_size=1024, max_element_chars=64 * 1024))
+    assert excinfo.value.path == '/1'
+    assert reader.chars_read < 128 * 1024 < len(text)
+
+def test_syntax_error_at_end_of_small_file():
+    with pytest.raises(JSONStreamError) as excinfo:
+        list(iter_json_array(io.StringIO('[{"a": 1}, {"a": }]')))
+    assert excinfo.value.path == '/1'
+
+def test_issue_list_keeps_count_beyond_limit():
+    issues = IssueList(limit=3)
+    issues.extend(ValidationIssue(f'/{idx}', 'x') for idx in range(10))
+    assert len(issues) == 10 and len(issues.items) == 3 and issues.omitted == 7
+
+    merged = IssueList(limit=5)
+    merged.append(ValidationIssue('', 'y'))
+    merged.extend(issues)
+    assert len(merged) == 11 and len(merged.items) == 4
+
+def test_issue_cap_on_corrupt_bundle(tmp_path, capsys):
+    # 每个项目都缺少必要字段：错误只保留 max_issues 条，但总数如实报告
+    groups = [{'ageMonth': 1, 'area': 'motor', 'score': 1.0, 'testItems': [{'id': idx} for idx in range(500)]}]
+    path = tmp_path / 'bad.json'
+    path.write_text(json.dumps(groups), encoding='utf-8')
+    assert not validate_assessment_data(str(path), max_errors=5, max_issues=20)
+    output = capsys.readouterr().out
+    assert '发现 2000 处错误' in output
+    assert '其余 1995 处未显示' in output
+
+AGES = [1, 2]
+AREAS = ['motor', 'social']
+
+def _bundle(ids=None):
+    """2 个月龄 × 2 个能区、每组 2 个项目的正确数据；ids 为 (月龄, 能区) -> 编号列表的替换"""
+    default = {(1, 'motor'): [1, 2], (1, 'social'): [3, 4], (2, 'motor'): [5, 6], (2, 'social'): [7, 8]}
+    default.update(ids or {})
+    return [
+        {'ageMonth': age, 'area': area, 'score': 1.0,
+         'testItems': [{'id': item_id, 'area': area, 'score': 0.5} for item_id in default[(age, area)]]}
+        for (age, area) in default
+    ]
+
+def _check(groups):
+    checker = SemanticChecker(AGES, AREAS)
+    for idx, group in enumerate(groups):
+        checker.add_group(group, f'/{idx}')
+    checker.finish()
+    return checker
+
+def _issues(issues):
+    return [str(issue) for issue in issues]
+
+def test_semantic_checker_accepts_valid_bundle():
+    checker = _check(_bundle())
+    assert _issues(checker.errors) == [] and _issues(checker.warnings) == []
+    assert checker.id_index[6] == (2, 'motor')
+
+def test_semantic_checker_duplicate_id():
+    checker = _check(_bundle({(1, 'social'): [1, 4]}))
+    assert _issues(checker.errors) == ['/1/testItems/0/id: 项目编号 1 重复（已出现在 1 月龄 motor）']
+
+def test_semantic_checker_ids_not_increasing_within_group():
+    checker = _check(_bundle({(1, 'motor'): [2, 1]}))
+    assert _issues(checker.errors) == ['/0/testItems/1/id: 分组内项目编号未递增: 2 -> 1']
+
+def test_semantic_checker_ids_not_increasing_across_ages():
+    checker = _check(_bundle({(1, 'motor'): [1, 5], (2, 'motor'): [2, 6]}))
+    assert _issues(checker.errors) == [
+        '/2/testItems: motor 能区项目编号未随月龄递增: 1 月龄最大编号 5，2 月龄最小编号 2',
+    ]
+
+def test_semantic_checker_score_mismatch():
+    groups = _bundle()
+    groups[0]['testItems'][1]['score'] = 0.4
+    groups[3]['score'] = 3.0
+    checker = _check(groups)
+    assert _issues(checker.errors) == [
+        '/0/testItems: 单项分值之和为 0.900000，应为 1.0',
+        '/3/score: 能区分数为 3.0，按月龄应为 1.0',
+    ]
+    # 容差以内的浮点误差不报告
+    groups = _bundle()
+    groups[0]['testItems'][1]['score'] = 0.5 + 1e-9
+    assert _issues(_check(groups).errors) == []
+
+def test_semantic_checker_duplicate_group():
+    groups = _bundle() + [{'ageMonth': 2, 'area': 'social', 'score': 1.0, 'testItems': []}]
+    checker = _check(groups)
+    assert _issues(checker.errors) == ['/4: 月龄 2 能区 social 的分组重复出现']
+
+def test_semantic_checker_coverage_matrix():
+    groups = [group for group in _bundle() if (group['ageMonth'], group['area']) != (2, 'social')]
+    groups.append({'ageMonth': 3, 'area': 'art', 'score': 1.0,
+                   'testItems': [{'id': 9, 'area': 'art', 'score': 1.0}]})
+    checker = _check(groups)
+    assert _issues(checker.errors) == []
+    assert _issues(checker.warnings) == [
+        '/3/ageMonth: 月龄 3 不在量表月龄列表中',
+        '/3/area: 未知能区 art',
+        '/: 缺少 2 月龄 social 能区的数据',
+    ]
+    assert checker.format_coverage_matrix() == [
+        '  月龄 motor social',
+        '     1     2      2',
+        '     2     2      -',
+    ]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""--variants：构建清单解析与多版本构建"""
+
+import json
+import os
+import re
+import shutil
+
+import pytest
+
+from build_cache import BUILD_FULL, BUILD_HIT, BuildCache
+from generate_assessment_data import (
+    Variant,
+    build_variants,
+    generate_assessment_data,
+    load_variants,
+    parse_excel_data,
+    write_outputs,
+)
+
+def _manifest(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+def test_load_variants_resolves_paths_against_manifest_dir(tmp_path):
+    manifest = _manifest(tmp_path / 'conf' / 'variants.json', {'variants': [
+        {'name': 'national', 'scale': 'A.xlsx', 'operation': '../shared/B.xlsx',
+         'output': 'out/national.json', 'index': 'out/national_index.json'},
+        {'scale': str(tmp_path / 'abs' / 'A.xlsx'), 'operation': 'B.xlsx', 'output': 'out/./local.json',
+         'packed': 'out/local.bin'},
+    ]})
+    conf = os.path.join(str(tmp_path), 'conf')
+    assert load_variants(manifest) == [
+        Variant('national', os.path.join(conf, 'A.xlsx'), os.path.join(str(tmp_path), 'shared', 'B.xlsx'),
+                os.path.join(conf, 'out', 'national.json'), index_file=os.path.join(conf, 'out', 'national_index.json')),
+        # name 缺省为 output
+        Variant('out/./local.json', os.path.join(str(tmp_path), 'abs', 'A.xlsx'), os.path.join(conf, 'B.xlsx'),
+                os.path.join(conf, 'out', 'local.json'), packed_file=os.path.join(conf, 'out', 'local.bin')),
+    ]
+    # 清单也可以直接是数组
+    array_manifest = _manifest(tmp_path / 'conf' / 'array.json', [{'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'x.json'}])
+    assert [variant.output_file for variant in load_variants(array_manifest)] == [os.path.join(conf, 'x.json')]
+
+@pytest.mark.parametrize('entries, message', [
+    ({'variants': []}, '构建清单中没有 variants'),
+    ([{'scale': 'A.xlsx', 'output': 'a.json'}], 'variants[0] 缺少字段: operation'),
+    ([{'name': 'a', 'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'a.json'},
+      {'name': 'a', 'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'b.json'}], 'variants[1] 名称重复: a'),
+    # 路径规整后相同，且与另一版本的索引文件冲突也算重复
+    ([{'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'a.json', 'index': 'out/index.json'},
+      {'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'out/../out/index.json'}], 'variants[1] 的输出文件与其他版本重复'),
+])
+def test_load_variants_rejects_invalid_manifest(tmp_path, entries, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        load_variants(_manifest(tmp_path / 'variants.json', entries))
+
+@pytest.fixture
+def variants(tmp_path, workbooks):
+    """两个有效版本（共用仓库中的工作簿）与一个缺少工作簿的版本"""
+    scale, operation = workbooks
+    shutil.copy(scale, tmp_path / 'A.xlsx')
+    shutil.copy(operation, tmp_path / 'B.xlsx')
+    return load_variants(_manifest(tmp_path / 'variants.json', [
+        {'name': 'full', 'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'full/assessment_data.json',
+         'index': 'full/assessment_index.json', 'packed': 'full/assessment_data.bin'},
+        {'name': 'missing', 'scale': 'missing.xlsx', 'operation': 'B.xlsx', 'output': 'missing/assessment_data.json'},
+        {'name': 'json', 'scale': 'A.xlsx', 'operation': 'B.xlsx', 'output': 'json/assessment_data.json'},
+    ]))
+
+def _read_bytes(paths):
+    result = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            result.append(f.read())
+    return result
+
+def test_build_variants_in_parallel_matches_single_run(tmp_path, workbooks, variants):
+    results = build_variants(variants, 'vectorized', False, jobs=2)
+    assert [(result.name, result.error is None) for result in results] == [('full', True), ('missing', False), ('json', True)]
+    assert 'missing.xlsx' in results[1].error
+    assert not os.path.exists(variants[1].output_file)
+
+    # 与单次生成写出的文件逐字节相同
+    reference = tmp_path / 'reference'
+    reference.mkdir()
+    expected_files = [str(reference / name) for name in ('assessment_data.json', 'assessment_index.json', 'assessment_data.bin')]
+    write_outputs(generate_assessment_data(frames=parse_excel_data(*workbooks)), *expected_files)
+    expected = _read_bytes(expected_files)
+    assert _read_bytes(variants[0].output_files) == expected
+    assert _read_bytes(variants[2].output_files) == expected[:1]
+    assert results[0].groups == results[2].groups > 0
+    assert results[0].total_items == results[2].total_items > 0
+
+def test_build_variants_incremental_hit(tmp_path, variants):
+    valid = [variants[0], variants[2]]
+    cache = BuildCache(str(tmp_path / 'cache'))
+    first = build_variants(valid, 'vectorized', False, jobs=1, cache=cache)
+    assert [result.status for result in first] == [BUILD_FULL, BUILD_FULL]
+    mtimes = [os.stat(path).st_mtime_ns for variant in valid for path in variant.output_files]
+
+    second = build_variants(valid, 'vectorized', False, jobs=1, cache=BuildCache(str(tmp_path / 'cache')))
+    assert [result.status for result in second] == [BUILD_HIT, BUILD_HIT]
+    # 命中时统计信息从现有 JSON 读取，不重新写出
+    assert [(result.groups, result.total_items, result.area_stats) for result in second] == \
+           [(result.groups, result.total_items, result.area_stats) for result in first]
+    assert [os.stat(path).st_mtime_ns for variant in valid for path in variant.output_files] == mtimes
+
+    # 输出文件被改动的版本重新生成，其余仍命中
+    with open(valid[0].index_file, 'w', encoding='utf-8') as f:
+        f.write('{}')
+    third = build_variants(valid, 'vectorized', False, jobs=1, cache=BuildCache(str(tmp_path / 'cache')))
+    assert [result.status for result in third] == [BUILD_FULL, BUILD_HIT]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""xlsx_reader 的表头命名与取值与 pandas.read_excel 一致"""
+
+import math
+
+import pytest
+from openpyxl import Workbook
+
+from xlsx_reader import _column_names, read_sheet
+
+HEADERS = {
+    'duplicate': ['a', 'a', 'a', 'b'],
+    'duplicate_with_suffix_taken': ['a', 'a', 'a.1', 'a.1'],
+    'blank': [None, 'x', None, 'y'],
+    'blank_with_unnamed_taken': [None, 'Unnamed: 0', 'z'],
+    'numeric': [1, 1, 2.0, 1.5, '1'],
+    'na_string': ['NA', 'nan', 'NA'],
+    'mixed': ['名称', None, '名称', 3, 3],
+}
+
+def _write(path, header, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+def _normalize(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+@pytest.mark.parametrize('name', sorted(HEADERS))
+def test_matches_pandas(tmp_path, name):
+    pd = pytest.importorskip('pandas')
+    header = HEADERS[name]
+    path = tmp_path / f'{name}.xlsx'
+    rows = [[idx * 10 + col for col in range(len(header))] for idx in range(3)]
+    # 表头右侧的无名列与中间的空行
+    rows.append([None] * len(header) + ['extra'])
+    rows.insert(1, [None] * len(header))
+    _write(path, header, rows)
+
+    sheet = read_sheet(str(path))
+    frame = pd.read_excel(path)
+    assert sheet.columns == list(frame.columns)
+    expected = [[_normalize(value) for value in row] for row in frame.itertuples(index=False)]
+    assert [[_normalize(value) for value in row] for row in sheet.rows] == expected
+
+def test_column_names():
+    # 重名列加后缀，并避开表头中已有的 'a.1'
+    assert _column_names(['a', 'a', 'a.1', 'a.1'], 4) == ['a', 'a.2', 'a.1', 'a.1.1']
+    # 空表头与表头之外的列为 Unnamed，最后命名，与已有列名重复时同样加后缀
+    assert _column_names([None, 'Unnamed: 0', 'z'], 4) == ['Unnamed: 0.1', 'Unnamed: 0', 'z', 'Unnamed: 3']
+    # 数字表头保持原类型，重名时转为带后缀的字符串
+    assert _column_names([1, 1, 2.0, '1'], 4) == [1, '1.1', 2.0, '1']
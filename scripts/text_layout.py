@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+截图文案的排版引擎
+- 分词：连续的拉丁字母/数字（含带重音字母、全角数字等）作为一个词，汉字、假名、谚文与标点逐字切分，空格单独成词
+- 测量：每个词在每种字体下只测量一次宽度，相邻词之间的字距调整（kerning）按字符对缓存，
+  行宽 = 各词宽度之和 + 词间字距调整，与直接测量整行的结果一致
+- 断行：按宽度贪心断行，并遵守中日文避头尾规则（行首禁则字符如 ，。」 不出现在行首，
+  行尾禁则字符如 「（ 不出现在行尾），行末空格不计入宽度
+- 输出：带坐标的行列表，测量与绘制共用，不再逐行重复调用 textbbox
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from PIL import ImageFont
+
+import tracing
+
+# 不能出现在行首的字符（行首禁则）
+NO_LINE_START = frozenset(
+    "，。、．：；！？）］｝〕〉》」』】〙〗〟’”｠»"
+    "ヽヾーァィゥェォッャュョヮヵヶぁぃぅぇぉっゃゅょゎゕゖㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ々〻"
+    "‐゠–〜～・…‥"
+    ",.:;!?)]}%"
+)
+
+# 不能出现在行尾的字符（行尾禁则）
+NO_LINE_END = frozenset("（［｛〔〈《「『【〘〖〝‘“｟«([{")
+
+# 词内允许连写的符号（与原 wrap_text_to_width 相同）；字母与数字不再限于 ASCII，带重音的拉丁字母等也不拆开
+WORD_JOINERS = frozenset("-_@#&/")
+
+FontType = ImageFont.FreeTypeFont
+
+@dataclass
+class PlacedLine:
+    """排好位置的一行：(x, y) 为绘制坐标，height 为该行文字的包围盒高度"""
+    text: str
+    x: int
+    y: int
+    width: float
+    height: int
+
+@dataclass
+class TextLayout:
+    lines: List[PlacedLine]
+    width: int
+    height: int
+    # 最后一行之后（含行距）的 y 坐标，即下一段文字的起点
+    bottom: int
+
+def _is_cjk(ch: str) -> bool:
+    """汉字、假名、谚文与全角字符：每个字都可以断行"""
+    return unicodedata.east_asian_width(ch) in ("W", "F")
+
+def _is_word_char(ch: str) -> bool:
+    if _is_cjk(ch):
+        return False
+    category = unicodedata.category(ch)
+    return category[0] in ("L", "N", "M") or ch in WORD_JOINERS
+
+def tokenize(text: str) -> List[str]:
+    """切分为可断行的最小单位"""
+    tokens: List[str] = []
+    buffer = ""
+    for ch in text:
+        if _is_word_char(ch):
+            buffer += ch
+            continue
+        if buffer:
+            tokens.append(buffer)
+            buffer = ""
+        tokens.append(ch)
+    if buffer:
+        tokens.append(buffer)
+    return tokens
+
+def font_key(font: FontType) -> Hashable:
+    """字体的缓存键：FreeTypeFont 按 (路径, 字号, 字面下标)，其他字体按对象本身"""
+    path = getattr(font, "path", None)
+    if path is not None:
+        return (path, font.size, getattr(font, "index", 0))
+    return font
+
+class TextLayoutEngine:
+    """带测量缓存的排版器；同一进程内共用一个实例"""
+
+    def __init__(self):
+        self._advances: Dict[Tuple[Hashable, str], float] = {}
+        self._kerning: Dict[Tuple[Hashable, str], float] = {}
+        self._heights: Dict[Tuple[Hashable, str], int] = {}
+
+    def advance(self, font: FontType, token: str) -> float:
+        key = (font_key(font), token)
+        value = self._advances.get(key)
+        if value is None:
+            value = font.getlength(token)
+            self._advances[key] = value
+        return value
+
+    def kerning(self, font: FontType, left: str, right: str) -> float:
+        """两个相邻词之间的字距调整：只与左词末字符和右词首字符有关"""
+        pair = left[-1] + right[0]
+        key = (font_key(font), pair)
+        value = self._kerning.get(key)
+        if value is None:
+            value = font.getlength(pair) - self.advance(font, left[-1]) - self.advance(font, right[0])
+            self._kerning[key] = value
+        return value
+
+    def line_width(self, font: FontType, tokens: Sequence[str]) -> float:
+        width = 0.0
+        previous = ""
+        for token in tokens:
+            width += self.advance(font, token)
+            if previous:
+                width += self.kerning(font, previous, token)
+            previous = token
+        return width
+
+    def line_height(self, font: FontType, text: str) -> int:
+        key = (font_key(font), text)
+        value = self._heights.get(key)
+        if value is None:
+            bbox = font.getbbox(text)
+            value = bbox[3] - bbox[1]
+            self._heights[key] = value
+        return value
+
+    @tracing.traced('text.wrap')
+    def wrap(self, text: str, font: FontType, max_width: float) -> List[str]:
+        """按最大宽度断行，遵守避头尾规则；单个词超过最大宽度时独占一行"""
+        if not text:
+            return []
+        lines: List[List[str]] = []
+        current: List[str] = []
+        # 当前行宽度（不含行末空格）与含行末空格的宽度
+        width = 0.0
+        for token in tokenize(text):
+            if not current:
+                if token == " " and lines:
+                    continue  # 新行行首的空格丢弃
+                current = [token]
+                width = self.advance(font, token)
+                continue
+
+            tentative = width + self.kerning(font, current[-1], token) + self.advance(font, token)
+            if token == " " or tentative <= max_width:
+                current.append(token)
+                width = tentative
+                continue
+
+            # 需要换行：行首禁则字符连同上一个词一起移到下一行，行尾禁则字符也移到下一行
+            carry: List[str] = []
+            if token in NO_LINE_START and len(current) > 1:
+                carry.insert(0, current.pop())
+            while len(current) > 1 and current[-1] in NO_LINE_END:
+                carry.insert(0, current.pop())
+            while len(current) > 1 and current[-1] == " ":
+                current.pop()
+            lines.append(current)
+            current = carry + [token]
+            width = self.line_width(font, current)
+        if current:
+            lines.append(current)
+        return ["".join(line).rstrip(" ") or " " for line in lines]
+
+    def place(
+        self,
+        lines: Sequence[str],
+        font: FontType,
+        top: int,
+        line_spacing: int,
+        align: str,
+        canvas_width: int,
+        padding: int,
+    ) -> TextLayout:
+        """为已断好的行计算绘制坐标；align 为 center/left/right"""
+        placed: List[PlacedLine] = []
+        y = top
+        max_width = 0.0
+        for line in lines:
+            width = self.line_width(font, tokenize(line))
+            if align == "left":
+                x = padding
+            elif align == "right":
+                x = canvas_width - padding - int(width)
+            else:
+                x = (canvas_width - int(width)) // 2
+            height = self.line_height(font, line)
+            placed.append(PlacedLine(text=line, x=x, y=y, width=width, height=height))
+            max_width = max(max_width, width)
+            y += height + line_spacing
+        total_height = y - top - line_spacing if placed else 0
+        return TextLayout(lines=placed, width=int(max_width), height=total_height, bottom=y)
+
+    def clear(self) -> None:
+        self._advances.clear()
+        self._kerning.clear()
+        self._heights.clear()
+
+# 进程内共用的排版器
+default_engine = TextLayoutEngine()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+各脚本共用的分阶段计时（trace）与性能剖析（profile）
+
+- span(name)：with 语句计时一段代码；traced(name) 为对应的函数装饰器
+- counter(name, **values)：记录某一时刻的数值（如缓存大小）；count(name) 累加计数，结束时写出总数
+- 命令行：add_arguments(parser) 为脚本增加 --trace out.json 与 --profile（--profile-limit N），
+  解析参数后调用 start(args, 脚本名)，进程退出时自动写出 trace 并打印 profile 结果
+
+trace 文件为 Chrome trace-event 格式（JSON 对象，traceEvents 中为 X/C/M 事件，时间单位为微秒），
+可在 chrome://tracing 或 https://ui.perfetto.dev 中打开。时间取自 perf_counter（系统范围的单调时钟），
+多进程时各进程的事件可直接合并：工作进程用 init_worker 开启记录，每个任务结束时用 take_worker_trace
+取出事件随结果返回，主进程用 merge 并入。
+
+--profile 用 cProfile 剖析主进程（不含工作进程），按累计耗时打印前 N 个函数（--profile-limit，默认 30）。
+
+未开启 --trace 时 span 直接返回共用的空上下文，traced 只多一次全局变量判断，开销可忽略。
+"""
+
+import argparse
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# --profile 默认打印的函数个数
+DEFAULT_PROFILE_LIMIT = 30
+
+_NULL_SPAN = nullcontext()
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+class Tracer:
+    """一个进程内记录的事件与计数"""
+
+    def __init__(self, process_name: str):
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = [
+            {'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0, 'args': {'name': process_name}},
+        ]
+        self.totals: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        start = _now_us()
+        try:
+            yield
+        finally:
+            event = {
+                'name': name, 'ph': 'X', 'ts': start, 'dur': _now_us() - start,
+                'pid': self.pid, 'tid': threading.get_native_id(),
+            }
+            if args:
+                event['args'] = args
+            self.events.append(event)
+
+    def counter(self, name: str, values: Dict[str, float]) -> None:
+        self.events.append({'name': name, 'ph': 'C', 'ts': _now_us(), 'pid': self.pid, 'tid': 0, 'args': values})
+
+    def flush_totals(self) -> None:
+        """把累加计数写为 C 事件并清零"""
+        for name, total in sorted(self.totals.items()):
+            self.counter(name, {'total': total})
+        self.totals.clear()
+
+# 当前进程的记录器；为 None 表示未开启
+_tracer: Optional[Tracer] = None
+
+# start 开启的会话（只在主进程中非空）：记录器、剖析器与输出参数
+_session: Dict[str, Any] = {}
+
+def enabled() -> bool:
+    return _tracer is not None
+
+def span(name: str, /, **args: Any):
+    """计时一段代码：with span('parse'): ...；args 写入事件，可在 trace 查看器中看到"""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """函数装饰器：每次调用记录为一个 span，名称默认为函数名"""
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def counter(name: str, /, **values: float) -> None:
+    """记录某一时刻的数值，trace 查看器中显示为折线"""
+    if _tracer is not None:
+        _tracer.counter(name, values)
+
+def count(name: str, amount: float = 1) -> None:
+    """累加计数（如缓存未命中次数），结束时写出总数"""
+    if _tracer is not None:
+        _tracer.totals[name] = _tracer.totals.get(name, 0) + amount
+
+def init_worker(trace: bool) -> None:
+    """工作进程初始化：主进程开启了 trace 时在工作进程中同样开启
+
+    以 fork 启动的工作进程会继承主进程的会话与剖析器，这里先停用，profile 只统计主进程。
+    """
+    global _tracer
+    profiler = _session.get('profiler')
+    if profiler is not None:
+        profiler.disable()
+    _session.clear()
+    _tracer = Tracer(f"worker {os.getpid()}") if trace else None
+
+def take_worker_trace() -> Optional[Dict[str, Any]]:
+    """在工作进程中取出至今记录的事件（随任务结果返回主进程）；主进程或未开启时返回 None"""
+    if _tracer is None or _session:
+        return None
+    _tracer.flush_totals()
+    events, _tracer.events = _tracer.events, []
+    return {'events': events}
+
+def merge(trace: Optional[Dict[str, Any]]) -> None:
+    """主进程并入工作进程返回的事件"""
+    if _tracer is not None and trace:
+        _tracer.events.extend(trace['events'])
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("性能分析")
+    group.add_argument("--trace", metavar="OUT_JSON",
+                       help="记录各阶段耗时，写出 Chrome trace-event 格式文件（可在 chrome://tracing 或 ui.perfetto.dev 打开）")
+    group.add_argument("--profile", action="store_true", help="用 cProfile 剖析主进程，结束时按累计耗时打印耗时最多的函数")
+    group.add_argument("--profile-limit", type=int, default=DEFAULT_PROFILE_LIMIT, metavar="N",
+                       help=f"--profile 打印的函数个数，默认 {DEFAULT_PROFILE_LIMIT}")
+
+def start(args: argparse.Namespace, name: str) -> None:
+    """按 --trace / --profile 开启记录；进程退出时（含 sys.exit）自动调用 finish"""
+    global _tracer
+    trace_path = getattr(args, 'trace', None)
+    profile = getattr(args, 'profile', False)
+    if not trace_path and not profile:
+        return
+    _session.update(name=name, trace_path=trace_path, profile_limit=getattr(args, 'profile_limit', DEFAULT_PROFILE_LIMIT),
+                    start=_now_us())
+    if trace_path:
+        _tracer = _session['tracer'] = Tracer(name)
+    if profile:
+        profiler = _session['profiler'] = cProfile.Profile()
+        profiler.enable()
+    atexit.register(finish)
+
+def finish() -> None:
+    """结束记录：写出 trace 文件、打印 profile 结果（输出到 stderr，不影响脚本的标准输出）"""
+    global _tracer
+    if not _session:
+        return
+    session = dict(_session)
+    _session.clear()
+
+    profiler = session.get('profiler')
+    if profiler is not None:
+        profiler.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(session['profile_limit'])
+        print(f"\n[profile] {session['name']}，按累计耗时排序:", file=sys.stderr)
+        print(stream.getvalue().rstrip(), file=sys.stderr)
+
+    tracer = session.get('tracer')
+    if tracer is not None:
+        tracer.events.append({
+            'name': session['name'], 'ph': 'X', 'ts': session['start'], 'dur': _now_us() - session['start'],
+            'pid': tracer.pid, 'tid': threading.get_native_id(),
+        })
+        tracer.flush_totals()
+        _tracer = None
+        write_trace(session['trace_path'], tracer.events, session['name'])
+        print(f"[trace] 已写出 {len(tracer.events)} 个事件: {session['trace_path']}", file=sys.stderr)
+
+def write_trace(path: str, events: List[Dict[str, Any]], name: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'script': name}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+def summarize(path: str, limit: int = 20) -> List[str]:
+    """按 span 名称汇总 trace 文件中的耗时（次数、合计、最大），合计耗时从高到低"""
+    with open(path, 'r', encoding='utf-8') as f:
+        events = json.load(f)['traceEvents']
+    spans: Dict[str, List[float]] = {}
+    counters: Dict[str, Dict[str, float]] = {}
+    for event in events:
+        if event.get('ph') == 'X':
+            spans.setdefault(event['name'], []).append(event['dur'])
+        elif event.get('ph') == 'C':
+            totals = counters.setdefault(event['name'], {})
+            for key, value in event.get('args', {}).items():
+                totals[key] = totals.get(key, 0) + value if key == 'total' else value
+    lines = []
+    for name, durations in sorted(spans.items(), key=lambda entry: -sum(entry[1]))[:limit]:
+        lines.append(f"  {name}: {len(durations)} 次，合计 {sum(durations) / 1000:.1f} ms，最大 {max(durations) / 1000:.1f} ms")
+    for name, values in sorted(counters.items()):
+        lines.append(f"  {name}: " + "，".join(f"{key}={value:g}" for key, value in values.items()))
+    return lines
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="汇总 --trace 写出的 trace 文件")
+    parser.add_argument("trace_file")
+    parser.add_argument("--limit", type=int, default=20, help="最多列出的 span 名称数，默认 20")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    for line in summarize(args.trace_file, args.limit):
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -2,89 +2,471 @@
 # -*- coding: utf-8 -*-
 """
 验证生成的评估数据质量
+按 Flutter DataService 期望的 AssessmentData / AssessmentItem 结构逐条校验，
+以流式方式读取顶层数组，错误附带 JSON Pointer 路径（如 /42/testItems/3/passCondition）。
+
+内存占用有上限：单个顶层元素超过 --max-element-chars 时停止读取（语法错误会导致读取器一直等待更多内容），
+错误与警告各最多保留 --max-issues 条，其余只计数。
 """
 
+import argparse
 import json
+import math
 import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from assessment_builder import AGE_MONTHS, AREA_ORDER, get_score
+import tracing
+
+DEFAULT_DATA_FILE = 'child_development_assessment/assets/data/assessment_data.json'
+
+# 单个顶层元素（一个分组）的最大字符数；生成的分组通常只有数 KB
+DEFAULT_MAX_ELEMENT_CHARS = 16 * 1024 * 1024
+
+# 错误与警告各最多保留的条数
+DEFAULT_MAX_ISSUES = 1000
+
+# 生成脚本在 B.1 中找不到项目时写入的占位文本
+PLACEHOLDER_OPERATION = '请参考标准操作方法'
+PLACEHOLDER_PASS_CONDITION = '请参考标准通过要求'
+
+@dataclass(frozen=True)
+class Field:
+    """结构中的一个字段"""
+    name: str
+    types: Tuple[type, ...]
+    required: bool = True
+    nullable: bool = False
+    # 列表字段的元素结构
+    items: Optional[Tuple['Field', ...]] = None
+
+NUMBER = (int, float)
+
+# 与 lib/models/assessment_item.dart 中 AssessmentItem.fromJson 对应
+ASSESSMENT_ITEM_SCHEMA = (
+    Field('id', (int,)),
+    Field('name', (str,)),
+    Field('desc', (str,)),
+    Field('operation', (str,)),
+    Field('passCondition', (str,)),
+    Field('score', NUMBER, required=False, nullable=True),
+    Field('area', (str,), required=False, nullable=True),
+)
+
+# 与 lib/models/assessment_data.dart 中 AssessmentData.fromJson 对应
+ASSESSMENT_DATA_SCHEMA = (
+    Field('ageMonth', (int,)),
+    Field('area', (str,)),
+    Field('score', NUMBER),
+    Field('testItems', (list,), items=ASSESSMENT_ITEM_SCHEMA),
+)
+
+@dataclass
+class ValidationIssue:
+    """一条校验问题"""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '/'}: {self.message}"
+
+class IssueList:
+    """最多保留 limit 条问题的列表，超出的只计数（total 为全部条数）"""
+
+    def __init__(self, limit: int = DEFAULT_MAX_ISSUES):
+        self.limit = limit
+        self.items: List[ValidationIssue] = []
+        self.total = 0
+
+    def append(self, issue: ValidationIssue) -> None:
+        self.total += 1
+        if len(self.items) < self.limit:
+            self.items.append(issue)
+
+    def extend(self, issues: Iterable[ValidationIssue]) -> None:
+        for issue in issues:
+            self.append(issue)
+        if isinstance(issues, IssueList):
+            # 对方未保留的条数同样计入
+            self.total += issues.omitted
+
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def omitted(self) -> int:
+        """超出上限、未保留的条数"""
+        return self.total - len(self.items)
+
+Validator = Callable[[Any, str, List[ValidationIssue]], None]
+
+def _type_names(types: Tuple[type, ...]) -> str:
+    names = {int: 'int', float: 'number', str: 'string', list: 'array', dict: 'object'}
+    return '/'.join(names.get(t, t.__name__) for t in types)
+
+def _compile_field(field: Field) -> Validator:
+    types = field.types
+    # bool 是 int 的子类，但 Dart 端不会把 true/false 当作数字
+    reject_bool = bool not in types
+    item_validator = compile_schema(field.items) if field.items is not None else None
+    expected = _type_names(types)
+
+    def validate(value: Any, path: str, errors: List[ValidationIssue]) -> None:
+        if value is None:
+            if not field.nullable:
+                errors.append(ValidationIssue(path, f"不能为 null，应为 {expected}"))
+            return
+        if not isinstance(value, types) or (reject_bool and isinstance(value, bool)):
+            errors.append(ValidationIssue(path, f"类型错误：应为 {expected}，实际为 {type(value).__name__}"))
+            return
+        if item_validator is not None:
+            for idx, element in enumerate(value):
+                item_validator(element, f"{path}/{idx}", errors)
+
+    return validate
+
+def compile_schema(schema: Tuple[Field, ...]) -> Validator:
+    """将字段声明编译为校验函数 validator(value, path, errors)"""
+    checks = [(field.name, field.required, _compile_field(field)) for field in schema]
+
+    def validate(value: Any, path: str, errors: List[ValidationIssue]) -> None:
+        if not isinstance(value, dict):
+            errors.append(ValidationIssue(path, f"类型错误：应为 object，实际为 {type(value).__name__}"))
+            return
+        for name, required, check in checks:
+            field_path = f"{path}/{name}"
+            if name not in value:
+                if required:
+                    errors.append(ValidationIssue(field_path, "缺少必要字段"))
+                continue
+            check(value[name], field_path, errors)
+
+    return validate
+
+validate_assessment_group = compile_schema(ASSESSMENT_DATA_SCHEMA)
+
+# 单项分值之和与能区分数比较时的容差
+SCORE_TOLERANCE = 1e-6
+
+class SemanticChecker:
+    """跨分组的语义一致性检查，随流式读取逐组累积，一次遍历完成
+
+    - 建立 项目编号 -> (月龄, 能区) 索引，检查重复编号
+    - 同一分组内编号递增；同一能区内编号随月龄递增
+      （AssessmentService.calculateAreaMentalAge 按编号排序累计分数，依赖这一顺序）
+    - 分组内单项分值之和等于 get_score(月龄)，分组 score 字段同样等于该值
+    - 统计 月龄 × 能区 覆盖矩阵
+    """
+
+    def __init__(self, age_months: Optional[List[int]] = None, areas: Optional[List[str]] = None,
+                 max_issues: int = DEFAULT_MAX_ISSUES):
+        self.age_months = list(age_months) if age_months is not None else list(AGE_MONTHS)
+        self.areas = list(areas) if areas is not None else list(AREA_ORDER)
+        self.id_index: Dict[int, Tuple[int, str]] = {}
+        self.coverage: Dict[Tuple[int, str], int] = {}
+        # (能区, 月龄) -> (最小编号, 最大编号, 分组路径)
+        self._id_ranges: Dict[Tuple[str, int], Tuple[int, int, str]] = {}
+        self.errors = IssueList(max_issues)
+        self.warnings = IssueList(max_issues)
+
+    def add_group(self, group: Dict[str, Any], path: str) -> None:
+        """检查一个已通过结构校验的分组"""
+        age_month = group['ageMonth']
+        area = group['area']
+        test_items = group['testItems']
+        key = (age_month, area)
+
+        if key in self.coverage:
+            self.errors.append(ValidationIssue(path, f"月龄 {age_month} 能区 {area} 的分组重复出现"))
+        self.coverage[key] = self.coverage.get(key, 0) + len(test_items)
+        if age_month not in self.age_months:
+            self.warnings.append(ValidationIssue(f"{path}/ageMonth", f"月龄 {age_month} 不在量表月龄列表中"))
+        if area not in self.areas:
+            self.warnings.append(ValidationIssue(f"{path}/area", f"未知能区 {area}"))
+
+        expected_score = get_score(age_month)
+        if not math.isclose(group['score'], expected_score, abs_tol=SCORE_TOLERANCE):
+            self.errors.append(ValidationIssue(f"{path}/score", f"能区分数为 {group['score']}，按月龄应为 {expected_score}"))
+
+        item_score_sum = 0.0
+        previous_id = None
+        for item_idx, test_item in enumerate(test_items):
+            item_path = f"{path}/testItems/{item_idx}"
+            item_id = test_item['id']
+            if item_id in self.id_index:
+                other_age, other_area = self.id_index[item_id]
+                self.errors.append(ValidationIssue(f"{item_path}/id", f"项目编号 {item_id} 重复（已出现在 {other_age} 月龄 {other_area}）"))
+            else:
+                self.id_index[item_id] = key
+            if previous_id is not None and item_id <= previous_id:
+                self.errors.append(ValidationIssue(f"{item_path}/id", f"分组内项目编号未递增: {previous_id} -> {item_id}"))
+            previous_id = item_id
+
+            if test_item.get('area') not in (None, '', area):
+                self.errors.append(ValidationIssue(f"{item_path}/area", f"项目能区 {test_item['area']} 与分组能区 {area} 不一致"))
+            item_score_sum += test_item.get('score') or 0.0
+
+        if test_items:
+            if not math.isclose(item_score_sum, expected_score, abs_tol=SCORE_TOLERANCE):
+                self.errors.append(ValidationIssue(f"{path}/testItems", f"单项分值之和为 {item_score_sum:.6f}，应为 {expected_score}"))
+            ids = [test_item['id'] for test_item in test_items]
+            self._id_ranges[(area, age_month)] = (min(ids), max(ids), path)
 
-def validate_assessment_data():
-    """验证评估数据"""
-    data_file = 'child_development_assessment/assets/data/assessment_data.json'
-    
+    def finish(self) -> None:
+        """所有分组读取完毕后检查跨月龄顺序与覆盖情况"""
+        age_order = {age: idx for idx, age in enumerate(self.age_months)}
+        for area in self.areas + sorted({area for area, _ in self._id_ranges} - set(self.areas)):
+            ages = sorted((age for a, age in self._id_ranges if a == area), key=lambda age: (age_order.get(age, len(age_order)), age))
+            previous = None
+            for age in ages:
+                min_id, max_id, path = self._id_ranges[(area, age)]
+                if previous is not None and min_id <= previous[1]:
+                    self.errors.append(ValidationIssue(
+                        f"{path}/testItems",
+                        f"{area} 能区项目编号未随月龄递增: {previous[0]} 月龄最大编号 {previous[1]}，{age} 月龄最小编号 {min_id}",
+                    ))
+                previous = (age, max_id)
+
+        for age in self.age_months:
+            for area in self.areas:
+                if (age, area) not in self.coverage:
+                    self.warnings.append(ValidationIssue('', f"缺少 {age} 月龄 {area} 能区的数据"))
+
+    def format_coverage_matrix(self) -> List[str]:
+        """月龄 × 能区 覆盖矩阵（单元格为项目数，- 表示缺失）"""
+        widths = [max(len(area), 3) for area in self.areas]
+        lines = ['  月龄 ' + ' '.join(area.rjust(width) for area, width in zip(self.areas, widths))]
+        for age in self.age_months:
+            cells = []
+            for area, width in zip(self.areas, widths):
+                count = self.coverage.get((age, area))
+                cells.append(('-' if count is None else str(count)).rjust(width))
+            lines.append(f"  {age:>4} " + ' '.join(cells))
+        return lines
+
+class JSONStreamError(ValueError):
+    """流式读取 JSON 时的结构错误"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(message)
+        self.path = path
+
+_WHITESPACE = ' \t\r\n'
+
+def iter_json_array(fp: IO[str], chunk_size: int = 1 << 16,
+                    max_element_chars: int = DEFAULT_MAX_ELEMENT_CHARS) -> Iterator[Any]:
+    """逐个产出顶层 JSON 数组中的元素
+
+    只在内存中保留当前元素所在的文本片段，内存占用与单个元素大小相关，
+    与文件总大小无关。元素无法解析时会继续读入（元素可能被截断在缓冲区末尾），
+    已读入的部分超过 max_element_chars 仍无法解析时按语法错误停止，不会一直读到文件末尾。
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        # 返回是否还有未读字符
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not read_more():
+                return False
+
+    if not skip_whitespace() or buffer[pos] != '[':
+        raise JSONStreamError('', "根节点应为数组")
+    pos += 1
+    if not skip_whitespace():
+        raise JSONStreamError('', "数组未闭合")
+    if buffer[pos] == ']':
+        pos += 1
+    else:
+        index = 0
+        while True:
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if len(buffer) - pos <= max_element_chars and read_more():
+                        continue
+                    if len(buffer) - pos > max_element_chars:
+                        raise JSONStreamError(
+                            f"/{index}", f"JSON 语法错误或元素过大（已读入 {len(buffer) - pos} 字符仍无法解析）: {exc.msg}",
+                        ) from exc
+                    raise JSONStreamError(f"/{index}", f"JSON 语法错误: {exc.msg}") from exc
+                # 数字可能恰好被截断在缓冲区末尾（如 “4.5e3” 只读到 “4.”），需要读入更多内容再确认
+                truncated = end == len(buffer) or (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and buffer[end] not in _WHITESPACE + ',]'
+                )
+                if truncated and read_more():
+                    continue
+                break
+            yield value
+            pos = end
+            index += 1
+
+            if not skip_whitespace():
+                raise JSONStreamError('', "数组未闭合")
+            separator = buffer[pos]
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise JSONStreamError(f"/{index}", f"JSON 语法错误: 元素之间应为逗号，实际为 {separator!r}")
+
+    if skip_whitespace():
+        raise JSONStreamError('', "数组结束后存在多余内容")
+
+def validate_assessment_data(data_file: str = DEFAULT_DATA_FILE, max_errors: int = 50,
+                             max_issues: int = DEFAULT_MAX_ISSUES,
+                             max_element_chars: int = DEFAULT_MAX_ELEMENT_CHARS) -> bool:
+    """验证评估数据
+
+    max_errors 为打印的错误条数；max_issues 为错误与警告各保留的条数（超出的只计数）；
+    max_element_chars 为单个分组的最大字符数。
+    """
     if not os.path.exists(data_file):
         print(f"错误：数据文件不存在: {data_file}")
         return False
-    
+
     try:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         print("数据验证开始...")
-        print(f"总项目数: {len(data)}")
-        
+
         # 统计信息
         area_stats = {}
         age_stats = {}
+        total_groups = 0
         total_items = 0
-        
-        for item in data:
-            age_month = item['ageMonth']
-            area = item['area']
-            score = item['score']
-            test_items = item['testItems']
-            
-            # 统计
-            area_stats[area] = area_stats.get(area, 0) + len(test_items)
-            age_stats[age_month] = age_stats.get(age_month, 0) + len(test_items)
-            total_items += len(test_items)
-            
-            # 验证必要字段
-            if not all(key in item for key in ['ageMonth', 'area', 'score', 'testItems']):
-                print(f"错误：缺少必要字段 - {item}")
-                return False
-            
-            # 验证测试项目
-            for test_item in test_items:
-                if not all(key in test_item for key in ['id', 'name', 'desc', 'operation', 'passCondition']):
-                    print(f"错误：测试项目缺少必要字段 - {test_item}")
-                    return False
-                
+        errors = IssueList(max_issues)
+        warnings = IssueList(max_issues)
+        checker = SemanticChecker(max_issues=max_issues)
+
+        with open(data_file, 'r', encoding='utf-8') as f:
+            for index, item in enumerate(iter_json_array(f, max_element_chars=max_element_chars)):
+                total_groups += 1
+                path = f"/{index}"
+
+                # 按声明的结构校验必要字段与类型，收集全部错误
+                group_errors: List[ValidationIssue] = []
+                validate_assessment_group(item, path, group_errors)
+                errors.extend(group_errors)
+                if not isinstance(item, dict):
+                    continue
+                if not group_errors:
+                    checker.add_group(item, path)
+
+                test_items = item.get('testItems') if isinstance(item.get('testItems'), list) else []
+                age_month = item.get('ageMonth')
+                area = item.get('area')
+
+                # 统计
+                if isinstance(area, str):
+                    area_stats[area] = area_stats.get(area, 0) + len(test_items)
+                if isinstance(age_month, int):
+                    age_stats[age_month] = age_stats.get(age_month, 0) + len(test_items)
+                total_items += len(test_items)
+
                 # 验证操作方法和通过要求不为空
-                if not test_item['operation'] or test_item['operation'] == '请参考标准操作方法':
-                    print(f"警告：项目 {test_item['id']} 缺少详细操作方法")
-                
-                if not test_item['passCondition'] or test_item['passCondition'] == '请参考标准通过要求':
-                    print(f"警告：项目 {test_item['id']} 缺少详细通过要求")
-        
+                for item_idx, test_item in enumerate(test_items):
+                    if not isinstance(test_item, dict):
+                        continue
+                    item_path = f"{path}/testItems/{item_idx}"
+                    operation = test_item.get('operation')
+                    pass_condition = test_item.get('passCondition')
+                    if isinstance(operation, str) and (not operation or operation == PLACEHOLDER_OPERATION):
+                        warnings.append(ValidationIssue(f"{item_path}/operation", f"项目 {test_item.get('id')} 缺少详细操作方法"))
+                    if isinstance(pass_condition, str) and (not pass_condition or pass_condition == PLACEHOLDER_PASS_CONDITION):
+                        warnings.append(ValidationIssue(f"{item_path}/passCondition", f"项目 {test_item.get('id')} 缺少详细通过要求"))
+
+        checker.finish()
+        errors.extend(checker.errors)
+        warnings.extend(checker.warnings)
+
+        print(f"总项目数: {total_groups}")
+
+        for warning in warnings:
+            print(f"警告：{warning}")
+        if warnings.omitted:
+            print(f"警告：... 其余 {warnings.omitted} 条警告未保留（--max-issues {max_issues}）")
+
         print(f"\n验证结果:")
         print(f"总测试项目数: {total_items}")
-        
+        print(f"不重复的项目编号数: {len(checker.id_index)}")
+
         print("\n各能区项目数量:")
         for area, count in sorted(area_stats.items()):
             print(f"  {area}: {count} 项")
-        
+
         print("\n各月龄项目数量:")
         for age in sorted(age_stats.keys()):
             print(f"  {age}月龄: {age_stats[age]} 项")
-        
-        # 检查数据完整性
-        expected_ages = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 15, 18, 21, 24, 27, 30, 33, 36, 42, 48, 54, 60, 66, 72, 78, 84]
-        expected_areas = ['motor', 'fineMotor', 'adaptive', 'language', 'social']
-        
-        missing_ages = set(expected_ages) - set(age_stats.keys())
-        if missing_ages:
-            print(f"\n警告：缺少以下月龄的数据: {missing_ages}")
-        
-        missing_areas = set(expected_areas) - set(area_stats.keys())
-        if missing_areas:
-            print(f"\n警告：缺少以下能区的数据: {missing_areas}")
-        
+
+        # 检查数据完整性：月龄 × 能区 覆盖矩阵
+        print("\n覆盖矩阵（项目数，- 表示缺失）:")
+        for line in checker.format_coverage_matrix():
+            print(line)
+
+        if errors:
+            print(f"\n错误：发现 {len(errors)} 处错误")
+            for error in errors.items[:max_errors]:
+                print(f"  {error}")
+            if len(errors) > max_errors:
+                print(f"  ... 其余 {len(errors) - max_errors} 处未显示")
+            return False
+
         print("\n数据验证完成！")
         return True
-        
+
+    except JSONStreamError as e:
+        print(f"错误：{e.path or '/'}: {e}")
+        return False
     except Exception as e:
         print(f"验证过程中出错: {e}")
         return False
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="验证 assessment_data.json 的结构与内容")
+    parser.add_argument("data_files", nargs="*", default=[DEFAULT_DATA_FILE],
+                        help=f"待验证的数据文件，可传入多个，默认 {DEFAULT_DATA_FILE}")
+    parser.add_argument("--max-errors", type=int, default=50, help="每个文件最多打印的错误条数，默认 50")
+    parser.add_argument("--max-issues", type=int, default=DEFAULT_MAX_ISSUES,
+                        help=f"错误与警告各最多保留的条数（超出的只计数），默认 {DEFAULT_MAX_ISSUES}")
+    parser.add_argument("--max-element-chars", type=int, default=DEFAULT_MAX_ELEMENT_CHARS,
+                        help=f"单个分组的最大字符数，超过仍无法解析时按语法错误停止，默认 {DEFAULT_MAX_ELEMENT_CHARS}")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    validate_assessment_data() 
\ No newline at end of file
+    args = parse_args()
+    tracing.start(args, 'validate_data')
+    results = []
+    for data_file in args.data_files:
+        if len(args.data_files) > 1:
+            print(f"\n==== {data_file} ====")
+        with tracing.span('validate', path=data_file):
+            results.append(validate_assessment_data(data_file, max_errors=args.max_errors, max_issues=args.max_issues,
+                                                    max_element_chars=args.max_element_chars))
+    sys.exit(0 if all(results) else 1)
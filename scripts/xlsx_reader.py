@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+不依赖 pandas 的工作簿读取
+用 openpyxl 的 read_only 模式逐行读取第一个工作表，只保留单元格的值，
+结果与 pandas.read_excel 的 DataFrame 在生成脚本用到的部分上一致：
+
+- 第一行为表头：空表头记为 'Unnamed: N'，重名列依次加 .1、.2 后缀
+- 单元格取值：空单元格、错误值与 pandas 默认的缺失值字符串（'NA'、'#N/A'、'nan' 等）记为 None，
+  整数值的浮点数转为 int
+- 末尾的空行与各行末尾的空单元格去掉，其余行补齐到表头宽度（中间的空行保留）
+
+用法示例：
+  python scripts/xlsx_reader.py docs/表A.1.xlsx        # 打印表头与行数
+"""
+
+import argparse
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+import tracing
+
+# pandas.read_excel 默认视为缺失值的字符串
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+@dataclass
+class Sheet:
+    """工作表的单元格值：rows 中每行与 columns 等长，缺失值为 None"""
+    columns: List[Any]
+    rows: List[List[Any]]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column_index(self) -> Dict[Any, int]:
+        return {name: idx for idx, name in enumerate(self.columns)}
+
+    def column(self, name: Any) -> List[Any]:
+        idx = self.column_index()[name]
+        return [row[idx] for row in self.rows]
+
+def cell_text(value: Any) -> str:
+    """单元格值转为文本：缺失值为空字符串，整数值的浮点数不带小数部分
+
+    两种读取方式共用，避免 DataFrame 列类型推断（如含缺失值的整数列变为 float）造成差异。
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _convert_cell(cell, na_strings: bool = True) -> Optional[Any]:
+    value = cell.value
+    if value is None or cell.data_type == TYPE_ERROR:
+        return None
+    if cell.data_type == TYPE_NUMERIC:
+        return int(value) if int(value) == value else float(value)
+    if na_strings and isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+def _column_names(header: List[Any], width: int) -> List[Any]:
+    """表头命名规则与 pandas 一致：空表头为 'Unnamed: N'，重名列加后缀且避开已有列名"""
+    names = [f"Unnamed: {idx}" if idx >= len(header) or header[idx] is None else header[idx] for idx in range(width)]
+    unnamed = [idx for idx in range(width) if idx >= len(header) or header[idx] is None]
+    counts: Dict[Any, int] = {}
+    for idx in [idx for idx in range(width) if idx not in unnamed] + unnamed:
+        name = original = names[idx]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[idx] = name
+        counts[name] = count + 1
+    return names
+
+def read_sheet(path: str) -> Sheet:
+    """逐行读取第一个工作表"""
+    workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.worksheets[0]
+        # 部分工具写出的文件中 dimension 记录不准确，按实际内容读取
+        worksheet.reset_dimensions()
+        data: List[List[Any]] = []
+        last_row_with_data = -1
+        for row_number, row in enumerate(worksheet.rows):
+            # 表头中的缺失值字符串仍作为列名（与 pandas 一致），只有空单元格记为 Unnamed
+            values = [_convert_cell(cell, na_strings=row_number > 0) for cell in row]
+            while values and values[-1] is None:
+                values.pop()
+            if values:
+                last_row_with_data = row_number
+            data.append(values)
+    finally:
+        workbook.close()
+
+    data = data[:last_row_with_data + 1]
+    if not data:
+        return Sheet(columns=[], rows=[])
+    width = max(len(values) for values in data)
+    columns = _column_names(data[0], width)
+    rows = [values + [None] * (width - len(values)) for values in data[1:]]
+    return Sheet(columns=columns, rows=rows)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="不依赖 pandas 读取工作簿的第一个工作表")
+    parser.add_argument("xlsx_file")
+    tracing.add_arguments(parser)
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    tracing.start(args, 'xlsx_reader')
+    sheet = read_sheet(args.xlsx_file)
+    print(f"列: {sheet.columns}")
+    print(f"行数: {len(sheet)}")
+
+if __name__ == "__main__":
+    main()